@@ -0,0 +1,542 @@
+# bench/datagen.py
+"""
+벤치마크용 합성 데이터 (대만 동네 중고거래/커뮤니티)
+
+    python -m bench.datagen --scale small --reset
+    python -m bench.datagen --scale large --seed 7 --manifest bench_manifest.json
+
+같은 seed/scale/anchor 면 id까지 같은 데이터가 나온다. FK/unique 검사를 끈 연결 하나로
+CHUNK 행씩 multi-row INSERT + commit 한다. 카운터 컬럼(like_count, comment_count, hot_score)은
+만들면서 같이 계산하므로 끝난 뒤 재계산이 필요 없다. 부하 테스트(bench/loadtest.py)가 읽는
+manifest(계정 비밀번호, id 범위, 동네 좌표, 인기 상품/글 id)를 마지막에 쓴다.
+
+분포
+- 동네: 도시 인구 비중 (臺北/新北 쏠림), 사용자의 상품/글은 대부분 자기 동네
+- 활동: 소수의 파워 유저가 좋아요/채팅 대부분 (power law)
+- 좋아요/채팅/댓글 수: 대부분 0~몇 개, 일부 대상에 수천 개 (Pareto)
+- 댓글: 절반은 같은 글의 앞선 댓글에 단 답글 -> 깊은 트리
+
+서버가 떠 있는 동안 데이터를 다시 만들었으면 서버를 재시작한다 (local:// 캐시).
+"""
+import argparse
+import heapq
+import json
+import math
+import random
+import sys
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+
+from sqlalchemy import func, insert, select, text
+
+# 모든 벤치 계정 공통 비밀번호 (Argon2 해시는 한 번만 계산해서 재사용)
+BENCH_PASSWORD = "bench-password"
+BENCH_EMAIL_DOMAIN = "bench.local"
+
+CHUNK_SIZE = 5000
+HOT_TOP_N = 20
+
+
+@dataclass(frozen=True)
+class Scale:
+    users: int
+    products: int
+    posts: int
+    # 대상당 평균
+    likes_per_product: float
+    likes_per_post: float
+    comments_per_post: float
+    chat_rooms_per_product: float
+    messages_per_room: float
+
+
+SCALES: Dict[str, Scale] = {
+    "tiny": Scale(1_000, 3_000, 2_000, 4, 3, 3, 0.3, 6),
+    "small": Scale(20_000, 60_000, 40_000, 6, 4, 4, 0.3, 8),
+    "medium": Scale(200_000, 600_000, 400_000, 6, 4, 5, 0.3, 8),
+    "large": Scale(2_000_000, 6_000_000, 4_000_000, 6, 4, 5, 0.3, 8),
+}
+
+# (city, district, lat, lng, 인구 가중치)
+REGIONS: List[Tuple[str, str, float, float, float]] = [
+    ("Taipei", "中正區", 25.0324, 121.5199, 1.6),
+    ("Taipei", "大同區", 25.0633, 121.5130, 1.2),
+    ("Taipei", "中山區", 25.0640, 121.5330, 2.3),
+    ("Taipei", "松山區", 25.0500, 121.5775, 2.0),
+    ("Taipei", "大安區", 25.0265, 121.5436, 3.0),
+    ("Taipei", "萬華區", 25.0286, 121.4979, 1.8),
+    ("Taipei", "信義區", 25.0306, 121.5716, 2.2),
+    ("Taipei", "士林區", 25.0950, 121.5246, 2.7),
+    ("Taipei", "北投區", 25.1321, 121.4987, 2.4),
+    ("Taipei", "內湖區", 25.0690, 121.5890, 2.8),
+    ("Taipei", "南港區", 25.0547, 121.6066, 1.2),
+    ("Taipei", "文山區", 24.9897, 121.5700, 2.6),
+    ("New Taipei", "板橋區", 25.0116, 121.4627, 5.5),
+    ("New Taipei", "三重區", 25.0615, 121.4870, 3.8),
+    ("New Taipei", "中和區", 24.9994, 121.4990, 4.1),
+    ("New Taipei", "永和區", 25.0076, 121.5138, 2.2),
+    ("New Taipei", "新莊區", 25.0359, 121.4500, 4.2),
+    ("New Taipei", "新店區", 24.9676, 121.5418, 3.0),
+    ("New Taipei", "土城區", 24.9722, 121.4437, 2.4),
+    ("New Taipei", "淡水區", 25.1696, 121.4408, 1.9),
+    ("New Taipei", "汐止區", 25.0629, 121.6573, 2.0),
+    ("Taoyuan", "桃園區", 24.9937, 121.3010, 4.6),
+    ("Taoyuan", "中壢區", 24.9656, 121.2249, 4.2),
+    ("Taoyuan", "平鎮區", 24.9459, 121.2182, 2.3),
+    ("Taoyuan", "八德區", 24.9286, 121.2847, 2.1),
+    ("Taichung", "西屯區", 24.1814, 120.6465, 2.3),
+    ("Taichung", "北屯區", 24.1822, 120.6866, 2.9),
+    ("Taichung", "南屯區", 24.1382, 120.6434, 1.8),
+    ("Taichung", "西區", 24.1414, 120.6714, 1.1),
+    ("Taichung", "北區", 24.1582, 120.6820, 1.4),
+    ("Taichung", "豐原區", 24.2521, 120.7227, 1.6),
+    ("Tainan", "東區", 22.9798, 120.2240, 1.9),
+    ("Tainan", "中西區", 22.9924, 120.1963, 0.8),
+    ("Tainan", "永康區", 23.0264, 120.2573, 2.4),
+    ("Tainan", "安平區", 22.9995, 120.1655, 0.7),
+    ("Kaohsiung", "苓雅區", 22.6218, 120.3120, 1.7),
+    ("Kaohsiung", "三民區", 22.6477, 120.2992, 3.4),
+    ("Kaohsiung", "左營區", 22.6847, 120.2940, 2.0),
+    ("Kaohsiung", "前鎮區", 22.5955, 120.3143, 1.8),
+    ("Kaohsiung", "鳳山區", 22.6269, 120.3575, 3.6),
+    ("Hsinchu", "東區", 24.8016, 120.9715, 2.2),
+    ("Hsinchu", "北區", 24.8155, 120.9623, 1.5),
+    ("Keelung", "仁愛區", 25.1286, 121.7430, 0.5),
+]
+
+# (slug, 이름, 상위 slug, type, 상품 제목에 쓰는 물건)
+CATEGORIES: List[Tuple[str, str, str, str, List[str]]] = [
+    ("digital", "數位產品", None, "product", []),
+    ("phone", "手機", "digital", "product", ["iPhone 13", "Pixel 7", "小米 13", "三星 S22"]),
+    ("laptop", "筆電", "digital", "product", ["MacBook Air", "ThinkPad X1", "華碩 Zenbook", "宏碁 Swift"]),
+    ("camera", "相機", "digital", "product", ["Sony A7", "富士 X100V", "GoPro 11", "Canon R6"]),
+    ("furniture", "家具", None, "product", []),
+    ("desk", "桌椅", "furniture", "product", ["書桌", "電競椅", "餐桌", "沙發"]),
+    ("storage", "收納", "furniture", "product", ["衣櫃", "書櫃", "收納箱", "鞋櫃"]),
+    ("fashion", "服飾", None, "product", []),
+    ("women", "女裝", "fashion", "product", ["洋裝", "針織外套", "牛仔褲", "包包"]),
+    ("men", "男裝", "fashion", "product", ["西裝外套", "帽T", "運動褲", "皮夾"]),
+    ("shoes", "鞋", "fashion", "product", ["球鞋", "皮鞋", "拖鞋", "登山鞋"]),
+    ("living", "生活用品", None, "product", ["電鍋", "吹風機", "除濕機", "電風扇"]),
+    ("baby", "嬰幼兒用品", None, "product", ["嬰兒車", "汽座", "餐椅", "繪本"]),
+    ("sports", "運動休閒", None, "product", ["腳踏車", "瑜珈墊", "啞鈴", "露營帳篷"]),
+    ("books", "書籍", None, "product", ["小說", "參考書", "漫畫全套", "食譜"]),
+    ("local-info", "生活資訊", None, "community", []),
+    ("food", "美食", None, "community", []),
+    ("lost-found", "失物招領", None, "community", []),
+    ("qna", "問答", None, "community", []),
+]
+
+PRODUCT_ADJECTIVES = ["近全新", "二手", "九成新", "便宜賣", "急售", "自取", "含運", "保固內"]
+POST_TITLES = [
+    "{d} 有推薦的早餐店嗎?",
+    "{d} 今天停水到幾點?",
+    "撿到一把鑰匙 ({d})",
+    "{d} 新開的拉麵店心得",
+    "{d} 附近哪裡可以停機車",
+    "求推薦 {d} 的牙醫",
+    "{d} 夜市今天有開嗎",
+    "{d} 找人一起打羽球",
+]
+TEXT_WORDS = ["今天", "附近", "好吃", "推薦", "請問", "謝謝", "大家", "時間", "價格", "面交", "捷運站", "便利商店"]
+
+
+# =========================
+# 분포
+# =========================
+
+def _skewed_index(rng: random.Random, n: int, power: float = 2.5) -> int:
+    """
+    0..n-1, 앞쪽(작은 index)에 몰린다. power가 클수록 쏠림이 심하다
+    """
+    return min(int(n * rng.random() ** power), n - 1)
+
+
+def _pareto_count(rng: random.Random, mean: float, cap: int, alpha: float = 1.5) -> int:
+    """
+    평균이 대략 mean인 heavy tail 개수 (대부분 0~몇 개, 드물게 cap까지)
+    """
+    # Lomax: scale * (paretovariate - 1), 평균 scale / (alpha - 1). 평균 6이면 약 1/3이 0개
+    scale = mean * (alpha - 1)
+    return min(int(scale * (rng.paretovariate(alpha) - 1)), cap)
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(TEXT_WORDS) for _ in range(words))
+
+
+class _TopN:
+    def __init__(self, n: int):
+        self.n = n
+        self._heap: List[Tuple[int, int]] = []
+
+    def add(self, score: int, item_id: int):
+        if len(self._heap) < self.n:
+            heapq.heappush(self._heap, (score, item_id))
+        elif score > self._heap[0][0]:
+            heapq.heapreplace(self._heap, (score, item_id))
+
+    def ids(self) -> List[int]:
+        return [item_id for _, item_id in sorted(self._heap, reverse=True)]
+
+
+# =========================
+# 쓰기
+# =========================
+
+class _Writer:
+    """
+    테이블별로 CHUNK 행씩 모아서 multi-row INSERT + commit (FK 검사를 끈 연결)
+    """
+
+    def __init__(self, conn, chunk_size: int = CHUNK_SIZE):
+        self.conn = conn
+        self.chunk_size = chunk_size
+        self.counts: Dict[str, int] = defaultdict(int)
+        self._buffers: Dict[object, List[dict]] = defaultdict(list)
+        self._started = time.monotonic()
+
+    def add(self, table, row: dict):
+        buf = self._buffers[table]
+        buf.append(row)
+        if len(buf) >= self.chunk_size:
+            self._flush(table)
+
+    def _flush(self, table):
+        rows = self._buffers.pop(table, None)
+        if not rows:
+            return
+        self.conn.execute(insert(table), rows)
+        self.conn.commit()
+        before = self.counts[table.name]
+        self.counts[table.name] += len(rows)
+        if before // 100_000 != self.counts[table.name] // 100_000:
+            elapsed = time.monotonic() - self._started
+            print(f"  {table.name}: {self.counts[table.name]:,} rows ({elapsed:.0f}s)", file=sys.stderr)
+
+    def close(self):
+        for table in list(self._buffers):
+            self._flush(table)
+
+
+# =========================
+# 생성
+# =========================
+
+class Generator:
+    def __init__(self, writer: _Writer, scale: Scale, seed: int, anchor: datetime, days: int):
+        from db import models
+
+        self.m = models
+        self.w = writer
+        self.scale = scale
+        self.rng = random.Random(seed)
+        self.end = anchor
+        self.start = anchor - timedelta(days=days)
+        self.span = (self.end - self.start).total_seconds()
+
+        self.region_ids: List[int] = []
+        self.region_cum: List[float] = []
+        self.user_region: List[int] = []
+        self.product_categories: List[Tuple[int, List[str]]] = []
+        self.community_categories: List[int] = []
+
+        self.hot_products = _TopN(HOT_TOP_N)
+        self.hot_posts = _TopN(HOT_TOP_N)
+        self.deep_posts = _TopN(HOT_TOP_N)
+
+    def _at(self, i: int, n: int) -> datetime:
+        # id 순서 = 작성 순서 (같은 초 안에서만 흔들림)
+        return self.start + timedelta(seconds=self.span * i / n + self.rng.random())
+
+    def _user(self) -> int:
+        # 파워 유저(id가 작은 오래된 계정)에 쏠림
+        return _skewed_index(self.rng, self.scale.users) + 1
+
+    def _region(self) -> int:
+        return self.rng.choices(self.region_ids, cum_weights=self.region_cum)[0]
+
+    def _table(self, model):
+        return model.__table__
+
+    # ---------- 기준 데이터 ----------
+
+    def regions(self):
+        total = 0.0
+        for region_id, (city, district, lat, lng, weight) in enumerate(REGIONS, start=1):
+            self.w.add(self._table(self.m.Region), {
+                "id": region_id, "country_code": "TW", "city": city, "district": district,
+                "name": f"{city} {district}", "center_lat": lat, "center_lng": lng,
+                "radius_km": 2.0, "created_at": self.start,
+            })
+            total += weight
+            self.region_ids.append(region_id)
+            self.region_cum.append(total)
+
+    def categories(self):
+        ids = {}
+        for category_id, (slug, name, parent, kind, items) in enumerate(CATEGORIES, start=1):
+            ids[slug] = category_id
+            self.w.add(self._table(self.m.Category), {
+                "id": category_id, "name": name, "slug": slug, "type": kind,
+                "parent_id": ids.get(parent), "sort_order": category_id, "is_active": 1,
+                "created_at": self.start,
+            })
+            if kind == "product" and items:
+                self.product_categories.append((category_id, items))
+            elif kind == "community":
+                self.community_categories.append(category_id)
+
+    def users(self):
+        from core.security import hash_password
+
+        password_hash = hash_password(BENCH_PASSWORD)
+        n = self.scale.users
+        for i in range(1, n + 1):
+            region_id = self._region()
+            lat, lng = REGIONS[region_id - 1][2:4]
+            created_at = self._at(i, n)
+            self.user_region.append(region_id)
+            self.w.add(self._table(self.m.User), {
+                "id": i, "email": f"user{i}@{BENCH_EMAIL_DOMAIN}", "password_hash": password_hash,
+                "nickname": f"user{i}", "role": "admin" if i == 1 else "user", "is_active": 1,
+                "profile_complete": 1, "home_region_id": region_id,
+                "home_lat": lat + self.rng.uniform(-0.01, 0.01),
+                "home_lng": lng + self.rng.uniform(-0.01, 0.01),
+                "gps_verified_at": created_at, "created_at": created_at,
+            })
+
+    # ---------- 상품 + 이미지 + 좋아요 + 채팅 ----------
+
+    def products(self):
+        s, rng = self.scale, self.rng
+        n = s.products
+        room_id = member_id = message_id = like_id = image_id = 0
+        for pid in range(1, n + 1):
+            seller = self._user()
+            region_id = self.user_region[seller - 1] if rng.random() < 0.9 else self._region()
+            category_id, items = rng.choice(self.product_categories)
+            created_at = self._at(pid, n)
+            status = rng.choices(["selling", "reserved", "sold", "hidden"], [80, 6, 12, 2])[0]
+
+            likers = set()
+            for _ in range(_pareto_count(rng, s.likes_per_product, min(5000, s.users // 2))):
+                user_id = self._user()
+                if user_id != seller:
+                    likers.add(user_id)
+            for user_id in sorted(likers):
+                like_id += 1
+                self.w.add(self._table(self.m.ProductLike), {
+                    "id": like_id, "user_id": user_id, "product_id": pid,
+                    "created_at": created_at + timedelta(minutes=rng.randint(1, 20_000)),
+                })
+            self.hot_products.add(len(likers), pid)
+
+            self.w.add(self._table(self.m.Product), {
+                "id": pid, "seller_id": seller, "region_id": region_id, "category_id": category_id,
+                "title": f"{rng.choice(PRODUCT_ADJECTIVES)} {rng.choice(items)}",
+                "price": int(math.exp(rng.gauss(7.5, 1.3))) // 10 * 10 + 100,
+                "description": _sentence(rng, rng.randint(10, 60)),
+                "condition": rng.choice(["new", "used"]),
+                "trade_type": rng.choice(["direct", "delivery", "both"]),
+                "status": status, "view_count": len(likers) * 20 + rng.randint(0, 50),
+                "like_count": len(likers), "created_at": created_at,
+                "thumbnail_url": f"https://cdn.{BENCH_EMAIL_DOMAIN}/p/{pid}/0/thumb.jpg",
+            })
+            for sort_order in range(rng.randint(1, 5)):
+                image_id += 1
+                self.w.add(self._table(self.m.ProductImage), {
+                    "id": image_id, "product_id": pid, "sort_order": sort_order,
+                    "image_url": f"https://cdn.{BENCH_EMAIL_DOMAIN}/p/{pid}/{sort_order}/medium.jpg",
+                    "thumbnail_url": f"https://cdn.{BENCH_EMAIL_DOMAIN}/p/{pid}/{sort_order}/thumb.jpg",
+                    "created_at": created_at,
+                })
+
+            buyers = set()
+            for _ in range(_pareto_count(rng, s.chat_rooms_per_product, 200)):
+                buyer = self._user()
+                if buyer != seller:
+                    buyers.add(buyer)
+            for buyer in sorted(buyers):
+                room_id += 1
+                opened_at = created_at + timedelta(minutes=rng.randint(1, 5_000))
+                sent_at = opened_at
+                preview = None
+                for k in range(max(1, _pareto_count(rng, s.messages_per_room, 500))):
+                    message_id += 1
+                    sent_at += timedelta(seconds=rng.randint(5, 3_600))
+                    preview = _sentence(rng, rng.randint(2, 12))
+                    self.w.add(self._table(self.m.ChatMessage), {
+                        "id": message_id, "room_id": room_id, "sender_id": buyer if k % 2 == 0 else seller,
+                        "message": preview, "created_at": sent_at,
+                    })
+                self.w.add(self._table(self.m.ChatRoom), {
+                    "id": room_id, "product_id": pid, "seller_id": seller, "buyer_id": buyer,
+                    "last_message_id": message_id, "last_message_preview": preview,
+                    "last_message_at": sent_at, "created_at": opened_at,
+                })
+                for member in (seller, buyer):
+                    member_id += 1
+                    self.w.add(self._table(self.m.ChatRoomMember), {
+                        "id": member_id, "room_id": room_id, "user_id": member,
+                        "last_read_message_id": message_id, "unread_count": 0,
+                        "last_message_at": sent_at,
+                    })
+
+    # ---------- 게시글 + 좋아요 + 댓글 트리 ----------
+
+    def posts(self):
+        from core.ranking import hot_score
+
+        s, rng = self.scale, self.rng
+        n = s.posts
+        like_id = comment_id = 0
+        for post_id in range(1, n + 1):
+            author = self._user()
+            region_id = self.user_region[author - 1]
+            district = REGIONS[region_id - 1][1]
+            created_at = self._at(post_id, n)
+
+            likers = set()
+            for _ in range(_pareto_count(rng, s.likes_per_post, min(5000, s.users // 2))):
+                likers.add(self._user())
+            for user_id in sorted(likers):
+                like_id += 1
+                self.w.add(self._table(self.m.CommunityPostLike), {
+                    "id": like_id, "user_id": user_id, "post_id": post_id,
+                    "created_at": created_at + timedelta(minutes=rng.randint(1, 5_000)),
+                })
+
+            thread: List[int] = []
+            commented_at = created_at
+            for _ in range(_pareto_count(rng, s.comments_per_post, 2000)):
+                comment_id += 1
+                commented_at += timedelta(seconds=rng.randint(10, 1_800))
+                # 절반은 앞선 댓글(최근 것일수록 자주)에 답글
+                parent_id = thread[-1 - _skewed_index(rng, len(thread), 1.5)] if thread and rng.random() < 0.5 else None
+                self.w.add(self._table(self.m.CommunityComment), {
+                    "id": comment_id, "post_id": post_id, "user_id": self._user(),
+                    "parent_id": parent_id, "content": _sentence(rng, rng.randint(3, 25)),
+                    "created_at": commented_at,
+                })
+                thread.append(comment_id)
+
+            like_count, comment_count = len(likers), len(thread)
+            view_count = like_count * 15 + comment_count * 5 + rng.randint(0, 100)
+            self.w.add(self._table(self.m.CommunityPost), {
+                "id": post_id, "user_id": author, "region_id": region_id,
+                "category_id": rng.choice(self.community_categories),
+                "title": rng.choice(POST_TITLES).format(d=district),
+                "content": _sentence(rng, rng.randint(20, 120)),
+                "view_count": view_count, "like_count": like_count, "comment_count": comment_count,
+                "hot_score": hot_score(like_count, comment_count, view_count, created_at),
+                "is_hidden": 1 if rng.random() < 0.01 else 0, "created_at": created_at,
+            })
+            self.hot_posts.add(like_count, post_id)
+            self.deep_posts.add(comment_count, post_id)
+
+    def run(self):
+        steps = [
+            ("regions", self.regions),
+            ("categories", self.categories),
+            ("users", self.users),
+            ("products", self.products),
+            ("posts", self.posts),
+        ]
+        for name, step in steps:
+            print(f"generating {name}...", file=sys.stderr)
+            step()
+        self.w.close()
+
+    def manifest(self, seed: int, scale_name: str) -> dict:
+        return {
+            "seed": seed,
+            "scale": scale_name,
+            "scale_params": asdict(self.scale),
+            "anchor": self.end.isoformat(),
+            "password": BENCH_PASSWORD,
+            "email_format": "user{id}@" + BENCH_EMAIL_DOMAIN,
+            "counts": dict(self.w.counts),
+            "users": {"first_id": 1, "last_id": self.scale.users},
+            "products": {"first_id": 1, "last_id": self.scale.products},
+            "posts": {"first_id": 1, "last_id": self.scale.posts},
+            "regions": [
+                {"id": i, "city": city, "district": district, "lat": lat, "lng": lng,
+                 "radius_km": 2.0, "weight": weight}
+                for i, (city, district, lat, lng, weight) in enumerate(REGIONS, start=1)
+            ],
+            "product_categories": [category_id for category_id, _ in self.product_categories],
+            "hot_products": self.hot_products.ids(),
+            "hot_posts": self.hot_posts.ids(),
+            "deep_posts": self.deep_posts.ids(),
+        }
+
+
+# =========================
+# CLI
+# =========================
+
+def _prepare_schema(engine, reset: bool):
+    from db.session import Base
+
+    if reset:
+        Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    if not reset:
+        from db.models import User
+
+        with engine.connect() as conn:
+            if conn.execute(select(func.count()).select_from(User.__table__)).scalar():
+                raise SystemExit("database is not empty (use --reset to drop and recreate tables)")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Generate deterministic benchmark data")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--anchor", type=datetime.fromisoformat, default=datetime(2025, 6, 1),
+                        help="마지막 데이터 시각 (기본 2025-06-01)")
+    parser.add_argument("--days", type=int, default=365, help="데이터가 퍼져 있는 기간")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--reset", action="store_true", help="테이블을 지우고 다시 만든다")
+    parser.add_argument("--yes", action="store_true", help="APP_ENV가 local이 아니어도 진행")
+    parser.add_argument("--manifest", default="bench_manifest.json")
+    args = parser.parse_args(argv)
+
+    from core.config import settings
+    from db.session import engine
+
+    if settings.APP_ENV != "local" and not args.yes:
+        print(f"refusing to write benchmark data to APP_ENV={settings.APP_ENV} (pass --yes)", file=sys.stderr)
+        return 2
+
+    _prepare_schema(engine, args.reset)
+
+    started = time.monotonic()
+    with engine.connect() as conn:
+        if engine.dialect.name == "mysql":
+            conn.execute(text("SET FOREIGN_KEY_CHECKS=0"))
+            conn.execute(text("SET UNIQUE_CHECKS=0"))
+        writer = _Writer(conn, args.chunk_size)
+        generator = Generator(writer, SCALES[args.scale], args.seed, args.anchor, args.days)
+        generator.run()
+        if engine.dialect.name == "mysql":
+            conn.execute(text("SET FOREIGN_KEY_CHECKS=1"))
+            conn.execute(text("SET UNIQUE_CHECKS=1"))
+
+    manifest = generator.manifest(args.seed, args.scale)
+    with open(args.manifest, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    elapsed = time.monotonic() - started
+    for table, count in sorted(writer.counts.items()):
+        print(f"{table:<22}{count:>12,}", file=sys.stderr)
+    print(f"done in {elapsed:.0f}s, manifest -> {args.manifest}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
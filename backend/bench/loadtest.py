@@ -0,0 +1,422 @@
+# bench/loadtest.py
+"""
+HTTP 부하 테스트 (bench/datagen.py 로 만든 데이터 + 떠 있는 API 서버 대상)
+
+    # 서버: 쿼리 수 헤더 켜고, 요청 제한은 끄고 (login_burst 에서 제한 자체를 볼 때만 켠다)
+    QUERY_COUNT_HEADER=true RATE_LIMIT_ENABLED=false uvicorn main:app --port 8000
+
+    python -m bench.loadtest --base-url http://127.0.0.1:8000 --duration 30 --concurrency 32 \
+        -o bench_results/$(git rev-parse --short HEAD).json
+    python -m bench.loadtest --scenario feed_scroll,post_detail --duration 60
+    python -m bench.loadtest compare bench_results/before.json bench_results/after.json
+
+시나리오는 하나씩 차례로 돈다 (서로 섞이지 않게). 각 시나리오는 --concurrency 개의 가상
+사용자가 --duration 초 동안 스크립트를 반복하고, 가상 사용자마다 seed가 고정이라 같은
+manifest면 같은 요청 순서가 나온다. access token은 서버와 같은 JWT_SECRET으로 직접 만든다
+(로그인 비용이 다른 시나리오 숫자에 섞이지 않게).
+
+결과 JSON: 시나리오/엔드포인트별 요청 수, 처리량(rps), 지연 p50/p95/p99(ms),
+요청당 쿼리 수(X-Query-Count), 상태 코드 분포.
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+from core.querycount import HEADER as QUERY_COUNT_HEADER
+
+FEED_PAGES = 5
+FEED_PAGE_SIZE = 20
+
+
+# =========================
+# 기록
+# =========================
+
+@dataclass
+class Sample:
+    endpoint: str
+    status: int          # 0 = 연결 오류/타임아웃
+    latency_ms: float
+    queries: Optional[int]
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    # nearest-rank
+    rank = math.ceil(pct / 100 * len(sorted_values)) - 1
+    return sorted_values[max(0, min(rank, len(sorted_values) - 1))]
+
+
+def summarize(samples: List[Sample], elapsed: float) -> dict:
+    latencies = sorted(s.latency_ms for s in samples)
+    queries = [s.queries for s in samples if s.queries is not None]
+    statuses: Dict[str, int] = defaultdict(int)
+    for s in samples:
+        statuses[str(s.status)] += 1
+    return {
+        "requests": len(samples),
+        "errors": sum(1 for s in samples if s.status == 0 or s.status >= 500),
+        "rps": round(len(samples) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(_percentile(latencies, 50), 2),
+            "p95": round(_percentile(latencies, 95), 2),
+            "p99": round(_percentile(latencies, 99), 2),
+            "max": round(latencies[-1], 2) if latencies else 0.0,
+        },
+        "queries_per_request": {
+            "mean": round(sum(queries) / len(queries), 2) if queries else None,
+            "max": max(queries) if queries else None,
+        },
+        "status": dict(sorted(statuses.items())),
+    }
+
+
+# =========================
+# 가상 사용자
+# =========================
+
+class Manifest:
+    def __init__(self, data: dict):
+        self.data = data
+        self.password = data["password"]
+        self.email_format = data["email_format"]
+        self.last_user = data["users"]["last_id"]
+        self.last_product = data["products"]["last_id"]
+        self.last_post = data["posts"]["last_id"]
+        self.regions = data["regions"]
+        self.product_categories = data.get("product_categories", [])
+        self.region_weights = [r["weight"] for r in self.regions]
+        self.hot_products = data["hot_products"]
+        self.hot_posts = data["hot_posts"]
+        self.deep_posts = data["deep_posts"]
+
+
+class VirtualUser:
+    def __init__(self, client: httpx.AsyncClient, manifest: Manifest, seed: int, samples: List[Sample]):
+        self.client = client
+        self.m = manifest
+        self.rng = random.Random(seed)
+        self.samples = samples
+        self.user_id = self.rng.randint(1, manifest.last_user)
+        self._token: Optional[str] = None
+
+    @property
+    def auth(self) -> Dict[str, str]:
+        if self._token is None:
+            from core.security import create_access_token
+
+            self._token = create_access_token(self.user_id, expires_minutes=24 * 60)
+        return {"Authorization": f"Bearer {self._token}"}
+
+    def region(self) -> dict:
+        return self.rng.choices(self.m.regions, weights=self.m.region_weights)[0]
+
+    async def request(self, endpoint: str, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        """
+        endpoint: 집계 이름 (경로 템플릿). 실패해도 예외를 올리지 않고 status 0으로 기록
+        """
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.samples.append(Sample(endpoint, 0, (time.perf_counter() - started) * 1000, None))
+            return None
+        latency = (time.perf_counter() - started) * 1000
+        count = response.headers.get(QUERY_COUNT_HEADER)
+        self.samples.append(Sample(endpoint, response.status_code, latency, int(count) if count else None))
+        return response
+
+
+# =========================
+# 시나리오
+# =========================
+
+async def feed_scroll(vu: VirtualUser):
+    """
+    동네 피드 첫 페이지 + next_cursor 로 몇 페이지 더 (30%는 인기순)
+    """
+    sort = "popular" if vu.rng.random() < 0.3 else "recent"
+    params = {"region_id": vu.region()["id"], "size": FEED_PAGE_SIZE, "sort": sort}
+    for _ in range(FEED_PAGES):
+        r = await vu.request("GET /api/community/posts", "GET", "/api/community/posts", params=params, headers=vu.auth)
+        if r is None or r.status_code != 200:
+            return
+        cursor = r.json().get("next_cursor")
+        if not cursor:
+            return
+        params = {"region_id": params["region_id"], "size": FEED_PAGE_SIZE, "sort": sort, "cursor": cursor}
+
+
+async def post_detail(vu: VirtualUser):
+    """
+    글 상세 + 댓글 트리. 절반은 인기 글/댓글 많은 글 (캐시/행 잠금 쏠림)
+    """
+    roll = vu.rng.random()
+    if roll < 0.25 and vu.m.hot_posts:
+        post_id = vu.rng.choice(vu.m.hot_posts)
+    elif roll < 0.5 and vu.m.deep_posts:
+        post_id = vu.rng.choice(vu.m.deep_posts)
+    else:
+        post_id = vu.rng.randint(1, vu.m.last_post)
+    await vu.request("GET /api/community/posts/{id}", "GET", f"/api/community/posts/{post_id}", headers=vu.auth)
+    await vu.request(
+        "GET /api/community/posts/{id}/comments", "GET", f"/api/community/posts/{post_id}/comments", headers=vu.auth
+    )
+
+
+async def like_storm(vu: VirtualUser):
+    """
+    인기 상품 몇 개에 좋아요/취소 반복 (같은 행 카운터 경합)
+    """
+    product_id = vu.rng.choice(vu.m.hot_products[:3] or [1])
+    await vu.request("PUT /api/products/{id}/like", "PUT", f"/api/products/{product_id}/like", headers=vu.auth)
+    await vu.request("DELETE /api/products/{id}/like", "DELETE", f"/api/products/{product_id}/like", headers=vu.auth)
+
+
+async def search(vu: VirtualUser):
+    """
+    동네 상품 목록(무작위 정렬/필터) 몇 페이지 -> 그중 하나 상세
+    """
+    params = {
+        "region_id": vu.region()["id"],
+        "sort": vu.rng.choice(["recent", "recent", "price_asc", "price_desc", "likes"]),
+        "size": 20,
+    }
+    if vu.m.product_categories and vu.rng.random() < 0.5:
+        params["category_id"] = vu.rng.choice(vu.m.product_categories)
+    if vu.rng.random() < 0.3:
+        params["max_price"] = vu.rng.choice([1000, 5000, 20000])
+    products = []
+    for _ in range(vu.rng.randint(1, 3)):
+        r = await vu.request("GET /api/products", "GET", "/api/products", params=params, headers=vu.auth)
+        if r is None or r.status_code != 200:
+            return
+        page = r.json()
+        products += page["items"]
+        if not page["next_cursor"]:
+            break
+        params["cursor"] = page["next_cursor"]
+    if not products:
+        return
+    product_id = vu.rng.choice(products)["id"]
+    await vu.request("GET /api/products/{id}", "GET", f"/api/products/{product_id}", headers=vu.auth)
+
+
+async def login_burst(vu: VirtualUser):
+    """
+    비밀번호 로그인 폭주 (Argon2). 429/503 비율도 결과에 남는다
+    """
+    user_id = vu.rng.randint(1, vu.m.last_user)
+    await vu.request(
+        "POST /api/users/login", "POST", "/api/users/login",
+        json={"email": vu.m.email_format.format(id=user_id), "password": vu.m.password},
+    )
+
+
+async def gps_verify(vu: VirtualUser):
+    """
+    동네 인증. 대부분 반경 안, 일부는 반경 밖 좌표
+    """
+    region = vu.region()
+    spread = 0.01 if vu.rng.random() < 0.8 else 0.1
+    await vu.request(
+        "POST /api/regions/verify-gps", "POST", "/api/regions/verify-gps",
+        json={
+            "region_id": region["id"],
+            "lat": region["lat"] + vu.rng.uniform(-spread, spread),
+            "lng": region["lng"] + vu.rng.uniform(-spread, spread),
+        },
+        headers=vu.auth,
+    )
+
+
+SCENARIOS: Dict[str, Callable[[VirtualUser], Awaitable[None]]] = {
+    "feed_scroll": feed_scroll,
+    "post_detail": post_detail,
+    "like_storm": like_storm,
+    "search": search,
+    "login_burst": login_burst,
+    "gps_verify": gps_verify,
+}
+
+
+# =========================
+# 실행
+# =========================
+
+async def run_scenario(name: str, args, manifest: Manifest) -> dict:
+    script = SCENARIOS[name]
+    samples: List[Sample] = []
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+        users = [
+            VirtualUser(client, manifest, args.seed * 10_000 + i, samples)
+            for i in range(args.concurrency)
+        ]
+
+        async def loop(vu: VirtualUser, deadline: float):
+            while time.monotonic() < deadline:
+                await script(vu)
+
+        if args.warmup:
+            await asyncio.gather(*(loop(vu, time.monotonic() + args.warmup) for vu in users))
+            samples.clear()
+
+        started = time.monotonic()
+        await asyncio.gather(*(loop(vu, started + args.duration) for vu in users))
+        elapsed = time.monotonic() - started
+
+    by_endpoint: Dict[str, List[Sample]] = defaultdict(list)
+    for s in samples:
+        by_endpoint[s.endpoint].append(s)
+    result = summarize(samples, elapsed)
+    result["endpoints"] = {ep: summarize(items, elapsed) for ep, items in sorted(by_endpoint.items())}
+    return result
+
+
+def _git_rev() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _print_table(results: Dict[str, dict]):
+    print(f"{'scenario / endpoint':<46}{'req':>8}{'rps':>9}{'p50':>8}{'p95':>8}{'p99':>8}{'q/req':>7}{'err':>6}",
+          file=sys.stderr)
+    for name, result in results.items():
+        rows = [(name, result)] + [(f"  {ep}", r) for ep, r in result["endpoints"].items()]
+        for label, r in rows:
+            lat, q = r["latency_ms"], r["queries_per_request"]["mean"]
+            print(
+                f"{label:<46}{r['requests']:>8}{r['rps']:>9.1f}{lat['p50']:>8.1f}{lat['p95']:>8.1f}"
+                f"{lat['p99']:>8.1f}{'-' if q is None else q:>7}{r['errors']:>6}",
+                file=sys.stderr,
+            )
+
+
+def cmd_run(args) -> int:
+    with open(args.manifest, encoding="utf-8") as f:
+        manifest = Manifest(json.load(f))
+    names = args.scenario.split(",") if args.scenario else list(SCENARIOS)
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        print(f"unknown scenario: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    results = {}
+    for name in names:
+        print(f"running {name} ({args.concurrency} users, {args.duration}s)...", file=sys.stderr)
+        results[name] = asyncio.run(run_scenario(name, args, manifest))
+
+    report = {
+        "meta": {
+            "started_at": datetime.utcnow().isoformat(timespec="seconds"),
+            "git_rev": _git_rev(),
+            "base_url": args.base_url,
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "warmup_s": args.warmup,
+            "seed": args.seed,
+            "data": {"scale": manifest.data["scale"], "seed": manifest.data["seed"]},
+        },
+        "scenarios": results,
+    }
+    _print_table(results)
+    payload = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output == "-":
+        print(payload)
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(payload)
+        print(f"results -> {args.output}", file=sys.stderr)
+    return 0
+
+
+# =========================
+# 비교
+# =========================
+
+def _pct(before: float, after: float) -> str:
+    if not before:
+        return "-"
+    return f"{(after - before) / before * 100:+.1f}%"
+
+
+def cmd_compare(args) -> int:
+    """
+    두 결과 파일을 엔드포인트별로 비교. --max-p95-regression 을 넘는 p95 증가가 있으면 exit 1
+    """
+    with open(args.before, encoding="utf-8") as f:
+        before = json.load(f)["scenarios"]
+    with open(args.after, encoding="utf-8") as f:
+        after = json.load(f)["scenarios"]
+
+    regressed = []
+    print(f"{'scenario / endpoint':<46}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'q/req':>14}")
+    for name in [n for n in before if n in after]:
+        rows = [(name, before[name], after[name])] + [
+            (f"  {ep}", b, after[name]["endpoints"][ep])
+            for ep, b in before[name]["endpoints"].items()
+            if ep in after[name]["endpoints"]
+        ]
+        for label, b, a in rows:
+            qb, qa = b["queries_per_request"]["mean"], a["queries_per_request"]["mean"]
+            p95 = _pct(b["latency_ms"]["p95"], a["latency_ms"]["p95"])
+            print(
+                f"{label:<46}{_pct(b['rps'], a['rps']):>9}"
+                f"{_pct(b['latency_ms']['p50'], a['latency_ms']['p50']):>9}{p95:>9}"
+                f"{_pct(b['latency_ms']['p99'], a['latency_ms']['p99']):>9}"
+                f"{'-' if qb is None or qa is None else f'{qb} -> {qa}':>14}"
+            )
+            if (
+                args.max_p95_regression is not None
+                and b["latency_ms"]["p95"]
+                and (a["latency_ms"]["p95"] - b["latency_ms"]["p95"]) / b["latency_ms"]["p95"] * 100
+                > args.max_p95_regression
+            ):
+                regressed.append(label.strip())
+
+    if regressed:
+        print(f"p95 regression over {args.max_p95_regression}%: {', '.join(regressed)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["compare"]:
+        parser = argparse.ArgumentParser(prog="bench.loadtest compare")
+        parser.add_argument("before")
+        parser.add_argument("after")
+        parser.add_argument("--max-p95-regression", type=float, default=None, help="허용 p95 증가율(%%)")
+        return cmd_compare(parser.parse_args(argv[1:]))
+
+    parser = argparse.ArgumentParser(description="Scripted HTTP load test")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--manifest", default="bench_manifest.json")
+    parser.add_argument("--scenario", help=f"쉼표로 구분 (기본 전체: {', '.join(SCENARIOS)})")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30.0, help="시나리오당 측정 시간(초)")
+    parser.add_argument("--warmup", type=float, default=5.0, help="측정 전 버리는 시간(초)")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("-o", "--output", default="-", help="결과 JSON 파일 (기본 stdout)")
+    return cmd_run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,523 @@
+# bench/querybudget.py
+"""
+요청/CRUD 함수별 쿼리 예산 검사 (bench/datagen.py 로 채운 DB 대상)
+
+    python -m bench.datagen --scale small --reset    # MySQL bench DB
+    python -m bench.querybudget                      # 기준선과 비교, 어긋나면 exit 1
+    python -m bench.querybudget --case post_detail -v
+    python -m bench.querybudget --update             # 의도한 변경이면 기준선 갱신 (커밋에 포함)
+    python -m bench.querybudget --no-explain         # MySQL 이 아닌 DB: 문장 수만 (full scan 미검사)
+
+케이스마다 데이터 크기가 다른 두 대상(small / large: 댓글 1개 글 vs 댓글 제일 많은 글,
+상품 적은 판매자 vs 많은 판매자 ...)으로 같은 요청을 보내고, 엔진 이벤트로 실행된 SQL을 모두
+기록한다. 한 번 호출해서 캐시를 데운 뒤 두 번째 호출을 잰다.
+
+실패 조건
+- 문장 수가 기준선(bench/query_baselines.json)보다 많다
+- small / large 문장 수가 다르다 (데이터가 늘면 쿼리도 늘어남 = N+1)
+- 한 요청 안에서 같은 모양의 문장이 반복된다 (리터럴/IN 목록을 지운 모양 기준)
+- EXPLAIN 에서 기준선에 없는 테이블 full scan (작은 테이블은 제외)
+
+EXPLAIN 은 MySQL 에서만 돌 수 있으므로 다른 DB 에서는 --no-explain 을 직접 줘야 한다 (조용히 건너뛰지 않는다).
+기준선은 --scale small 이상에서만 기록한다: tiny 는 small/large 대상 차이가 작아 N+1 이 드러나지 않고,
+옵티마이저가 작은 테이블은 인덱스 대신 full scan 을 고르기도 한다.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import event, text
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "query_baselines.json")
+VARIANTS = ("small", "large")
+
+# 이보다 행이 적은 테이블의 full scan은 무시 (regions, categories 같은 기준 테이블)
+FULL_SCAN_MIN_ROWS = 1000
+
+# --update 는 이 테이블들이 모두 MIN_BASELINE_ROWS 행 이상일 때만 (datagen --scale small 의 users 수)
+BASELINE_SIZE_TABLES = ("users", "products", "community_posts")
+MIN_BASELINE_ROWS = 20_000
+META_KEY = "_meta"
+
+
+# =========================
+# 기록
+# =========================
+
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:%s|\?|%\(\w+\)s)(?:\s*,\s*(?:%s|\?|%\(\w+\)s))*\s*\)")
+_NUMBER = re.compile(r"\b\d+\b")
+_SPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """
+    리터럴 숫자, IN/VALUES 자리표시자 목록을 지운 모양. 같은 모양이 반복되면 N+1 의심
+    """
+    shape = _SPACE.sub(" ", statement).strip()
+    shape = _PLACEHOLDER_LIST.sub("(?)", shape)
+    return _NUMBER.sub("N", shape)
+
+
+@dataclass
+class Statement:
+    sql: str
+    params: object
+    executemany: bool
+
+    @property
+    def shape(self) -> str:
+        return statement_shape(self.sql)
+
+
+class QueryRecorder:
+    """
+    engine 의 before_cursor_execute 로 실행 문장을 모은다. begin()/end() 사이가 한 요청
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.requests: List[List[Statement]] = []
+        self._current: Optional[List[Statement]] = None
+        event.listen(engine, "before_cursor_execute", self._record)
+
+    def close(self):
+        event.remove(self.engine, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if self._current is not None:
+            self._current.append(Statement(statement, parameters, executemany))
+
+    def begin(self):
+        self._current = []
+
+    def end(self):
+        self.requests.append(self._current)
+        self._current = None
+
+    def reset(self):
+        self.requests = []
+        self._current = None
+
+
+# =========================
+# 케이스
+# =========================
+
+class CaseFailure(Exception):
+    pass
+
+
+class Context:
+    def __init__(self, client, recorder: QueryRecorder, fixtures: Dict[str, Dict[str, int]]):
+        self.client = client
+        self.recorder = recorder
+        self.fx = fixtures
+        self._tokens: Dict[int, str] = {}
+
+    def auth(self, user_id: int) -> Dict[str, str]:
+        if user_id not in self._tokens:
+            from core.security import create_access_token
+
+            self._tokens[user_id] = create_access_token(user_id)
+        return {"Authorization": f"Bearer {self._tokens[user_id]}"}
+
+    def call(self, method: str, path: str, *, user: Optional[int] = None, **kwargs):
+        """
+        한 요청 = 기록 한 칸. 2xx가 아니면 케이스 실패
+        """
+        if user is not None:
+            kwargs["headers"] = {**kwargs.get("headers", {}), **self.auth(user)}
+        self.recorder.begin()
+        try:
+            response = self.client.request(method, path, **kwargs)
+        finally:
+            self.recorder.end()
+        if not 200 <= response.status_code < 300:
+            raise CaseFailure(f"{method} {path} -> {response.status_code} {response.text[:200]}")
+        return response
+
+    def crud(self, fn: Callable, *args, **kwargs):
+        """
+        CRUD 함수 직접 호출 (요청 하나와 같은 단위로 기록). 쓰기는 commit하지 않는다
+        """
+        from db.session import SessionLocal
+
+        db = SessionLocal()
+        self.recorder.begin()
+        try:
+            return fn(db, *args, **kwargs)
+        finally:
+            self.recorder.end()
+            db.rollback()
+            db.close()
+
+
+CASES: Dict[str, Callable[[Context, str], None]] = {}
+
+
+def case(name: str):
+    def register(fn):
+        CASES[name] = fn
+        return fn
+    return register
+
+
+@case("post_detail")
+def _post_detail(ctx: Context, v: str):
+    ctx.call("GET", f"/api/community/posts/{ctx.fx['post'][v]}", user=ctx.fx["viewer"][v])
+
+
+@case("post_comments")
+def _post_comments(ctx: Context, v: str):
+    ctx.call("GET", f"/api/community/posts/{ctx.fx['post'][v]}/comments")
+
+
+@case("comments_tree")
+def _comments_tree(ctx: Context, v: str):
+    from db.crud_comment import get_comments_tree
+
+    ctx.crud(get_comments_tree, ctx.fx["post"][v])
+
+
+@case("feed_recent")
+def _feed_recent(ctx: Context, v: str):
+    size = 5 if v == "small" else 50
+    ctx.call("GET", "/api/community/posts", user=ctx.fx["viewer"][v],
+             params={"region_id": ctx.fx["post_region"][v], "size": size})
+
+
+@case("feed_popular")
+def _feed_popular(ctx: Context, v: str):
+    size = 5 if v == "small" else 50
+    ctx.call("GET", "/api/community/posts", user=ctx.fx["viewer"][v],
+             params={"region_id": ctx.fx["post_region"][v], "size": size, "sort": "popular"})
+
+
+@case("feed_next_page")
+def _feed_next_page(ctx: Context, v: str):
+    params = {"region_id": ctx.fx["post_region"]["large"], "size": 5 if v == "small" else 50, "sort": "popular"}
+    first = ctx.call("GET", "/api/community/posts", user=ctx.fx["viewer"][v], params=params)
+    ctx.recorder.requests.pop()  # 첫 페이지는 재지 않는다
+    params["cursor"] = first.json()["next_cursor"]
+    ctx.call("GET", "/api/community/posts", user=ctx.fx["viewer"][v], params=params)
+
+
+@case("products_region")
+def _products_region(ctx: Context, v: str):
+    ctx.call("GET", f"/api/products/region/{ctx.fx['product_region'][v]}", user=ctx.fx["viewer"][v])
+
+
+@case("products_browse")
+def _products_browse(ctx: Context, v: str):
+    size = 5 if v == "small" else 50
+    ctx.call("GET", "/api/products", user=ctx.fx["viewer"][v],
+             params={"region_id": ctx.fx["product_region"][v], "size": size, "sort": "price_asc", "max_price": 1000000})
+
+
+@case("products_browse_next_page")
+def _products_browse_next_page(ctx: Context, v: str):
+    params = {"region_id": ctx.fx["product_region"]["large"], "size": 5 if v == "small" else 50, "sort": "likes"}
+    first = ctx.call("GET", "/api/products", user=ctx.fx["viewer"][v], params=params)
+    ctx.recorder.requests.pop()  # 첫 페이지는 재지 않는다
+    params["cursor"] = first.json()["next_cursor"]
+    ctx.call("GET", "/api/products", user=ctx.fx["viewer"][v], params=params)
+
+
+@case("product_detail")
+def _product_detail(ctx: Context, v: str):
+    ctx.call("GET", f"/api/products/{ctx.fx['product'][v]}", user=ctx.fx["viewer"][v])
+
+
+@case("products_me")
+def _products_me(ctx: Context, v: str):
+    ctx.call("GET", "/api/products/me", user=ctx.fx["seller"][v])
+
+
+@case("product_like_toggle")
+def _product_like_toggle(ctx: Context, v: str):
+    product_id = ctx.fx["product"][v]
+    ctx.call("PUT", f"/api/products/{product_id}/like", user=ctx.fx["viewer"][v])
+    ctx.call("DELETE", f"/api/products/{product_id}/like", user=ctx.fx["viewer"][v])
+
+
+def _batch_ids(first: int, v: str) -> List[int]:
+    # small: 한 건 + 없는 id, large: 요청당 최대 개수. 둘 다 없는 id 가 섞여 있어야 캐시 경로가 같다
+    if v == "small":
+        return [first, 0]
+    return [first, 0] + list(range(1, 99))
+
+
+@case("products_batch_get")
+def _products_batch_get(ctx: Context, v: str):
+    ctx.call("POST", "/api/products:batchGet", user=ctx.fx["viewer"][v],
+             json={"ids": _batch_ids(ctx.fx["product"][v], v)})
+
+
+@case("posts_batch_get")
+def _posts_batch_get(ctx: Context, v: str):
+    payload = {"ids": _batch_ids(ctx.fx["post"][v], v)}
+    ctx.call("POST", "/api/community/posts:batchGet", user=ctx.fx["viewer"][v], json=payload)
+    ctx.recorder.requests.pop()  # 첫 호출은 행 캐시 채우기 (캐시 상태와 무관하게 비교)
+    ctx.call("POST", "/api/community/posts:batchGet", user=ctx.fx["viewer"][v], json=payload)
+
+
+@case("users_batch_summary")
+def _users_batch_summary(ctx: Context, v: str):
+    ctx.call("POST", "/api/users:batchSummary", user=ctx.fx["viewer"][v],
+             json={"ids": _batch_ids(ctx.fx["seller"][v], v)})
+
+
+@case("chat_inbox")
+def _chat_inbox(ctx: Context, v: str):
+    ctx.call("GET", "/api/chat/rooms", user=ctx.fx["chat_user"][v])
+
+
+@case("chat_messages")
+def _chat_messages(ctx: Context, v: str):
+    room_id, user_id = ctx.fx["room"][v], ctx.fx["room_member"][v]
+    ctx.call("GET", f"/api/chat/rooms/{room_id}/messages", user=user_id)
+
+
+# =========================
+# 고정 대상 (데이터에서 small / large 고르기, 기록하지 않음)
+# =========================
+
+_FIXTURE_SQL = {
+    # 댓글 1~3개 글 vs 댓글 제일 많은 글
+    "post": (
+        "SELECT id FROM community_posts WHERE is_hidden = 0 AND comment_count BETWEEN 1 AND 3 ORDER BY id LIMIT 1",
+        "SELECT id FROM community_posts WHERE is_hidden = 0 ORDER BY comment_count DESC, id LIMIT 1",
+    ),
+    "post_region": (
+        "SELECT region_id FROM community_posts GROUP BY region_id ORDER BY COUNT(*), region_id LIMIT 1",
+        "SELECT region_id FROM community_posts GROUP BY region_id ORDER BY COUNT(*) DESC, region_id LIMIT 1",
+    ),
+    "product_region": (
+        "SELECT region_id FROM products GROUP BY region_id ORDER BY COUNT(*), region_id LIMIT 1",
+        "SELECT region_id FROM products GROUP BY region_id ORDER BY COUNT(*) DESC, region_id LIMIT 1",
+    ),
+    # 이미지/좋아요 적은 상품 vs 인기 상품
+    "product": (
+        "SELECT id FROM products WHERE like_count = 0 ORDER BY id LIMIT 1",
+        "SELECT id FROM products ORDER BY like_count DESC, id LIMIT 1",
+    ),
+    "seller": (
+        "SELECT seller_id FROM products GROUP BY seller_id ORDER BY COUNT(*), seller_id LIMIT 1",
+        "SELECT seller_id FROM products GROUP BY seller_id ORDER BY COUNT(*) DESC, seller_id LIMIT 1",
+    ),
+    # 좋아요를 거의 안 누른 사용자 vs 제일 많이 누른 사용자 (liked_by_me 계산)
+    "viewer": (
+        "SELECT id FROM users WHERE id NOT IN (SELECT user_id FROM product_likes) ORDER BY id LIMIT 1",
+        "SELECT user_id FROM product_likes GROUP BY user_id ORDER BY COUNT(*) DESC, user_id LIMIT 1",
+    ),
+    "chat_user": (
+        "SELECT user_id FROM chat_room_members GROUP BY user_id ORDER BY COUNT(*), user_id LIMIT 1",
+        "SELECT user_id FROM chat_room_members GROUP BY user_id ORDER BY COUNT(*) DESC, user_id LIMIT 1",
+    ),
+    "room": (
+        "SELECT room_id FROM chat_messages GROUP BY room_id ORDER BY COUNT(*), room_id LIMIT 1",
+        "SELECT room_id FROM chat_messages GROUP BY room_id ORDER BY COUNT(*) DESC, room_id LIMIT 1",
+    ),
+}
+
+
+def load_fixtures(engine) -> Dict[str, Dict[str, int]]:
+    fixtures = {}
+    with engine.connect() as conn:
+        for name, queries in _FIXTURE_SQL.items():
+            ids = [conn.execute(text(sql)).scalar() for sql in queries]
+            if None in ids:
+                raise SystemExit(f"no fixture for {name} (seed the database with bench.datagen first)")
+            fixtures[name] = dict(zip(VARIANTS, ids))
+        fixtures["room_member"] = {
+            v: conn.execute(
+                text("SELECT buyer_id FROM chat_rooms WHERE id = :id"), {"id": fixtures["room"][v]}
+            ).scalar()
+            for v in VARIANTS
+        }
+    return fixtures
+
+
+# =========================
+# 실행 / 분석
+# =========================
+
+def _explain_full_scans(engine, statements: List[Statement]) -> List[str]:
+    """
+    SELECT 모양마다 한 번 EXPLAIN. type=ALL 이고 rows가 큰 테이블 이름
+    """
+    if engine.dialect.name != "mysql":
+        return []
+    tables = set()
+    seen = set()
+    with engine.connect() as conn:
+        for stmt in statements:
+            if stmt.executemany or not stmt.sql.lstrip().upper().startswith("SELECT") or stmt.shape in seen:
+                continue
+            seen.add(stmt.shape)
+            plan = conn.exec_driver_sql("EXPLAIN " + stmt.sql, stmt.params).mappings().all()
+            for row in plan:
+                if row.get("type") == "ALL" and (row.get("rows") or 0) >= FULL_SCAN_MIN_ROWS:
+                    tables.add(row["table"])
+    return sorted(tables)
+
+
+def table_rows(engine) -> Dict[str, int]:
+    with engine.connect() as conn:
+        return {
+            table: conn.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar()
+            for table in BASELINE_SIZE_TABLES
+        }
+
+
+def run_case(ctx: Context, name: str, engine, *, explain: bool = True) -> dict:
+    fn = CASES[name]
+    result = {"statements": {}, "repeated": {}, "full_scans": [], "shapes": {}}
+    full_scans = set()
+    for v in VARIANTS:
+        fn(ctx, v)  # 캐시 데우기
+        ctx.recorder.reset()
+        fn(ctx, v)
+        requests = ctx.recorder.requests
+        ctx.recorder.reset()
+
+        statements = [s for req in requests for s in req]
+        result["statements"][v] = len(statements)
+        result["shapes"][v] = [s.shape for s in statements]
+        repeated = {}
+        for req in requests:
+            for shape, count in Counter(s.shape for s in req).items():
+                if count > 1:
+                    repeated[shape] = max(count, repeated.get(shape, 0))
+        result["repeated"][v] = repeated
+        if explain:
+            full_scans.update(_explain_full_scans(engine, statements))
+    result["full_scans"] = sorted(full_scans)
+    return result
+
+
+def check(name: str, result: dict, baseline: Optional[dict], *, explain: bool = True) -> List[str]:
+    problems = []
+    counts = result["statements"]
+    if len(set(counts.values())) > 1:
+        problems.append(f"statement count grows with data: {counts}")
+    for v in VARIANTS:
+        for shape, count in result["repeated"][v].items():
+            problems.append(f"[{v}] same statement {count}x in one request: {shape[:160]}")
+    if baseline is None:
+        problems.append("no baseline (run with --update)")
+        return problems
+    for v in VARIANTS:
+        if counts[v] > baseline["statements"][v]:
+            problems.append(f"[{v}] statements {baseline['statements'][v]} -> {counts[v]}")
+    new_scans = sorted(set(result["full_scans"]) - set(baseline.get("full_scans", [])))
+    if explain and new_scans:
+        problems.append(f"new full table scan: {', '.join(new_scans)}")
+    return problems
+
+
+def _baseline_entry(result: dict, previous: Optional[dict], explain: bool) -> dict:
+    # --no-explain 이면 full scan 기준선은 (MySQL 에서 기록한) 이전 값을 그대로 둔다
+    full_scans = result["full_scans"] if explain else (previous or {}).get("full_scans", [])
+    return {"statements": result["statements"], "full_scans": full_scans}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Query budget regression check")
+    parser.add_argument("--case", help=f"쉼표로 구분 (기본 전체: {', '.join(CASES)})")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update", action="store_true", help="현재 결과로 기준선을 다시 쓴다")
+    parser.add_argument("-v", "--verbose", action="store_true", help="문장 모양까지 출력")
+    parser.add_argument("--json", help="전체 결과(문장 모양 포함)를 JSON으로 저장")
+    parser.add_argument("--no-explain", action="store_true",
+                        help="EXPLAIN full scan 검사 없이 문장 수만 (MySQL 이 아닌 DB)")
+    args = parser.parse_args(argv)
+
+    from fastapi.testclient import TestClient
+
+    import main as app_main
+    from core.config import settings
+    from db.session import engine
+
+    settings.RATE_LIMIT_ENABLED = False
+    names = args.case.split(",") if args.case else list(CASES)
+    unknown = [n for n in names if n not in CASES]
+    if unknown:
+        print(f"unknown case: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    explain = not args.no_explain
+    if explain and engine.dialect.name != "mysql":
+        print(f"EXPLAIN (full scan check) needs MySQL, not {engine.dialect.name}; "
+              "run against the MySQL bench database or pass --no-explain", file=sys.stderr)
+        return 2
+
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baselines = json.load(f)
+
+    rows = table_rows(engine)
+    if args.update and min(rows.values()) < MIN_BASELINE_ROWS:
+        print(f"baseline needs at least {MIN_BASELINE_ROWS} rows in {', '.join(BASELINE_SIZE_TABLES)} "
+              f"(have {rows}); seed with bench.datagen --scale small or larger", file=sys.stderr)
+        return 2
+    if not explain:
+        print("full scans not checked (--no-explain)", file=sys.stderr)
+    elif not args.update and "full_scans" not in baselines.get(META_KEY, {}):
+        print("baseline full_scans were never recorded on MySQL: any full scan fails (--update to record)",
+              file=sys.stderr)
+
+    fixtures = load_fixtures(engine)
+    recorder = QueryRecorder(engine)
+    # startup 이벤트(백그라운드 작업)는 돌리지 않는다: 기록에 섞이지 않게
+    ctx = Context(TestClient(app_main.app), recorder, fixtures)
+
+    results, failed = {}, 0
+    try:
+        for name in names:
+            try:
+                results[name] = result = run_case(ctx, name, engine, explain=explain)
+            except CaseFailure as e:
+                print(f"FAIL {name}: {e}", file=sys.stderr)
+                failed += 1
+                continue
+            problems = [] if args.update else check(name, result, baselines.get(name), explain=explain)
+            counts = "/".join(str(result["statements"][v]) for v in VARIANTS)
+            print(f"{'FAIL' if problems else 'ok  '} {name:<22} statements {counts}", file=sys.stderr)
+            for problem in problems:
+                print(f"     - {problem}", file=sys.stderr)
+            if args.verbose:
+                for shape in result["shapes"]["large"]:
+                    print(f"       {shape[:200]}", file=sys.stderr)
+            failed += bool(problems)
+    finally:
+        recorder.close()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"fixtures": fixtures, "cases": results}, f, ensure_ascii=False, indent=2)
+
+    if args.update:
+        baselines.update({
+            name: _baseline_entry(r, baselines.get(name), explain) for name, r in results.items()
+        })
+        meta = baselines.get(META_KEY, {})
+        meta["statements"] = {"dialect": engine.dialect.name, "rows": rows}
+        if explain:
+            meta["full_scans"] = {"dialect": engine.dialect.name, "rows": rows}
+        baselines[META_KEY] = meta
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(dict(sorted(baselines.items())), f, indent=2)
+            f.write("\n")
+        print(f"baseline -> {args.baseline}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+# bench/serialization.py
+"""
+목록 응답 직렬화 비용 비교 (DB 없이 응답 변환 + 인코딩만 측정)
+
+    python -m bench.serialization [--rows 50] [--repeat 2000]
+
+before : ORM 엔티티 -> response_model 검증(serialize_response) -> JSONResponse(json.dumps)
+after  : Core row 튜플 -> schemas.dto dataclass -> ORJSONResponse(orjson)
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from db.models import CommunityPost, Product, ProductImage, ProductStatus
+from schemas.community import CommunityPostListItem, CommunityPostListResponse
+from schemas.dto import PostListItem, ProductDetail, ProductImageItem, ProductItem
+from schemas.product import ProductDetailResponse, ProductResponse
+
+
+def _timeit(fn, repeat: int) -> float:
+    fn()  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def _run_inline(coro):
+    """
+    serialize_response(is_coroutine=True)는 중간에 기다리는 곳이 없다. 이벤트 루프를 만들지 않고
+    끝까지 돌려서 변환 비용만 잰다 (asyncio.run 은 호출마다 루프 생성/정리 비용이 before 쪽에만 붙는다)
+    """
+    try:
+        coro.send(None)
+    except StopIteration as done:
+        return done.value
+    coro.close()
+    raise RuntimeError("serialize_response suspended")
+
+
+def _render_before(field, content):
+    data = _run_inline(serialize_response(field=field, response_content=content))
+    return JSONResponse(data).body
+
+
+def _product_rows(n: int):
+    return [
+        (i, f"상품 {i}", 10000 + i, "설명 " * 20, ProductStatus.selling, i % 17, 1, 3, f"/media/p/{i}/thumb.jpg")
+        for i in range(n, 0, -1)
+    ]
+
+
+def _post_rows(n: int):
+    now = datetime(2025, 1, 1)
+    return [
+        (i, f"게시글 제목 {i}", 3, 7, i % 11, i % 5, i * 3, now - timedelta(minutes=i), f"/media/c/{i}/thumb.jpg")
+        for i in range(n, 0, -1)
+    ]
+
+
+def bench_product_list(rows: int, repeat: int):
+    raw = _product_rows(rows)
+    orm = [
+        Product(id=r[0], title=r[1], price=r[2], description=r[3], status=r[4],
+                like_count=r[5], seller_id=r[6], region_id=r[7], thumbnail_url=r[8])
+        for r in raw
+    ]
+    field = create_response_field(name="response", type_=List[ProductResponse])
+
+    before = lambda: _render_before(field, orm)
+    after = lambda: ORJSONResponse([ProductItem(*r) for r in raw]).body
+    return _timeit(before, repeat), _timeit(after, repeat)
+
+
+def bench_product_detail(repeat: int):
+    r = _product_rows(1)[0]
+    orm = Product(id=r[0], title=r[1], price=r[2], description=r[3], status=r[4],
+                  like_count=r[5], seller_id=r[6], region_id=r[7], thumbnail_url=r[8])
+    images = [(f"https://cdn/{i}/medium.jpg", f"https://cdn/{i}/thumb.jpg", i) for i in range(5)]
+    orm.images = [ProductImage(image_url=url, thumbnail_url=thumb, sort_order=i) for url, thumb, i in images]
+    field = create_response_field(name="response", type_=ProductDetailResponse)
+
+    def after():
+        detail = ProductDetail(*r)
+        detail.images = [ProductImageItem(*img) for img in images]
+        return ORJSONResponse(detail).body
+
+    return _timeit(lambda: _render_before(field, orm), repeat), _timeit(after, repeat)
+
+
+def bench_post_list(rows: int, repeat: int):
+    raw = _post_rows(rows)
+    orm = [
+        CommunityPost(id=r[0], title=r[1], region_id=r[2], user_id=r[3], like_count=r[4],
+                      comment_count=r[5], view_count=r[6], created_at=r[7], thumbnail_url=r[8])
+        for r in raw
+    ]
+    field = create_response_field(name="response", type_=CommunityPostListResponse)
+
+    def before():
+        items = [
+            CommunityPostListItem(
+                id=p.id, title=p.title, region_id=p.region_id, user_id=p.user_id,
+                like_count=p.like_count or 0, comment_count=p.comment_count or 0,
+                view_count=p.view_count or 0, created_at=p.created_at, thumbnail_url=p.thumbnail_url,
+                liked_by_me=False,
+            )
+            for p in orm
+        ]
+        content = CommunityPostListResponse(items=items, page=1, size=rows, total=1000)
+        return _render_before(field, content)
+
+    def after():
+        items = [PostListItem(*r, False) for r in raw]
+        return ORJSONResponse(
+            {"items": items, "page": 1, "size": rows, "total": 1000, "next_cursor": None}
+        ).body
+
+    return _timeit(before, repeat), _timeit(after, repeat)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args(argv)
+
+    results = [
+        (f"GET /api/products/region/{{id}} ({args.rows} rows)", *bench_product_list(args.rows, args.repeat)),
+        ("GET /api/products/{id}", *bench_product_detail(args.repeat)),
+        (f"GET /api/community/posts ({args.rows} rows)", *bench_post_list(args.rows, args.repeat)),
+    ]
+
+    print(f"{'route':<48}{'before(us)':>12}{'after(us)':>12}{'speedup':>10}")
+    for name, before, after in results:
+        print(f"{name:<48}{before:>12.1f}{after:>12.1f}{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
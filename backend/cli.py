@@ -0,0 +1,232 @@
+# cli.py
+"""
+운영/마이그레이션용 CLI
+
+    python cli.py import-products --seller-id 1 --format csv products.csv
+    cat products.ndjson | python cli.py import-products --seller-id 1 -
+    python cli.py export products --after-id 120000 -o products.ndjson
+    python cli.py rebase-hot-scores --since-days 30
+    python cli.py backfill-chat-inbox
+    python cli.py compact-counters
+    python cli.py startup-report --top 15
+    python cli.py process-media --older-than-minutes 10
+"""
+import argparse
+import sys
+from datetime import datetime, timedelta
+
+
+def cmd_import_products(args) -> int:
+    from db.session import SessionLocal
+    from services.product_import import import_products
+
+    f = sys.stdin if args.file == "-" else open(args.file, encoding="utf-8-sig", newline="")
+    db = SessionLocal()
+    try:
+        result = import_products(
+            db,
+            args.seller_id,
+            f,
+            fmt=args.format,
+            chunk_size=args.chunk_size,
+        )
+    finally:
+        db.close()
+        if f is not sys.stdin:
+            f.close()
+
+    print(result.model_dump_json(indent=2))
+    return 0 if result.failed == 0 else 1
+
+
+def cmd_export(args) -> int:
+    from db.crud_export import EXPORT_TABLES, iter_export_ndjson
+
+    if args.table not in EXPORT_TABLES:
+        print(f"unknown table: {args.table}", file=sys.stderr)
+        return 2
+
+    out = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+    try:
+        for chunk in iter_export_ndjson(
+            args.table,
+            after_id=args.after_id,
+            until_id=args.until_id,
+            updated_since=args.updated_since,
+            limit=args.limit,
+        ):
+            out.write(chunk)
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+    return 0
+
+
+def cmd_rebase_hot_scores(args) -> int:
+    from core.config import settings
+    from db.crud_community import rebase_hot_scores
+    from db.session import session_scope
+
+    batch_size = args.batch_size or settings.HOT_REBASE_BATCH_SIZE
+    since = datetime.utcnow() - timedelta(days=args.since_days) if args.since_days else None
+
+    after_id, total = args.after_id, 0
+    while True:
+        # 배치마다 commit: 잠금을 오래 잡지 않고, 중간에 멈춰도 --after-id로 이어서 돌릴 수 있다
+        with session_scope() as db:
+            count, last_id = rebase_hot_scores(
+                db, after_id=after_id, batch_size=batch_size, since=since
+            )
+        if not count:
+            break
+        after_id, total = last_id, total + count
+        print(f"rebased {total} posts (last id {after_id})", file=sys.stderr)
+    return 0
+
+
+def cmd_backfill_chat_inbox(args) -> int:
+    from db.crud_chat import backfill_inbox
+    from db.models import ChatRoomMember
+    from db.session import engine, session_scope
+
+    # 앱을 아직 새 버전으로 띄우지 않았어도 돌 수 있게 (create_all 과 같은 정의)
+    ChatRoomMember.__table__.create(bind=engine, checkfirst=True)
+
+    after_id, total = args.after_id, 0
+    while True:
+        # 배치마다 commit (--after-id로 이어서 돌릴 수 있고, 다시 돌려도 이미 있는 참여자 행은 그대로)
+        with session_scope() as db:
+            count, last_id = backfill_inbox(db, after_id=after_id, batch_size=args.batch_size)
+        if not count:
+            break
+        after_id, total = last_id, total + count
+        print(f"backfilled {total} chat rooms (last id {after_id})", file=sys.stderr)
+    return 0
+
+
+def cmd_compact_counters(args) -> int:
+    from core.config import settings
+    from services.counters import compact_once
+
+    count = compact_once(args.batch_size or settings.COUNTER_COMPACT_BATCH_SIZE)
+    print(f"compacted {count} counter shards", file=sys.stderr)
+    return 0
+
+
+def cmd_process_media(args) -> int:
+    from services.media import process_stale
+
+    done, failed = process_stale(timedelta(minutes=args.older_than_minutes), limit=args.limit)
+    print(f"processed {done} images ({failed} failed)", file=sys.stderr)
+    return 0 if failed == 0 else 1
+
+
+def cmd_run_jobs(args) -> int:
+    import asyncio
+    import logging
+
+    from services.jobs import run_forever
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run_forever())
+    return 0
+
+
+def cmd_job_stats(args) -> int:
+    from db.crud_job import job_stats, requeue_failed
+    from db.session import session_scope
+
+    with session_scope() as db:
+        if args.requeue_failed:
+            count = requeue_failed(db, args.queue)
+            print(f"requeued {count} failed jobs", file=sys.stderr)
+        rows = job_stats(db)
+    for queue, status, count, oldest in rows:
+        print(f"{queue:<12} {status.value:<8} {count:>8}  oldest run_at {oldest}")
+    return 0
+
+
+def cmd_startup_report(args) -> int:
+    import json
+
+    from core.startup import import_time_report
+
+    report = import_time_report(args.module, top=args.top)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    print(f"import {report['module']}: {report['total_s'] * 1000:.0f} ms")
+    print("\n-- self time by top-level package --")
+    for row in report["packages"]:
+        print(f"{row['self_s'] * 1000:9.1f} ms  {row['name']}")
+    print("\n-- cumulative by module --")
+    for row in report["cumulative"]:
+        print(f"{row['cumulative_s'] * 1000:9.1f} ms  (self {row['self_s'] * 1000:6.1f})  {row['name']}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="cli")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("import-products", help="NDJSON/CSV 상품 대량 등록")
+    p.add_argument("file", help="입력 파일 경로 (- 이면 stdin)")
+    p.add_argument("--seller-id", type=int, required=True)
+    p.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    p.add_argument("--chunk-size", type=int, default=None)
+    p.set_defaults(func=cmd_import_products)
+
+    p = sub.add_parser("export", help="테이블 NDJSON 덤프 (서버 사이드 커서)")
+    p.add_argument("table", help="products | community_posts | community_comments | users")
+    p.add_argument("-o", "--output", default="-", help="출력 파일 경로 (기본 stdout)")
+    p.add_argument("--after-id", type=int, default=None)
+    p.add_argument("--until-id", type=int, default=None)
+    p.add_argument("--updated-since", type=datetime.fromisoformat, default=None)
+    p.add_argument("--limit", type=int, default=None)
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser("rebase-hot-scores", help="커뮤니티 hot_score 일괄 재계산")
+    p.add_argument("--since-days", type=int, default=None, help="최근 N일 작성 글만 (기본 전체)")
+    p.add_argument("--after-id", type=int, default=0, help="이 id 다음부터 (중단 후 재개용)")
+    p.add_argument("--batch-size", type=int, default=None)
+    p.set_defaults(func=cmd_rebase_hot_scores)
+
+    p = sub.add_parser("backfill-chat-inbox", help="인박스 이전 채팅방의 마지막 메시지/참여자 행 채우기")
+    p.add_argument("--after-id", type=int, default=0, help="이 방 id 다음부터 (중단 후 재개용)")
+    p.add_argument("--batch-size", type=int, default=500)
+    p.set_defaults(func=cmd_backfill_chat_inbox)
+
+    p = sub.add_parser("compact-counters", help="좋아요 shard를 like_count에 합치기")
+    p.add_argument("--batch-size", type=int, default=None)
+    p.set_defaults(func=cmd_compact_counters)
+
+    p = sub.add_parser("process-media", help="변환이 끝나지 않은(processing) 업로드 이미지 다시 변환")
+    p.add_argument("--older-than-minutes", type=int, default=10)
+    p.add_argument("--limit", type=int, default=100)
+    p.set_defaults(func=cmd_process_media)
+
+    p = sub.add_parser("run-jobs", help="백그라운드 작업 실행기만 띄우기 (JOBS_RUN_IN_APP=false 일 때)")
+    p.set_defaults(func=cmd_run_jobs)
+
+    p = sub.add_parser("job-stats", help="작업 큐 상태 (큐/상태별 개수)")
+    p.add_argument("--requeue-failed", action="store_true", help="failed 작업을 다시 queued 로")
+    p.add_argument("--queue", default=None)
+    p.set_defaults(func=cmd_job_stats)
+
+    p = sub.add_parser("startup-report", help="앱 import 시간 분석 (python -X importtime)")
+    p.add_argument("--module", default="main")
+    p.add_argument("--top", type=int, default=20)
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=cmd_startup_report)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
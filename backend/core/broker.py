@@ -0,0 +1,145 @@
+# core/broker.py
+"""
+파드 간 pub/sub 브로커
+
+- memory://  : 프로세스 내 구현 (로컬/테스트용 stand-in, 단일 파드)
+- redis://   : Redis pub/sub (redis 패키지는 선택 의존성, 사용할 때만 import)
+
+구독 콜백은 이벤트 루프에서 (channel, data) 로 호출되며 블로킹하면 안 된다.
+"""
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+BrokerCallback = Callable[[str, str], None]
+
+
+class Broker(ABC):
+    async def start(self):
+        pass
+
+    async def close(self):
+        pass
+
+    @abstractmethod
+    async def publish(self, channel: str, data: str):
+        raise NotImplementedError
+
+    @abstractmethod
+    async def subscribe(self, channel: str, callback: BrokerCallback):
+        raise NotImplementedError
+
+    @abstractmethod
+    async def unsubscribe(self, channel: str, callback: BrokerCallback):
+        raise NotImplementedError
+
+
+class InMemoryBroker(Broker):
+    """
+    같은 프로세스 안의 구독자에게 바로 전달. 여러 Hub 인스턴스가 같은 브로커를
+    공유하면 여러 파드가 붙어 있는 상황을 그대로 재현할 수 있다.
+    """
+
+    def __init__(self):
+        self._subscribers: Dict[str, List[BrokerCallback]] = {}
+
+    async def publish(self, channel: str, data: str):
+        for callback in list(self._subscribers.get(channel, ())):
+            try:
+                callback(channel, data)
+            except Exception:
+                logger.exception("broker callback failed (channel=%s)", channel)
+
+    async def subscribe(self, channel: str, callback: BrokerCallback):
+        self._subscribers.setdefault(channel, []).append(callback)
+
+    async def unsubscribe(self, channel: str, callback: BrokerCallback):
+        callbacks = self._subscribers.get(channel)
+        if not callbacks:
+            return
+        if callback in callbacks:
+            callbacks.remove(callback)
+        if not callbacks:
+            del self._subscribers[channel]
+
+
+class RedisBroker(Broker):
+    def __init__(self, url: str):
+        self.url = url
+        self._redis = None
+        self._pubsub = None
+        self._reader_task: asyncio.Task | None = None
+        self._subscribers: Dict[str, List[BrokerCallback]] = {}
+
+    async def start(self):
+        import redis.asyncio as redis  # 선택 의존성
+
+        self._redis = redis.from_url(self.url, decode_responses=True)
+        self._pubsub = self._redis.pubsub()
+        self._reader_task = asyncio.create_task(self._reader())
+
+    async def close(self):
+        if self._reader_task:
+            self._reader_task.cancel()
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+        if self._redis is not None:
+            await self._redis.aclose()
+
+    async def _reader(self):
+        while True:
+            if not self._pubsub.subscribed:
+                await asyncio.sleep(0.05)
+                continue
+            try:
+                message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("redis pubsub read failed")
+                await asyncio.sleep(1.0)
+                continue
+            if not message:
+                continue
+            channel = message["channel"]
+            for callback in list(self._subscribers.get(channel, ())):
+                try:
+                    callback(channel, message["data"])
+                except Exception:
+                    logger.exception("broker callback failed (channel=%s)", channel)
+
+    async def publish(self, channel: str, data: str):
+        await self._redis.publish(channel, data)
+
+    async def subscribe(self, channel: str, callback: BrokerCallback):
+        callbacks = self._subscribers.setdefault(channel, [])
+        callbacks.append(callback)
+        if len(callbacks) == 1:
+            await self._pubsub.subscribe(channel)
+
+    async def unsubscribe(self, channel: str, callback: BrokerCallback):
+        callbacks = self._subscribers.get(channel)
+        if not callbacks:
+            return
+        if callback in callbacks:
+            callbacks.remove(callback)
+        if not callbacks:
+            del self._subscribers[channel]
+            await self._pubsub.unsubscribe(channel)
+
+
+def create_broker(url: str) -> Broker:
+    if url.startswith("memory://"):
+        return InMemoryBroker()
+    if url.startswith(("redis://", "rediss://")):
+        return RedisBroker(url)
+    raise ValueError(f"Unsupported broker url: {url}")
+
+
+# 프로세스당 하나 (채팅, 실시간 카운터가 공유). main.py startup/shutdown에서 start/close
+broker = create_broker(settings.BROKER_URL)
@@ -0,0 +1,240 @@
+# core/cache.py
+"""
+키-값 / 정렬 집합 캐시
+
+- local://  : 프로세스 내 구현 (로컬/테스트용 stand-in, 워커 프로세스마다 따로 가진다)
+- redis://  : Redis (redis 패키지는 선택 의존성, 사용할 때만 import). 모든 파드가 공유
+
+CRUD(threadpool)에서 호출하므로 동기 API. 값은 문자열로 저장하고 직렬화는 호출자 몫.
+정렬 집합은 Redis ZSET과 같은 의미: 점수 오름차순, 점수가 같으면 member 사전순.
+"""
+import bisect
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from core.config import settings
+
+
+class Cache(ABC):
+    # ---------- key / value ----------
+
+    @abstractmethod
+    def get_many(self, keys: Sequence[str]) -> List[Optional[str]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def set_many(self, mapping: Dict[str, str], ttl: Optional[int] = None):
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete(self, *keys: str):
+        raise NotImplementedError
+
+    @abstractmethod
+    def incr(self, key: str, delta: int = 1) -> Optional[int]:
+        """
+        키가 없으면 아무것도 하지 않고 None (없는 카운터를 0부터 새로 만들지 않는다)
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def add(self, key: str, value: str, ttl: Optional[int] = None) -> bool:
+        """
+        키가 없을 때만 쓴다 (SET NX). 썼으면 True. DB에서 읽어 채우는 쪽이 먼저 들어온 갱신을 덮지 않게
+        """
+        raise NotImplementedError
+
+    def get(self, key: str) -> Optional[str]:
+        return self.get_many([key])[0]
+
+    def set(self, key: str, value: str, ttl: Optional[int] = None):
+        self.set_many({key: value}, ttl)
+
+    # ---------- sorted set ----------
+
+    @abstractmethod
+    def zadd(self, key: str, mapping: Dict[str, float], max_len: Optional[int] = None) -> int:
+        """
+        추가 후 max_len을 넘으면 점수가 낮은 쪽부터 잘라낸다. 잘라낸 개수를 돌려준다
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def zrem(self, key: str, *members: str):
+        raise NotImplementedError
+
+    @abstractmethod
+    def zrevrange(self, key: str, start: int, stop: int) -> List[Tuple[str, float]]:
+        """
+        점수 내림차순 rank [start, stop] (stop 포함)
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def zrevrangebyscore(self, key: str, max_score: float, count: int) -> List[Tuple[str, float]]:
+        """
+        점수 <= max_score 인 것을 내림차순으로 최대 count개
+        """
+        raise NotImplementedError
+
+
+class LocalCache(Cache):
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values: Dict[str, Tuple[str, Optional[float]]] = {}
+        # key -> (score, member) 오름차순 리스트, member -> score
+        self._zsets: Dict[str, List[Tuple[float, str]]] = {}
+        self._zscores: Dict[str, Dict[str, float]] = {}
+
+    def _alive(self, key: str):
+        item = self._values.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._values[key]
+            return None
+        return item
+
+    def get_many(self, keys):
+        with self._lock:
+            return [item[0] if (item := self._alive(k)) else None for k in keys]
+
+    def set_many(self, mapping, ttl=None):
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            for key, value in mapping.items():
+                self._values[key] = (value, expires_at)
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._values.pop(key, None)
+                self._zsets.pop(key, None)
+                self._zscores.pop(key, None)
+
+    def incr(self, key, delta=1):
+        with self._lock:
+            item = self._alive(key)
+            if item is None:
+                return None
+            value = int(item[0]) + delta
+            self._values[key] = (str(value), item[1])
+            return value
+
+    def add(self, key, value, ttl=None):
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            if self._alive(key) is not None:
+                return False
+            self._values[key] = (value, expires_at)
+            return True
+
+    def _zremove(self, entries, scores, member):
+        score = scores.pop(member, None)
+        if score is not None:
+            del entries[bisect.bisect_left(entries, (score, member))]
+
+    def zadd(self, key, mapping, max_len=None):
+        with self._lock:
+            entries = self._zsets.setdefault(key, [])
+            scores = self._zscores.setdefault(key, {})
+            for member, score in mapping.items():
+                self._zremove(entries, scores, member)
+                bisect.insort(entries, (score, member))
+                scores[member] = score
+            trimmed = 0
+            if max_len is not None and len(entries) > max_len:
+                trimmed = len(entries) - max_len
+                for _, member in entries[:trimmed]:
+                    del scores[member]
+                del entries[:trimmed]
+            return trimmed
+
+    def zrem(self, key, *members):
+        with self._lock:
+            entries = self._zsets.get(key)
+            if entries is None:
+                return
+            scores = self._zscores[key]
+            for member in members:
+                self._zremove(entries, scores, member)
+
+    def zrevrange(self, key, start, stop):
+        with self._lock:
+            desc = self._zsets.get(key, [])[::-1]
+            return [(m, s) for s, m in desc[start:stop + 1]]
+
+    def zrevrangebyscore(self, key, max_score, count):
+        with self._lock:
+            entries = self._zsets.get(key, [])
+            end = bisect.bisect_right(entries, max_score, key=lambda e: e[0])
+            return [(m, s) for s, m in reversed(entries[max(end - count, 0):end])]
+
+
+class RedisCache(Cache):
+    def __init__(self, url: str, client=None):
+        if client is None:
+            import redis  # 선택 의존성
+
+            client = redis.Redis.from_url(url, decode_responses=True)
+        self._redis = client
+
+    def get_many(self, keys):
+        return self._redis.mget(keys) if keys else []
+
+    def set_many(self, mapping, ttl=None):
+        if not mapping:
+            return
+        pipe = self._redis.pipeline(transaction=False)
+        for key, value in mapping.items():
+            pipe.set(key, value, ex=ttl)
+        pipe.execute()
+
+    def delete(self, *keys):
+        if keys:
+            self._redis.delete(*keys)
+
+    # 키가 있을 때만 INCRBY (TTL 유지)
+    _INCR_IF_EXISTS = (
+        "if redis.call('EXISTS', KEYS[1]) == 1 then "
+        "return redis.call('INCRBY', KEYS[1], ARGV[1]) end return nil"
+    )
+
+    def incr(self, key, delta=1):
+        return self._redis.eval(self._INCR_IF_EXISTS, 1, key, delta)
+
+    def add(self, key, value, ttl=None):
+        return bool(self._redis.set(key, value, ex=ttl, nx=True))
+
+    def zadd(self, key, mapping, max_len=None):
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.zadd(key, mapping)
+        if max_len is not None:
+            pipe.zremrangebyrank(key, 0, -(max_len + 1))
+        results = pipe.execute()
+        return results[1] if max_len is not None else 0
+
+    def zrem(self, key, *members):
+        if members:
+            self._redis.zrem(key, *members)
+
+    def zrevrange(self, key, start, stop):
+        return self._redis.zrevrange(key, start, stop, withscores=True)
+
+    def zrevrangebyscore(self, key, max_score, count):
+        return self._redis.zrevrangebyscore(key, max_score, "-inf", start=0, num=count, withscores=True)
+
+
+def create_cache(url: str) -> Cache:
+    if url.startswith("local://"):
+        return LocalCache()
+    if url.startswith(("redis://", "rediss://")):
+        return RedisCache(url)
+    raise ValueError(f"Unsupported cache url: {url}")
+
+
+# 프로세스당 하나
+cache = create_cache(settings.CACHE_URL)
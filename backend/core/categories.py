@@ -0,0 +1,169 @@
+# core/categories.py
+"""
+카테고리 트리 스냅샷 (워커 프로세스마다 메모리에 하나)
+
+categories 테이블 전체를 SELECT 한 번으로 읽어 종류(CategoryType)별 트리를 만들고,
+노드마다 자식(sort_order 순), depth, 자손 id 집합(자기 포함)을 미리 계산해 둔다.
+GET /api/categories 응답 JSON 도 이때 만들어 둔다.
+목록 API 의 category 필터는 expand() 로 IN (자손 id) 조건이 된다 → 요청마다 재귀 쿼리 없음
+
+    categories:version   공유 캐시(core/cache.py)의 버전 키. 카테고리를 바꾸면 commit 뒤 새 값으로 바꾼다
+
+워커는 CATEGORY_TREE_CHECK_SECONDS 마다 버전 키만 읽어 보고 달라졌으면 다시 만든다.
+DB 를 직접 고친 경우를 위해 CATEGORY_TREE_MAX_AGE_SECONDS 가 지나면 버전과 무관하게 다시 만든다.
+"""
+import hashlib
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+import orjson
+
+from core.cache import Cache, cache
+from core.config import settings
+from db.models import CategoryType
+
+VERSION_KEY = "categories:version"
+
+# 트리 종류: None = 전체, product / community = 그 종류 + both
+KINDS = (None, CategoryType.product, CategoryType.community)
+
+
+@dataclass(frozen=True, slots=True)
+class CategoryNode:
+    id: int
+    name: str
+    slug: Optional[str]
+    type: CategoryType
+    parent_id: Optional[int]
+    sort_order: int
+    depth: int
+    children: Tuple[int, ...]
+
+
+class CategoryForest:
+    """
+    한 종류의 트리. 비활성 카테고리, 그 종류가 아닌 카테고리는 하위 트리째 빠진다
+    """
+
+    def __init__(self, nodes: Dict[int, CategoryNode], roots: Tuple[int, ...]):
+        self.nodes = nodes
+        self.roots = roots
+        self.descendants: Dict[int, FrozenSet[int]] = {}
+        for root in roots:
+            self._collect(root)
+        self.body = orjson.dumps([self._render(root) for root in roots])
+        self.etag = '"' + hashlib.blake2b(self.body, digest_size=8).hexdigest() + '"'
+
+    def _collect(self, node_id: int) -> FrozenSet[int]:
+        # 자손 집합: 자식들의 집합을 합친다 (노드마다 한 번씩만 계산)
+        ids = {node_id}
+        for child in self.nodes[node_id].children:
+            ids |= self._collect(child)
+        self.descendants[node_id] = frozenset(ids)
+        return self.descendants[node_id]
+
+    def _render(self, node_id: int) -> dict:
+        node = self.nodes[node_id]
+        return {
+            "id": node.id,
+            "name": node.name,
+            "slug": node.slug,
+            "type": node.type.value,
+            "parent_id": node.parent_id,
+            "depth": node.depth,
+            "children": [self._render(child) for child in node.children],
+        }
+
+
+def _visible(category_type: CategoryType, kind: Optional[CategoryType]) -> bool:
+    return kind is None or category_type in (kind, CategoryType.both)
+
+
+class CategoryTree:
+    """
+    rows: load_categories() 결과 (id, name, slug, type, parent_id, sort_order, is_active)
+    """
+
+    def __init__(self, rows: Iterable, version: Optional[str]):
+        self.version = version
+        self.built_at = time.monotonic()
+
+        rows = [r for r in rows if r.is_active]
+        children: Dict[Optional[int], List] = {}
+        ids = {r.id for r in rows}
+        for r in sorted(rows, key=lambda r: (r.sort_order or 0, r.id)):
+            # 부모가 비활성/없는 카테고리는 트리에 붙지 않는다
+            if r.parent_id is not None and r.parent_id not in ids:
+                continue
+            children.setdefault(r.parent_id, []).append(r)
+
+        self.forests: Dict[Optional[CategoryType], CategoryForest] = {}
+        for kind in KINDS:
+            nodes: Dict[int, CategoryNode] = {}
+
+            def add(row, depth: int) -> int:
+                kids = tuple(
+                    add(child, depth + 1)
+                    for child in children.get(row.id, ())
+                    if _visible(child.type, kind)
+                )
+                nodes[row.id] = CategoryNode(
+                    row.id, row.name, row.slug, row.type, row.parent_id, row.sort_order or 0, depth, kids
+                )
+                return row.id
+
+            roots = tuple(add(r, 0) for r in children.get(None, ()) if _visible(r.type, kind))
+            self.forests[kind] = CategoryForest(nodes, roots)
+
+    def forest(self, kind: Optional[CategoryType] = None) -> CategoryForest:
+        return self.forests[kind]
+
+    def expand(self, category_id: int, kind: Optional[CategoryType] = None) -> FrozenSet[int]:
+        """
+        category_id 와 그 자손 id. 스냅샷에 없는 id(방금 만든 것, 비활성)는 자기 자신만
+        """
+        return self.forests[kind].descendants.get(category_id) or frozenset((category_id,))
+
+
+class CategoryTreeCache:
+    def __init__(self, shared: Cache):
+        self._shared = shared
+        self._lock = threading.Lock()
+        self._tree: Optional[CategoryTree] = None
+        self._next_check = 0.0
+
+    def get(self, load: Callable[[], Iterable]) -> CategoryTree:
+        """
+        load: 스냅샷을 다시 만들어야 할 때만 호출 (categories 전체 SELECT)
+        """
+        tree = self._tree
+        if tree is not None and time.monotonic() < self._next_check:
+            return tree
+        with self._lock:
+            now = time.monotonic()
+            tree = self._tree
+            if tree is not None and now < self._next_check:
+                return tree
+            version = self._shared.get(VERSION_KEY)
+            if (
+                tree is None
+                or tree.version != version
+                or now - tree.built_at > settings.CATEGORY_TREE_MAX_AGE_SECONDS
+            ):
+                tree = self._tree = CategoryTree(load(), version)
+            self._next_check = now + settings.CATEGORY_TREE_CHECK_SECONDS
+            return tree
+
+    def invalidate(self):
+        """
+        카테고리를 바꾼 트랜잭션의 commit 뒤 (on_commit). 다른 워커/파드는 다음 버전 확인 때 다시 만든다
+        """
+        self._shared.set(VERSION_KEY, uuid.uuid4().hex)
+        self._next_check = 0.0
+
+
+# 프로세스당 하나
+category_trees = CategoryTreeCache(cache)
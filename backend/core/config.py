@@ -30,6 +30,123 @@ class Settings(BaseSettings):
 
     JWT_SECRET: str
 
+    # 상품 대량 등록: 한 트랜잭션(multi-row INSERT)에 넣는 행 수, 응답에 담는 최대 오류 수
+    PRODUCT_IMPORT_CHUNK_SIZE: int = 500
+    PRODUCT_IMPORT_MAX_ERRORS: int = 1000
+
+    # 파드 간 pub/sub (memory:// 는 단일 프로세스용, 멀티 워커/파드는 redis://...)
+    BROKER_URL: str = "memory://"
+
+    # 채팅: 메시지 group commit 주기/크기, 연결별 송신 큐 크기(넘치면 느린 클라이언트로 보고 끊음)
+    CHAT_FLUSH_INTERVAL_MS: int = 50
+    CHAT_FLUSH_BATCH_SIZE: int = 500
+    CHAT_SEND_QUEUE_SIZE: int = 256
+    CHAT_MESSAGE_MAX_LENGTH: int = 2000
+
+    # 실시간 카운터(SSE): 변경분을 모아서 내보내는 최소 간격, 구독 가능한 id 수, keep-alive 주기
+    LIVE_COUNTER_FLUSH_MS: int = 500
+    LIVE_MAX_SUBSCRIPTION_IDS: int = 100
+    LIVE_HEARTBEAT_SECONDS: int = 15
+
+    # 커뮤니티 인기글(hot) 점수 가중치/반감기, 재계산 배치 크기
+    HOT_LIKE_WEIGHT: float = 3.0
+    HOT_COMMENT_WEIGHT: float = 2.0
+    HOT_VIEW_WEIGHT: float = 0.1
+    HOT_HALF_LIFE_HOURS: float = 12.0
+    HOT_REBASE_BATCH_SIZE: int = 1000
+
+    # 공유 캐시 (local:// 은 프로세스별 메모리, 멀티 워커/파드는 redis://...)
+    CACHE_URL: str = "local://"
+    # 동네별 최신글 타임라인: 동네당 보관하는 글 수, 타임라인/게시글 행 캐시 TTL
+    TIMELINE_MAX_ENTRIES: int = 500
+    TIMELINE_TTL_SECONDS: int = 600
+    POST_ROW_CACHE_TTL_SECONDS: int = 60
+    # 카테고리 트리 스냅샷: 공유 캐시의 버전 키를 확인하는 주기, 버전과 무관하게 다시 읽는 주기
+    CATEGORY_TREE_CHECK_SECONDS: int = 5
+    CATEGORY_TREE_MAX_AGE_SECONDS: int = 600
+
+    # 좋아요 분산 카운터: 윈도우(초)당 좋아요가 임계치를 넘은 대상은 TTL 동안 K개 shard에 누적
+    COUNTER_SHARDING_ENABLED: bool = True
+    COUNTER_SHARDS: int = 16
+    COUNTER_HOT_WINDOW_SECONDS: int = 10
+    COUNTER_HOT_THRESHOLD: int = 30
+    COUNTER_SHARDED_TTL_SECONDS: int = 3600
+    COUNTER_PENDING_CACHE_SECONDS: int = 2
+    COUNTER_COMPACT_INTERVAL_SECONDS: int = 5
+    COUNTER_COMPACT_BATCH_SIZE: int = 1000
+
+    # 백그라운드 작업(jobs 테이블): 앱 워커 안에서 실행기를 돌릴지 (끄면 python cli.py run-jobs 로 따로)
+    # 큐별 동시 실행 수 "큐:수,...", 한 번에 꺼내는 행 수, 새 작업 확인 주기, lease(실행 중 표시 유효 시간)
+    # 재시도: 최대 시도 수(작업 종류별로 바꿀 수 있음), 지수 backoff 시작/최대(초)
+    JOBS_RUN_IN_APP: bool = True
+    JOB_QUEUES: str = "default:4,counters:1,notifications:1"
+    JOB_CLAIM_BATCH: int = 100
+    JOB_POLL_INTERVAL_SECONDS: float = 1.0
+    JOB_LEASE_SECONDS: int = 300
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_RETRY_BASE_SECONDS: float = 5.0
+    JOB_RETRY_MAX_SECONDS: float = 3600.0
+    # 알림 뱃지: 안 읽은 수 캐시 TTL (지나면 DB에서 다시 센다)
+    NOTIFICATION_UNREAD_TTL_SECONDS: int = 600
+    # 알림 묶음마다 기억하는 행위자 수 (actor_count 를 사람 기준으로 센다. 넘으면 오래된 사람부터 잊는다)
+    NOTIFICATION_MAX_TRACKED_ACTORS: int = 200
+
+    # 여러 건 한 번에 조회(products:batchGet, posts:batchGet, users:batchSummary) 요청당 최대 id 수
+    BATCH_GET_MAX_IDS: int = 100
+
+    # 클레임 인증(get_current_principal): 사용자별 auth epoch 캐시 TTL. 정지/해제는 commit 직후 바로 덮어쓴다
+    AUTH_EPOCH_CACHE_SECONDS: int = 300
+
+    # 요청 제한 (토큰 버킷, 분당 허용 수 = burst 크기). 버킷 저장소는 CACHE_URL 을 따른다
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_LOGIN_PER_MINUTE: int = 10
+    RATE_LIMIT_REGISTER_PER_MINUTE: int = 5
+    RATE_LIMIT_OAUTH_PER_MINUTE: int = 20
+    RATE_LIMIT_SEARCH_PER_MINUTE: int = 120
+    RATE_LIMIT_UPLOAD_PER_MINUTE: int = 30
+    # 워커 프로세스당 동시에 돌 수 있는 비밀번호 해시/검증 수 (넘으면 503, 피드용 threadpool 보호)
+    PASSWORD_HASH_MAX_CONCURRENCY: int = 4
+
+    # 운영 서버(server.py, gunicorn + uvicorn worker)
+    # WEB_WORKERS=0 이면 cgroup CPU quota(없으면 사용 가능한 CPU 수)만큼 띄운다
+    # keep-alive는 ingress upstream keepalive(60초)보다 길게 둬야 끊긴 연결로 502가 나지 않는다
+    # 워커는 WEB_MAX_REQUESTS(+jitter) 요청마다 재시작, SIGTERM 뒤 진행 중 요청을 기다리는 시간은 GRACEFUL
+    PORT: int = 8000
+    # /metrics, /internal/* 는 이 포트로 들어온 요청에만 응답한다 (ingress 는 PORT 로만 보낸다)
+    # 0 이면 포트를 가리지 않는다 (로컬 `uvicorn main:app` 은 포트 하나로만 뜬다)
+    INTERNAL_PORT: int = 0 if ENV == "local" else 9000
+    WEB_WORKERS: int = 0
+    WEB_BACKLOG: int = 2048
+    WEB_KEEPALIVE_SECONDS: int = 75
+    WEB_TIMEOUT_SECONDS: int = 60
+    WEB_MAX_REQUESTS: int = 20000
+    WEB_MAX_REQUESTS_JITTER: int = 2000
+    WEB_GRACEFUL_TIMEOUT_SECONDS: int = 30
+    # X-Forwarded-For/Proto 를 믿을 앞단 프록시(ingress) 주소/대역 (쉼표 구분, CIDR 가능). "*" 는 쓰지 않는다
+    # uvicorn 이 X-Forwarded-For 를 오른쪽부터 보며 여기 없는 첫 주소를 클라이언트 IP 로 쓴다 (ratelimit.client_ip)
+    WEB_FORWARDED_ALLOW_IPS: str = "127.0.0.1,::1"
+
+    # 이미지 업로드 저장소 (local://<디렉터리> 는 파드별 디스크, 멀티 파드는 s3://<bucket>/<prefix>)
+    # MEDIA_PUBLIC_BASE_URL: 저장소 키 앞에 붙이는 공개 URL (CDN 주소). local:// 이면 main이 /media 로 서빙
+    MEDIA_STORAGE_URL: str = "local://media"
+    MEDIA_PUBLIC_BASE_URL: str = "/media"
+    # 업로드 한 건 최대 크기(바이트), 최대 픽셀 수 (압축 폭탄 방지)
+    MEDIA_MAX_UPLOAD_BYTES: int = 15 * 1024 * 1024
+    MEDIA_MAX_PIXELS: int = 40_000_000
+    # 변환본: 긴 변 px (목록용 thumb, 상세용 medium), JPEG 품질, 변환 프로세스 수(워커 프로세스당)
+    MEDIA_THUMB_SIZE: int = 320
+    MEDIA_MEDIUM_SIZE: int = 1280
+    MEDIA_JPEG_QUALITY: int = 82
+    MEDIA_RESIZE_PROCESSES: int = 1
+
+    # 기동: create_all 을 startup에서 돌릴지 (server.py 는 fork 전에 master에서 한 번 돌리고 끈다)
+    # ready(GET /ready) 전에 미리 열어 두는 DB 커넥션 수 (풀 기본 크기 5 이하)
+    DB_CREATE_ALL_ON_STARTUP: bool = True
+    STARTUP_WARM_DB_CONNECTIONS: int = 2
+
+    # 응답에 요청당 SQL 실행 수(X-Query-Count) 헤더를 붙인다. 부하 테스트/쿼리 수 비교용
+    QUERY_COUNT_HEADER: bool = False
+
     model_config = SettingsConfigDict(
         env_file=ENV_FILE_MAP.get(ENV),
         env_file_encoding="utf-8"
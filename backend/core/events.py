@@ -0,0 +1,184 @@
+# core/events.py
+"""
+실시간 카운터 이벤트 버스 (like_count / comment_count / view_count)
+
+write path (crud_*) ─ counter_changed() ─ commit 후 ─▶ CounterEventBus.emit()   (threadpool, lock)
+      ─ LIVE_COUNTER_FLUSH_MS 마다 (kind, id) 별로 합쳐서 ─▶ broker "live:counters" 채널
+      ─ 모든 파드가 구독 ─▶ 로컬 구독자가 있는 id 만 모아 둔다
+      ─ 파드마다 refresh 루프 하나가 LIVE_COUNTER_FLUSH_MS 마다 모인 id 의 현재 값을 한 번 읽어서
+        구독 중인 SSE 연결(CounterSubscription)에 절대값으로 전달
+
+구독자에게는 증감(delta)이 아니라 읽은 값을 보낸다. 새 구독의 스냅샷도 같은 루프에서 읽으므로
+한 연결이 받는 값은 항상 읽은 순서대로다 (스냅샷에 이미 들어간 변경분을 다시 더하는 일이 없다).
+"""
+import asyncio
+import json
+import logging
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from core.broker import Broker, broker
+from core.config import settings
+from db.session import on_commit
+
+logger = logging.getLogger(__name__)
+
+COUNTER_CHANNEL = "live:counters"
+
+# 구독 대상 종류
+KIND_POST = "post"
+KIND_PRODUCT = "product"
+
+CounterKey = Tuple[str, int]
+# 현재 카운터 값 읽기: keys -> {(kind, id): {field: value}}. 없는 id 는 빠진다
+CounterLoader = Callable[[Set[CounterKey]], Dict[CounterKey, Dict[str, int]]]
+
+
+def counter_changed(db, kind: str, target_id: int, field: str, delta: int = 1):
+    """
+    write path에서 호출. 트랜잭션이 commit된 뒤에만 버스로 나간다
+    """
+    on_commit(db, lambda: counter_bus.emit(kind, target_id, field, delta))
+
+
+class CounterSubscription:
+    def __init__(self, keys: Iterable[CounterKey]):
+        self.keys: Set[CounterKey] = set(keys)
+        # 구독 시점 값. refresh 루프가 채운다 (그 전에는 변경분을 받지 않는다)
+        self.snapshot: "asyncio.Future[Dict[CounterKey, Dict[str, int]]]" = (
+            asyncio.get_running_loop().create_future()
+        )
+        self.pending: Dict[CounterKey, Dict[str, int]] = {}
+        self.ready = asyncio.Event()
+
+    def add(self, key: CounterKey, values: Dict[str, int]):
+        # 절대값이므로 나중에 읽은 값으로 덮는다
+        self.pending.setdefault(key, {}).update(values)
+        self.ready.set()
+
+    def drain(self) -> Dict[CounterKey, Dict[str, int]]:
+        pending, self.pending = self.pending, {}
+        self.ready.clear()
+        return pending
+
+
+class CounterEventBus:
+    def __init__(self, broker: Broker):
+        self.broker = broker
+        self._lock = threading.Lock()
+        self._pending: Dict[CounterKey, Dict[str, int]] = {}
+        self._subscribers: Dict[CounterKey, Set[CounterSubscription]] = {}
+        self._task: asyncio.Task | None = None
+        # 구독 쪽: 값을 다시 읽을 id, 스냅샷을 기다리는 새 구독
+        self.loader: Optional[CounterLoader] = None
+        self._changed: Set[CounterKey] = set()
+        self._new_subs: List[CounterSubscription] = []
+        self._wake = asyncio.Event()
+        self._refresh_task: asyncio.Task | None = None
+
+    # ---------- 발행 ----------
+
+    def emit(self, kind: str, target_id: int, field: str, delta: int):
+        """
+        스레드 안전. 다음 flush 때까지 (kind, id, field) 별로 합산
+        """
+        with self._lock:
+            fields = self._pending.setdefault((kind, target_id), {})
+            fields[field] = fields.get(field, 0) + delta
+
+    async def start(self):
+        await self.broker.subscribe(COUNTER_CHANNEL, self._on_broker_message)
+        self._task = asyncio.create_task(self._run())
+        self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self):
+        for task in (self._task, self._refresh_task):
+            if task:
+                task.cancel()
+        await self.broker.unsubscribe(COUNTER_CHANNEL, self._on_broker_message)
+
+    async def _run(self):
+        interval = settings.LIVE_COUNTER_FLUSH_MS / 1000
+        while True:
+            await asyncio.sleep(interval)
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            if not pending:
+                continue
+            payload = json.dumps([[kind, target_id, fields] for (kind, target_id), fields in pending.items()])
+            try:
+                await self.broker.publish(COUNTER_CHANNEL, payload)
+            except Exception:
+                logger.exception("counter publish failed")
+
+    # ---------- 구독 ----------
+
+    def _on_broker_message(self, channel: str, data: str):
+        # 증감 값은 쓰지 않는다. 어떤 id 가 바뀌었는지만 보고 다음 refresh 때 다시 읽는다
+        for kind, target_id, _ in json.loads(data):
+            if (kind, target_id) in self._subscribers:
+                self._changed.add((kind, target_id))
+                self._wake.set()
+
+    async def _refresh_loop(self):
+        interval = settings.LIVE_COUNTER_FLUSH_MS / 1000
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+            changed, self._changed = self._changed, set()
+            new_subs, self._new_subs = self._new_subs, []
+            keys = changed.union(*(sub.keys for sub in new_subs))
+            try:
+                values = await run_in_threadpool(self.loader, keys)
+            except Exception as e:
+                logger.exception("counter refresh failed")
+                # 다시 읽을 id 는 되돌려 두고, 스냅샷을 기다리던 구독은 실패로 끝낸다
+                self._changed |= changed
+                for sub in new_subs:
+                    if not sub.snapshot.done():
+                        sub.snapshot.set_exception(e)
+                await asyncio.sleep(interval)
+                continue
+
+            for sub in new_subs:
+                if not sub.snapshot.done():
+                    sub.snapshot.set_result({key: values[key] for key in sub.keys if key in values})
+            for key in changed:
+                if key not in values:
+                    continue
+                for sub in self._subscribers.get(key, ()):
+                    # 이번에 스냅샷을 받은 구독은 같은 값이 이미 들어 있다.
+                    # 읽는 동안 새로 구독한 연결은 다음 번 스냅샷(더 나중 값)을 기다린다
+                    if sub.snapshot.done() and sub not in new_subs:
+                        sub.add(key, values[key])
+            # 최소 간격: 그동안 바뀐 id 는 다음 한 번의 읽기로 합쳐진다
+            await asyncio.sleep(interval)
+
+    def subscribe(self, keys: Iterable[CounterKey]) -> CounterSubscription:
+        """
+        구독 시점 값은 sub.snapshot (다음 refresh 때 채워진다), 그 뒤 바뀐 값은 sub.drain()
+        """
+        if self.loader is None:
+            raise RuntimeError("counter loader is not configured")
+        sub = CounterSubscription(keys)
+        for key in sub.keys:
+            self._subscribers.setdefault(key, set()).add(sub)
+        self._new_subs.append(sub)
+        self._wake.set()
+        return sub
+
+    def unsubscribe(self, sub: CounterSubscription):
+        if not sub.snapshot.done():
+            sub.snapshot.cancel()
+        for key in sub.keys:
+            subs = self._subscribers.get(key)
+            if subs is None:
+                continue
+            subs.discard(sub)
+            if not subs:
+                del self._subscribers[key]
+
+
+counter_bus = CounterEventBus(broker)
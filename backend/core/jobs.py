@@ -0,0 +1,71 @@
+# core/jobs.py
+"""
+백그라운드 작업 (jobs 테이블 큐) - 작업 종류 등록부
+
+    @job("post.viewed", queue="counters", batch=True)
+    def apply_post_views(db, payloads): ...
+
+    crud_job.enqueue(db, "post.viewed", {"post_id": 1})   # 요청의 쓰기와 같은 트랜잭션 (outbox)
+
+핸들러는 CRUD 함수처럼 (db, payload) 를 받아 threadpool 에서 돌고, 핸들러의 쓰기와 작업 행 삭제가
+한 트랜잭션으로 commit 된다. batch=True 면 한 번에 꺼낸 같은 종류 작업을 (db, [payload, ...]) 로 묶어 받는다.
+실행기는 services/jobs.py, 큐별 동시 실행 수는 JOB_QUEUES.
+"""
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+DEFAULT_QUEUE = "default"
+
+
+@dataclass(frozen=True)
+class JobSpec:
+    kind: str
+    handler: Callable
+    queue: str = DEFAULT_QUEUE
+    batch: bool = False
+    max_attempts: Optional[int] = None   # None 이면 JOB_MAX_ATTEMPTS
+
+
+_registry: Dict[str, JobSpec] = {}
+
+# 핸들러가 정의된 모듈 (실행기가 시작할 때 import 해서 등록시킨다)
+HANDLER_MODULES = (
+    "db.crud_community",
+    "db.crud_notification",
+)
+
+
+def job(kind: str, *, queue: str = DEFAULT_QUEUE, batch: bool = False, max_attempts: Optional[int] = None):
+    def register(fn):
+        _registry[kind] = JobSpec(kind, fn, queue, batch, max_attempts)
+        return fn
+    return register
+
+
+def get_spec(kind: str) -> Optional[JobSpec]:
+    return _registry.get(kind)
+
+
+# ---------- 새 작업 알림 (commit 뒤, 같은 프로세스의 실행기를 바로 깨운다) ----------
+
+_wake_lock = threading.Lock()
+_wakers: List[Callable[[str], None]] = []
+
+
+def add_waker(fn: Callable[[str], None]):
+    with _wake_lock:
+        _wakers.append(fn)
+
+
+def remove_waker(fn: Callable[[str], None]):
+    with _wake_lock:
+        if fn in _wakers:
+            _wakers.remove(fn)
+
+
+def notify(queue: str):
+    with _wake_lock:
+        wakers = list(_wakers)
+    for fn in wakers:
+        fn(queue)
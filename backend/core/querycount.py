@@ -0,0 +1,53 @@
+# core/querycount.py
+"""
+요청당 SQL 실행 수 (QUERY_COUNT_HEADER=true 일 때만 켠다)
+
+    X-Query-Count: 3
+
+엔진의 before_cursor_execute 에서 현재 요청의 카운터를 올린다. 카운터는 contextvar에 담긴
+리스트라서 threadpool(sync 엔드포인트)로 복사된 context에서도 같은 객체를 가리킨다.
+yield dependency(get_db)의 commit은 응답 시작 전에 끝나므로 헤더에 포함된다.
+부하 테스트(bench/)와 쿼리 수 비교용이고 운영에서는 끈다.
+"""
+from contextvars import ContextVar
+from typing import List, Optional
+
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+
+HEADER = "X-Query-Count"
+
+_current: ContextVar[Optional[List[int]]] = ContextVar("query_count", default=None)
+
+
+def _count(conn, cursor, statement, parameters, context, executemany):
+    counter = _current.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+def track_queries(engine):
+    event.listen(engine, "before_cursor_execute", _count)
+
+
+class QueryCountMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        counter = [0]
+        token = _current.set(counter)
+
+        async def send_with_count(message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append(HEADER, str(counter[0]))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_count)
+        finally:
+            _current.reset(token)
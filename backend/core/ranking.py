@@ -0,0 +1,45 @@
+# core/ranking.py
+"""
+커뮤니티 인기글(hot) 점수
+
+    hot = log2(1 + 좋아요*W + 댓글*W + 조회*W) + (작성시각 - HOT_EPOCH) / 반감기
+
+반응 점수가 같으면 반감기(HOT_HALF_LIFE_HOURS)만큼 늦게 올라온 글이 1점 높다.
+= 반감기가 지날 때마다 반응이 2배여야 같은 순위. 점수가 현재 시각에 의존하지 않으므로
+시간이 흘러도 저장된 값의 순서가 그대로 유지되고, 카운터가 바뀔 때만 다시 계산하면 된다.
+"""
+import math
+from datetime import datetime
+
+from sqlalchemy import func, literal_column
+
+from core.config import settings
+
+HOT_EPOCH = datetime(2024, 1, 1)
+
+
+def hot_score(like_count: int, comment_count: int, view_count: int, created_at: datetime) -> float:
+    engagement = (
+        1
+        + (like_count or 0) * settings.HOT_LIKE_WEIGHT
+        + (comment_count or 0) * settings.HOT_COMMENT_WEIGHT
+        + (view_count or 0) * settings.HOT_VIEW_WEIGHT
+    )
+    age_term = (created_at - HOT_EPOCH).total_seconds() / (settings.HOT_HALF_LIFE_HOURS * 3600)
+    return round(math.log2(max(engagement, 1)) + age_term, 6)
+
+
+def hot_score_sql(like_count, comment_count, view_count, created_at):
+    """
+    hot_score()와 같은 식의 SQL 표현식 (MySQL). 행을 읽지 않고 UPDATE 한 문장에서 갱신할 때 사용
+    """
+    engagement = (
+        1
+        + func.coalesce(like_count, 0) * settings.HOT_LIKE_WEIGHT
+        + func.coalesce(comment_count, 0) * settings.HOT_COMMENT_WEIGHT
+        + func.coalesce(view_count, 0) * settings.HOT_VIEW_WEIGHT
+    )
+    age_term = func.timestampdiff(literal_column("SECOND"), HOT_EPOCH, created_at) / (
+        settings.HOT_HALF_LIFE_HOURS * 3600
+    )
+    return func.round(func.log2(func.greatest(engagement, 1)) + age_term, 6)
@@ -0,0 +1,212 @@
+# core/ratelimit.py
+"""
+요청 제한 (FastAPI dependency)
+
+- RateLimiter       : 토큰 버킷. 키 = 제한 이름 + (로그인 사용자 id 또는 클라이언트 IP)
+                      버킷 저장소는 CACHE_URL 을 따른다
+                        local://  프로세스별 메모리 (로컬/테스트용 stand-in)
+                        redis://  Lua 스크립트로 원자적으로 계산, 모든 파드가 공유
+- ConcurrencyLimiter: 프로세스 안 동시 실행 수 제한 (load shedding). Argon2 해시처럼 CPU/메모리를
+                      많이 쓰는 작업이 threadpool을 다 차지해서 피드 요청이 밀리지 않게 한다.
+                      자리가 없으면 기다리지 않고 바로 503
+
+거절하면 429/503 + Retry-After. 제한별로 /metrics 에 허용/거절 수가 나간다.
+"""
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, Request, status
+from jose import JWTError, jwt
+
+from core.config import settings
+from core.metrics import counter, gauge
+
+rate_limit_allowed = counter("rate_limit_allowed_total", "Requests allowed by rate limiter")
+rate_limit_rejected = counter("rate_limit_rejected_total", "Requests rejected by rate limiter (429)")
+load_shed_rejected = counter("load_shed_rejected_total", "Requests shed by concurrency limiter (503)")
+load_shed_in_flight = gauge("load_shed_in_flight", "Requests currently holding a concurrency slot")
+
+
+# =========================
+# 버킷 저장소
+# =========================
+
+class BucketStore(ABC):
+    @abstractmethod
+    def take(self, key: str, capacity: int, rate: float, cost: int = 1) -> Tuple[bool, float]:
+        """
+        토큰 cost개를 꺼낸다. (허용 여부, 허용 안 됐으면 다시 시도할 때까지 초)
+        rate: 초당 채워지는 토큰 수
+        """
+        raise NotImplementedError
+
+
+class LocalBucketStore(BucketStore):
+    def __init__(self, max_keys: int = 100_000):
+        self._lock = threading.Lock()
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._max_keys = max_keys
+
+    def take(self, key, capacity, rate, cost=1):
+        now = time.monotonic()
+        with self._lock:
+            tokens, ts = self._buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - ts) * rate)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self._buckets[key] = (tokens, now)
+            # 오래 안 쓴 키부터 정리 (가득 찬 버킷과 같으므로 지워도 결과가 같다)
+            while len(self._buckets) > self._max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, 0.0 if allowed else (cost - tokens) / rate
+
+
+class RedisBucketStore(BucketStore):
+    # 시간은 Redis 서버 기준 (파드 간 시계 차이 무시)
+    _TAKE = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local b = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(b[1]) or capacity
+local ts = tonumber(b[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local wait = 0
+if tokens >= cost then
+  tokens = tokens - cost
+  allowed = 1
+else
+  wait = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return {allowed, tostring(wait)}
+"""
+
+    def __init__(self, url: str, client=None):
+        if client is None:
+            import redis  # 선택 의존성
+
+            client = redis.Redis.from_url(url, decode_responses=True)
+        self._redis = client
+        self._script = client.register_script(self._TAKE)
+
+    def take(self, key, capacity, rate, cost=1):
+        allowed, wait = self._script(keys=[f"rl:{key}"], args=[capacity, rate, cost])
+        return bool(int(allowed)), float(wait)
+
+
+def create_bucket_store(url: str) -> BucketStore:
+    if url.startswith("local://"):
+        return LocalBucketStore()
+    if url.startswith(("redis://", "rediss://")):
+        return RedisBucketStore(url)
+    raise ValueError(f"Unsupported rate limit store url: {url}")
+
+
+bucket_store = create_bucket_store(settings.CACHE_URL)
+
+
+# =========================
+# 클라이언트 식별
+# =========================
+
+def client_ip(request: Request) -> str:
+    # X-Forwarded-For 를 직접 읽지 않는다 (왼쪽 값은 클라이언트가 마음대로 넣을 수 있다).
+    # uvicorn 이 WEB_FORWARDED_ALLOW_IPS 프록시가 붙인 값만 따라가 request.client 를 정해 둔다
+    return request.client.host if request.client else "unknown"
+
+
+def client_identity(request: Request) -> str:
+    """
+    유효한 access token이 있으면 사용자 id, 없으면 IP (DB 조회 없이 서명만 확인)
+    """
+    auth = request.headers.get("authorization", "")
+    if auth.lower().startswith("bearer "):
+        try:
+            payload = jwt.decode(auth[7:], settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
+            if payload.get("type") == "access" and payload.get("sub") is not None:
+                return f"u:{payload['sub']}"
+        except JWTError:
+            pass
+    return f"ip:{client_ip(request)}"
+
+
+# =========================
+# 제한
+# =========================
+
+class RateLimiter:
+    """
+    Depends(limiter) 로 사용. per_minute 개를 한 번에(burst) 쓸 수 있고 분당 per_minute 개씩 다시 찬다
+    by_ip=True 면 로그인 여부와 관계없이 IP 기준 (로그인/가입처럼 토큰이 없는 요청)
+    """
+
+    def __init__(self, name: str, per_minute: int, by_ip: bool = False, store: Optional[BucketStore] = None):
+        self.name = name
+        self.per_minute = per_minute
+        self.by_ip = by_ip
+        self.store = store
+
+    def __call__(self, request: Request):
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+        identity = f"ip:{client_ip(request)}" if self.by_ip else client_identity(request)
+        store = self.store or bucket_store
+        allowed, retry_after = store.take(f"{self.name}:{identity}", self.per_minute, self.per_minute / 60)
+        if allowed:
+            rate_limit_allowed.inc(limiter=self.name)
+            return
+        rate_limit_rejected.inc(limiter=self.name)
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many requests",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+
+
+class ConcurrencyLimiter:
+    """
+    Depends(limiter) 로 사용 (yield dependency: 응답이 끝날 때 자리 반납)
+    """
+
+    def __init__(self, name: str, limit: int, retry_after: int = 1):
+        self.name = name
+        self.retry_after = retry_after
+        self._slots = threading.BoundedSemaphore(limit)
+
+    def __call__(self):
+        if not self._slots.acquire(blocking=False):
+            load_shed_rejected.inc(limiter=self.name)
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server busy",
+                headers={"Retry-After": str(self.retry_after)},
+            )
+        load_shed_in_flight.inc(limiter=self.name)
+        try:
+            yield
+        finally:
+            load_shed_in_flight.dec(limiter=self.name)
+            self._slots.release()
+
+
+# 로그인/가입/OAuth 콜백: 토큰이 없으므로 IP 기준
+login_limit = RateLimiter("login", settings.RATE_LIMIT_LOGIN_PER_MINUTE, by_ip=True)
+register_limit = RateLimiter("register", settings.RATE_LIMIT_REGISTER_PER_MINUTE, by_ip=True)
+oauth_callback_limit = RateLimiter("oauth_callback", settings.RATE_LIMIT_OAUTH_PER_MINUTE, by_ip=True)
+# 상품 목록/검색: 사용자(없으면 IP) 기준
+search_limit = RateLimiter("product_search", settings.RATE_LIMIT_SEARCH_PER_MINUTE)
+# 이미지 업로드: 사용자 기준 (변환에 CPU를 쓴다)
+upload_limit = RateLimiter("media_upload", settings.RATE_LIMIT_UPLOAD_PER_MINUTE)
+
+# 비밀번호 해시/검증 동시 실행 수 (Argon2 memory_cost 100MB)
+password_hash_slots = ConcurrencyLimiter("password_hash", settings.PASSWORD_HASH_MAX_CONCURRENCY)
@@ -1,36 +1,56 @@
+import math
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Optional
 
 from fastapi import Depends, HTTPException, status, Response
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from passlib.context import CryptContext
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from core.cache import cache
 from core.config import settings
-from db.session import get_db
+from db.session import get_db, on_commit
 from db import models
 from db.models import User, UserRole
 
-pwd_context = CryptContext(
-    schemes=["argon2"],
-    deprecated="auto",
-    argon2__memory_cost=102400,
-    argon2__parallelism=8,
-    argon2__time_cost=3,
-)
+@lru_cache(maxsize=None)
+def password_context():
+    """
+    passlib + argon2 backend는 import/로딩이 무거워서 처음 쓸 때 만든다.
+    기동 시에는 main의 warm-up 이 ready 전에 미리 불러 둔다
+    """
+    from passlib.context import CryptContext
+
+    return CryptContext(
+        schemes=["argon2"],
+        deprecated="auto",
+        argon2__memory_cost=102400,
+        argon2__parallelism=8,
+        argon2__time_cost=3,
+    )
+
+
+def warm_password_context():
+    # CryptContext 는 backend(argon2-cffi)를 첫 hash/verify 때 불러온다 → 여기서 미리
+    password_context().handler("argon2").get_backend()
 
 
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return password_context().hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_context().verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
     return hash_password(password)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/users/login")
+# 로그인하지 않아도 되는 조회 API용 (토큰이 없으면 None)
+oauth2_scheme_optional = OAuth2PasswordBearer(tokenUrl="/api/users/login", auto_error=False)
 
 def _create_token(data: dict, expires_minutes: int) -> str:
     to_encode = data.copy()
@@ -44,8 +64,34 @@ def _create_token(data: dict, expires_minutes: int) -> str:
     return encoded_jwt
 
 
-def create_access_token(user_id: int, expires_minutes: int = 60) -> str:
-    return _create_token({"sub": str(user_id), "type": "access"}, expires_minutes)
+def create_access_token(
+    user_id: int,
+    expires_minutes: int = 60,
+    *,
+    role: Optional[UserRole] = None,
+    auth_epoch: int = 0,
+    home_region_id: Optional[int] = None,
+) -> str:
+    """
+    access token 클레임: sub, role, ep(auth_epoch), rg(home_region_id)
+    get_current_principal 은 이 클레임만 믿고 users 행을 읽지 않는다
+    """
+    payload = {
+        "sub": str(user_id),
+        "type": "access",
+        "role": (role or UserRole.user).value,
+        "ep": auth_epoch,
+    }
+    if home_region_id is not None:
+        payload["rg"] = home_region_id
+    return _create_token(payload, expires_minutes)
+
+
+def access_claims(user: User) -> dict:
+    """
+    create_access_token(user.id, **access_claims(user))
+    """
+    return {"role": user.role, "auth_epoch": user.auth_epoch or 0, "home_region_id": user.home_region_id}
 
 
 def create_refresh_token(user_id: int, expires_minutes: int = 60 * 24 * 7) -> str:
@@ -84,6 +130,25 @@ def get_current_user(
     db: Session = Depends(get_db),
     token: str = Depends(oauth2_scheme),
 ) -> User:
+    return get_user_from_token(db, token)
+
+
+def get_current_user_optional(
+    db: Session = Depends(get_db),
+    token: Optional[str] = Depends(oauth2_scheme_optional),
+) -> Optional[User]:
+    """
+    토큰이 없으면 None (비로그인 조회). 토큰이 있는데 잘못됐으면 401/403은 그대로
+    """
+    if not token:
+        return None
+    return get_user_from_token(db, token)
+
+
+def get_user_from_token(db: Session, token: str) -> User:
+    """
+    access token 검증 + 활성 사용자 확인 (WebSocket 등 Depends 밖에서도 사용)
+    """
     payload = decode_token(token)
 
     if payload.get("type") != "access":
@@ -103,10 +168,132 @@ def get_current_user(
         raise HTTPException(status_code=403, detail="Inactive user")
     if user.suspended_until and user.suspended_until > datetime.utcnow():
         raise HTTPException(status_code=403, detail="User suspended")
+    if payload.get("ep", 0) != (user.auth_epoch or 0):
+        raise HTTPException(status_code=401, detail="Token revoked")
 
     return user
 
 
+# =====================================
+# 클레임만으로 인증 (users 행을 읽지 않는다)
+# =====================================
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    access token 클레임으로 만든 인증 주체. id 와 권한만 필요한 API 용
+    role / home_region_id 는 토큰을 발급한 시점 값 (닉네임 등 나머지가 필요하면 get_current_user)
+    """
+    id: int
+    role: UserRole
+    home_region_id: Optional[int] = None
+
+    @property
+    def is_admin(self) -> bool:
+        return self.role == UserRole.admin
+
+
+# 비활성/탈퇴, 정지 사용자의 auth epoch 캐시 값 (토큰의 ep 와 절대 같지 않다)
+EPOCH_INACTIVE = -1
+EPOCH_SUSPENDED = -2
+
+
+def auth_epoch_key(user_id: int) -> str:
+    return f"auth:epoch:{user_id}"
+
+
+def auth_epoch_state(user: User, now: Optional[datetime] = None) -> tuple:
+    """
+    (캐시에 둘 epoch, TTL). 정지 중이면 EPOCH_SUSPENDED 를 정지가 끝날 때까지만
+    """
+    now = now or datetime.utcnow()
+    ttl = settings.AUTH_EPOCH_CACHE_SECONDS
+    if not user.is_active or user.deleted_at:
+        return EPOCH_INACTIVE, ttl
+    if user.suspended_until and user.suspended_until > now:
+        remaining = math.ceil((user.suspended_until - now).total_seconds())
+        return EPOCH_SUSPENDED, max(min(ttl, remaining), 1)
+    return user.auth_epoch or 0, ttl
+
+
+def publish_auth_epoch(db: Session, user: User):
+    """
+    정지/해제 등으로 상태를 바꾼 트랜잭션이 commit 되면 캐시 값을 바로 덮어쓴다 (TTL 을 기다리지 않음)
+    """
+    user_id = user.id
+    epoch, ttl = auth_epoch_state(user)
+    on_commit(db, lambda: cache.set(auth_epoch_key(user_id), str(epoch), ttl))
+
+
+def current_auth_epoch(db: Session, user_id: int) -> int:
+    """
+    공유 캐시 키 하나. 없을 때만 users 에서 상태 컬럼만 PK 로 읽어 채운다
+    채울 때는 키가 없을 때만 쓴다: 읽는 사이에 정지가 commit 되어 publish_auth_epoch 가 먼저 쓴 값을
+    예전 epoch 로 덮으면 TTL 동안 정지가 풀린 것처럼 보인다. 밀렸으면 이미 들어간 값을 따른다
+    """
+    key = auth_epoch_key(user_id)
+    raw = cache.get(key)
+    if raw is not None:
+        return int(raw)
+    row = db.execute(
+        select(User.auth_epoch, User.is_active, User.deleted_at, User.suspended_until)
+        .where(User.id == user_id)
+    ).first()
+    if row is None:
+        return EPOCH_INACTIVE
+    epoch, ttl = auth_epoch_state(row)
+    if not cache.add(key, str(epoch), ttl):
+        raw = cache.get(key)
+        if raw is not None:
+            return int(raw)
+    return epoch
+
+
+def get_principal_from_token(db: Session, token: str) -> Principal:
+    payload = decode_token(token)
+
+    if payload.get("type") != "access":
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token type",
+        )
+
+    user_id = payload.get("sub")
+    if user_id is None:
+        raise HTTPException(status_code=401, detail="Invalid token payload")
+    user_id = int(user_id)
+
+    epoch = current_auth_epoch(db, user_id)
+    if epoch == EPOCH_INACTIVE:
+        raise HTTPException(status_code=403, detail="Inactive user")
+    if epoch == EPOCH_SUSPENDED:
+        raise HTTPException(status_code=403, detail="User suspended")
+    if payload.get("ep", 0) != epoch:
+        raise HTTPException(status_code=401, detail="Token revoked")
+
+    try:
+        role = UserRole(payload.get("role", UserRole.user.value))
+    except ValueError:
+        raise HTTPException(status_code=401, detail="Invalid token payload")
+    return Principal(id=user_id, role=role, home_region_id=payload.get("rg"))
+
+
+def get_current_principal(
+    db: Session = Depends(get_db),
+    token: str = Depends(oauth2_scheme),
+) -> Principal:
+    return get_principal_from_token(db, token)
+
+
+def get_current_principal_optional(
+    db: Session = Depends(get_db),
+    token: Optional[str] = Depends(oauth2_scheme_optional),
+) -> Optional[Principal]:
+    if not token:
+        return None
+    return get_principal_from_token(db, token)
+
+
 def get_current_admin(
     current_user: User = Depends(get_current_user),
 ) -> User:
@@ -0,0 +1,136 @@
+# core/startup.py
+"""
+기동 시간 측정 + readiness
+
+main.py 가 가장 먼저 import 한다. 이 시점을 0으로 두고
+- import      : 앱 모듈(main) import 완료까지
+- startup.*   : startup 핸들러별 시간
+- warm_up.*   : 첫 요청 전에 미리 해 두는 초기화 (비밀번호 해시 backend, DB 커넥션 풀)
+- ready       : warm-up 이 끝나 GET /ready 가 200 이 된 시각
+- first_request: 처음으로 (프로브가 아닌) 요청의 응답을 다 보낸 시각
+을 기록한다. GET /internal/startup 이 이 보고서(JSON)를 돌려준다.
+
+모듈별 import 시간은 `python cli.py startup-report` (python -X importtime 결과를 집계)
+"""
+import os
+import time
+from contextlib import contextmanager
+from typing import List, Optional
+
+_t0 = time.perf_counter()
+_phases: List[dict] = []
+_ready = False
+_ready_at: Optional[float] = None
+_first_request_at: Optional[float] = None
+
+# 프로브/모니터링 요청은 "첫 요청"으로 치지 않는다
+_IGNORED_PATHS = ("/health", "/ready", "/metrics", "/internal/startup")
+
+
+def _now() -> float:
+    return round(time.perf_counter() - _t0, 4)
+
+
+@contextmanager
+def phase(name: str):
+    start = _now()
+    try:
+        yield
+    finally:
+        _phases.append({"name": name, "start_s": start, "duration_s": round(_now() - start, 4)})
+
+
+def mark(name: str):
+    _phases.append({"name": name, "start_s": _now(), "duration_s": 0.0})
+
+
+def set_ready(ready: bool):
+    global _ready, _ready_at
+    _ready = ready
+    if ready and _ready_at is None:
+        _ready_at = _now()
+
+
+def is_ready() -> bool:
+    return _ready
+
+
+def report() -> dict:
+    return {
+        "pid": os.getpid(),
+        "uptime_s": _now(),
+        "ready": _ready,
+        "ready_at_s": _ready_at,
+        "first_request_at_s": _first_request_at,
+        "phases": list(_phases),
+    }
+
+
+class FirstRequestMiddleware:
+    """
+    첫 HTTP 응답이 끝난 시각만 기록 (이후에는 플래그 확인 한 번)
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if _first_request_at is not None or scope["type"] != "http" or scope["path"] in _IGNORED_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_and_mark(message):
+            global _first_request_at
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body") and _first_request_at is None:
+                _first_request_at = _now()
+
+        await self.app(scope, receive, send_and_mark)
+
+
+# ==============================
+# IMPORT 시간 (python -X importtime)
+# ==============================
+def import_time_report(module: str = "main", top: int = 20) -> dict:
+    """
+    새 인터프리터에서 module 을 import 하며 -X importtime 결과를 모아서
+    - total_s    : 전체 import 시간
+    - packages   : 최상위 패키지별 self 시간 합 (fastapi, sqlalchemy, routers, ...)
+    - cumulative : 모듈별 cumulative 시간 상위 N개 (자기 + 하위 import)
+    를 돌려준다
+    """
+    import subprocess
+    import sys
+
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "import failed")
+
+    modules, packages = [], {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        name = name.strip()
+        self_s = int(self_us) / 1e6
+        modules.append((name, self_s, int(cumulative_us) / 1e6))
+        package = name.split(".", 1)[0]
+        packages[package] = packages.get(package, 0.0) + self_s
+
+    total = next((cum for name, _, cum in reversed(modules) if name == module), sum(packages.values()))
+    return {
+        "module": module,
+        "total_s": round(total, 4),
+        "packages": [
+            {"name": name, "self_s": round(sec, 4)}
+            for name, sec in sorted(packages.items(), key=lambda kv: kv[1], reverse=True)[:top]
+        ],
+        "cumulative": [
+            {"name": name, "cumulative_s": round(cum, 4), "self_s": round(self_s, 4)}
+            for name, self_s, cum in sorted(modules, key=lambda m: m[2], reverse=True)[:top]
+        ],
+    }
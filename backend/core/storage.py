@@ -0,0 +1,111 @@
+# core/storage.py
+"""
+업로드 파일 저장소
+
+- local://<디렉터리>     : 로컬 파일시스템 (로컬/테스트용). 상대 경로는 backend/ 기준, main이 /media 로 서빙
+- s3://<bucket>/<prefix> : S3 호환 오브젝트 스토리지 (boto3는 선택 의존성, 사용할 때만 import). 모든 파드가 공유
+
+키는 내용 해시 기반(media_key)이라 한 번 쓴 키의 내용은 바뀌지 않는다 → 공개 URL은 오래 캐시해도 된다.
+파일 단위 API(put_file/download)만 두는 이유: 업로드 본문과 변환 결과를 메모리에 통째로 올리지 않으려고.
+CRUD처럼 threadpool 에서 호출하는 동기 API.
+"""
+import os
+import shutil
+import tempfile
+from typing import Optional
+
+from core.config import BASE_DIR, settings
+
+# 내용 해시 키: 같은 키 = 같은 내용
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+class Storage:
+    def put_file(self, key: str, path: str, content_type: str):
+        raise NotImplementedError
+
+    def download(self, key: str, path: str):
+        raise NotImplementedError
+
+    def url(self, key: str) -> str:
+        return f"{settings.MEDIA_PUBLIC_BASE_URL.rstrip('/')}/{key}"
+
+
+class LocalStorage(Storage):
+    def __init__(self, root: str):
+        self.root = root if os.path.isabs(root) else os.path.join(BASE_DIR, root)
+
+    def _path(self, key: str) -> str:
+        path = os.path.normpath(os.path.join(self.root, key))
+        if not path.startswith(os.path.normpath(self.root) + os.sep):
+            raise ValueError(f"Invalid storage key: {key}")
+        return path
+
+    def put_file(self, key, path, content_type):
+        dest = self._path(key)
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        # 같은 디렉터리에 복사한 뒤 rename: 읽는 쪽이 쓰다 만 파일을 보지 않게
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(dest), prefix=".upload-")
+        os.close(fd)
+        try:
+            shutil.copyfile(path, tmp)
+            os.replace(tmp, dest)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def download(self, key, path):
+        shutil.copyfile(self._path(key), path)
+
+
+class S3Storage(Storage):
+    def __init__(self, url: str, client=None):
+        bucket, _, prefix = url[len("s3://"):].partition("/")
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        if client is None:
+            import boto3  # 선택 의존성
+
+            client = boto3.client("s3")
+        self._s3 = client
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def put_file(self, key, path, content_type):
+        # upload_file: 큰 파일은 multipart upload 로 나눠서 올린다
+        self._s3.upload_file(
+            path,
+            self.bucket,
+            self._key(key),
+            ExtraArgs={"ContentType": content_type, "CacheControl": IMMUTABLE_CACHE_CONTROL},
+        )
+
+    def download(self, key, path):
+        self._s3.download_file(self.bucket, self._key(key), path)
+
+
+def media_key(sha256: str, name: str) -> str:
+    """
+    업로드 이미지 키: <해시 앞 2자리>/<해시>/<이름>  (이름: original | thumb.jpg | medium.jpg)
+    """
+    return f"{sha256[:2]}/{sha256}/{name}"
+
+
+def create_storage(url: str) -> Storage:
+    if url.startswith("local://"):
+        return LocalStorage(url[len("local://"):])
+    if url.startswith("s3://"):
+        return S3Storage(url)
+    raise ValueError(f"Unsupported storage url: {url}")
+
+
+def local_root(storage_: Storage) -> Optional[str]:
+    """
+    로컬 저장소면 디렉터리 (main이 정적 파일로 서빙), 아니면 None
+    """
+    return storage_.root if isinstance(storage_, LocalStorage) else None
+
+
+# 프로세스당 하나
+storage = create_storage(settings.MEDIA_STORAGE_URL)
@@ -0,0 +1,163 @@
+# core/timeline.py
+"""
+동네별 최신글 타임라인 캐시 + 게시글 행 캐시 (core/cache.py 위에서 동작)
+
+    tl:region:{id}        정렬 집합. member = 게시글 id(0 채움), score = created_at
+                          최신 TIMELINE_MAX_ENTRIES 개만 유지 (ring buffer)
+    tl:region:{id}:meta   "complete" | "partial"  로드 여부 표시 (TTL). 없으면 DB에서 다시 채운다
+                          complete = 동네 글 전체가 타임라인 안에 들어 있음
+    tl:region:{id}:count  동네 전체 글 수 (목록 total)
+    post:row:{id}         목록 한 줄에 필요한 컬럼 JSON (TTL, 카운터는 TTL만큼 늦을 수 있음)
+
+쓰기는 commit 뒤(on_commit)에 write-through 하고, 타임라인이 없으면 첫 조회 때 DB에서 한 번 채운다.
+"""
+import json
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core.cache import Cache, cache
+from core.config import settings
+
+META_COMPLETE = "complete"
+META_PARTIAL = "partial"
+
+# 커서 뒤 같은 created_at 글이 몰려 있을 때를 대비해 더 읽어 오는 개수
+_CURSOR_SLACK = 16
+
+
+def _score(created_at: datetime) -> float:
+    return created_at.replace(tzinfo=timezone.utc).timestamp()
+
+
+def _member(post_id: int) -> str:
+    # 점수가 같으면 member 사전순 -> id 순서와 같게 0으로 채운다
+    return f"{post_id:020d}"
+
+
+@dataclass
+class PostRow:
+    id: int
+    title: str
+    region_id: int
+    user_id: int
+    like_count: int
+    comment_count: int
+    view_count: int
+    created_at: datetime
+    thumbnail_url: Optional[str] = None
+
+    def to_json(self) -> str:
+        data = asdict(self)
+        data["created_at"] = self.created_at.isoformat()
+        return json.dumps(data, ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, raw: str) -> "PostRow":
+        data = json.loads(raw)
+        data["created_at"] = datetime.fromisoformat(data["created_at"])
+        return cls(**data)
+
+
+class RegionTimeline:
+    def __init__(self, cache: Cache):
+        self.cache = cache
+
+    @staticmethod
+    def _key(region_id: int) -> str:
+        return f"tl:region:{region_id}"
+
+    def load(self, region_id: int, entries: Iterable[Tuple[int, datetime]], total: int, complete: bool):
+        """
+        DB에서 읽은 최신 글 (id, created_at) 로 채운다. 그 사이 push된 글과 합쳐진다
+        """
+        key = self._key(region_id)
+        mapping = {_member(post_id): _score(created_at) for post_id, created_at in entries}
+        trimmed = self.cache.zadd(key, mapping, settings.TIMELINE_MAX_ENTRIES) if mapping else 0
+        ttl = settings.TIMELINE_TTL_SECONDS
+        self.cache.set_many(
+            {
+                f"{key}:meta": META_COMPLETE if complete and not trimmed else META_PARTIAL,
+                f"{key}:count": str(total),
+            },
+            ttl,
+        )
+
+    def push(self, region_id: int, post_id: int, created_at: datetime):
+        key = self._key(region_id)
+        trimmed = self.cache.zadd(key, {_member(post_id): _score(created_at)}, settings.TIMELINE_MAX_ENTRIES)
+        if trimmed and self.cache.get(f"{key}:meta") == META_COMPLETE:
+            # 오래된 글이 밀려났으므로 더는 동네 전체가 아님
+            self.cache.set(f"{key}:meta", META_PARTIAL, settings.TIMELINE_TTL_SECONDS)
+        self.cache.incr(f"{key}:count", 1)
+
+    def remove(self, region_id: int, post_id: int):
+        key = self._key(region_id)
+        self.cache.zrem(key, _member(post_id))
+        self.cache.incr(f"{key}:count", -1)
+
+    def count(self, region_id: int) -> Optional[int]:
+        raw = self.cache.get(f"{self._key(region_id)}:count")
+        return int(raw) if raw is not None else None
+
+    def page(
+        self,
+        region_id: int,
+        *,
+        offset: int,
+        limit: int,
+        after: Optional[Tuple[datetime, int]] = None,
+    ) -> Optional[List[int]]:
+        """
+        (created_at DESC, id DESC) 순 게시글 id. 타임라인으로 답할 수 없으면 None
+        (로드 전이거나, 요청 범위가 ring buffer 밖)
+        """
+        key = self._key(region_id)
+        meta = self.cache.get(f"{key}:meta")
+        if meta is None:
+            return None
+
+        if after is None:
+            entries = self.cache.zrevrange(key, offset, offset + limit - 1)
+            ids = [int(m) for m, _ in entries]
+        else:
+            after_at, after_id = after
+            after_score = _score(after_at)
+            fetch = limit + _CURSOR_SLACK
+            entries = self.cache.zrevrangebyscore(key, after_score, fetch)
+            ids = [
+                int(m) for m, score in entries
+                if score < after_score or int(m) < after_id
+            ][:limit]
+            if len(ids) < limit and len(entries) == fetch:
+                return None
+
+        if len(ids) < limit and meta != META_COMPLETE:
+            return None
+        return ids
+
+
+class PostRowCache:
+    def __init__(self, cache: Cache):
+        self.cache = cache
+
+    @staticmethod
+    def _key(post_id: int) -> str:
+        return f"post:row:{post_id}"
+
+    def get_many(self, post_ids: List[int]) -> Dict[int, PostRow]:
+        raws = self.cache.get_many([self._key(i) for i in post_ids])
+        return {i: PostRow.from_json(raw) for i, raw in zip(post_ids, raws) if raw is not None}
+
+    def put_many(self, rows: Iterable[PostRow]):
+        self.cache.set_many(
+            {self._key(row.id): row.to_json() for row in rows},
+            settings.POST_ROW_CACHE_TTL_SECONDS,
+        )
+
+    def delete(self, *post_ids: int):
+        self.cache.delete(*(self._key(i) for i in post_ids))
+
+
+timeline = RegionTimeline(cache)
+post_rows = PostRowCache(cache)
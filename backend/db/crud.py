@@ -1,21 +1,61 @@
 # db/crud.py
 from datetime import datetime
+from typing import Dict, Iterator, List
+
+from sqlalchemy import Integer, case, cast, func, or_, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from core.security import hash_password, verify_password
+from core.security import hash_password, publish_auth_epoch, verify_password
 from db.models import User, UserProvider, Product
+from schemas.dto import UserSummary
 
 
 # =======================================
 # USERS
 # =======================================
 
-def _generate_unique_nickname(db: Session, base_nickname: str) -> str:
-    candidate = base_nickname
-    suffix = 1
-    while db.query(User).filter(User.nickname == candidate).first():
-        suffix += 1
-        candidate = f"{base_nickname}{suffix}"
-    return candidate
+# 닉네임 충돌 시 재시도 횟수 (동시 가입 경쟁에서만 소모됨)
+NICKNAME_MAX_ATTEMPTS = 5
+
+
+def _nickname_candidates(db: Session, base_nickname: str) -> Iterator[str]:
+    """
+    base_nickname, base_nickname2, base_nickname3 ... 중 빈 닉네임 후보를 차례로
+    uq_users_nickname 인덱스의 prefix 범위 스캔 한 번으로 base 사용 여부와 가장 큰 접미사를 구하고,
+    그 뒤로는 다시 읽지 않고 접미사를 올린다 (REPEATABLE READ 에서는 다시 읽어도 같은 snapshot 이라
+    동시에 commit 된 닉네임이 보이지 않는다)
+    """
+    suffix = func.substring(User.nickname, len(base_nickname) + 1)
+    # 상수 패턴이어야 인덱스 range 스캔이 된다 (LIKE 와일드카드는 이스케이프)
+    prefix = (
+        base_nickname.replace("/", "//").replace("%", "/%").replace("_", "/_")
+    )
+    is_base = User.nickname == base_nickname
+    base_taken, max_suffix = (
+        db.query(
+            func.max(case((is_base, 1), else_=0)),
+            func.max(case((is_base, None), else_=cast(suffix, Integer))),
+        )
+        .filter(
+            User.nickname.like(f"{prefix}%", escape="/"),
+            or_(
+                is_base,
+                suffix.regexp_match("^[0-9]+$"),
+            ),
+        )
+        .one()
+    )
+    if not base_taken:
+        yield base_nickname
+    # 접미사는 2부터 (base 가 비어 있어도 base5 가 있으면 다음은 base6)
+    n = max(max_suffix or 1, 1) + 1
+    while True:
+        yield f"{base_nickname}{n}"
+        n += 1
+
+
+def _is_nickname_conflict(e: IntegrityError) -> bool:
+    return "uq_users_nickname" in str(e.orig)
 
 
 def create_user(
@@ -31,12 +71,10 @@ def create_user(
     회원가입: User 생성 (로컬/소셜 공용)
     """
     hashed = hash_password(password) if password else None
-    nickname = _generate_unique_nickname(db, nickname)
 
     user = User(
         email=email,
         password_hash=hashed,
-        nickname=nickname,
         profile_complete=1 if profile_complete else 0,
         is_active=1,
     )
@@ -50,9 +88,21 @@ def create_user(
             )
         )
 
-    db.add(user)
-    db.commit()
-    db.refresh(user)
+    # 조회와 INSERT 사이에 같은 닉네임이 먼저 들어오면 savepoint만 되돌리고 다음 후보로 (다시 조회하지 않음)
+    candidates = _nickname_candidates(db, nickname)
+    for _ in range(NICKNAME_MAX_ATTEMPTS):
+        user.nickname = next(candidates)
+        try:
+            with db.begin_nested():
+                db.add(user)
+        except IntegrityError as e:
+            if not _is_nickname_conflict(e):
+                raise
+            continue
+        break
+    else:
+        raise ValueError("nickname_unavailable")
+
     return user
 
 
@@ -136,8 +186,6 @@ def link_provider_to_user(
             email=email,
         )
         db.add(link)
-    db.commit()
-    db.refresh(user)
     return user
 
 
@@ -162,9 +210,49 @@ def disconnect_provider(
     if remaining_methods <= 0 and not has_password:
         raise ValueError("no_other_login_method")
 
-    db.delete(link)
-    db.commit()
-    db.refresh(user)
+    # delete-orphan cascade: 컬렉션에서 빼면 flush 때 DELETE, user 재조회 불필요
+    user.providers.remove(link)
+    return user
+
+
+def get_user(db: Session, user_id: int):
+    return db.query(User).filter(User.id == user_id).first()
+
+
+def get_user_summaries(db: Session, user_ids: List[int]) -> Dict[int, UserSummary]:
+    """
+    batchSummary (db.loader): PK IN 쿼리 한 번. 탈퇴한 사용자는 빠진다
+    """
+    users = User.__table__
+    return {
+        row[0]: UserSummary(*row)
+        for row in db.execute(
+            select(users.c.id, users.c.nickname, users.c.profile_image)
+            .where(users.c.id.in_(user_ids), users.c.deleted_at.is_(None))
+        )
+    }
+
+
+def suspend_user(db: Session, user: User, until: datetime, reason: str | None = None):
+    """
+    정지: auth_epoch 를 올려 이미 발급한 access token 을 모두 무효로 하고 refresh token 도 지운다
+    commit 뒤 epoch 캐시를 덮어써서 클레임 인증(get_current_principal)도 바로 막힌다
+    """
+    user.suspended_until = until
+    user.suspended_reason = reason
+    user.auth_epoch = (user.auth_epoch or 0) + 1
+    user.refresh_token = None
+    publish_auth_epoch(db, user)
+    return user
+
+
+def unsuspend_user(db: Session, user: User):
+    """
+    정지 해제 (epoch 는 그대로: 정지 전에 받은 토큰은 계속 무효, 다시 로그인해야 한다)
+    """
+    user.suspended_until = None
+    user.suspended_reason = None
+    publish_auth_epoch(db, user)
     return user
 
 
@@ -202,6 +290,5 @@ def create_product(db: Session, seller_id: int, title: str, price: int, descript
         description=description
     )
     db.add(product)
-    db.commit()
-    db.refresh(product)
+    db.flush()
     return product
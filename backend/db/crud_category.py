@@ -0,0 +1,69 @@
+# db/crud_category.py
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from core.categories import CategoryTree, category_trees
+from db.models import Category
+from db.session import on_commit
+from schemas.category import CategoryCreate, CategoryUpdate
+
+
+def load_categories(db: Session):
+    """
+    트리 스냅샷 재료: 카테고리 전체 (비활성 포함, 스냅샷에서 거른다)
+    """
+    categories = Category.__table__
+    return db.execute(
+        select(
+            categories.c.id, categories.c.name, categories.c.slug, categories.c.type,
+            categories.c.parent_id, categories.c.sort_order, categories.c.is_active,
+        )
+    ).all()
+
+
+def category_tree(db: Session) -> CategoryTree:
+    """
+    메모리 스냅샷. 버전이 바뀌었을 때만 load_categories 한 번
+    """
+    return category_trees.get(lambda: load_categories(db))
+
+
+def get_category(db: Session, category_id: int) -> Optional[Category]:
+    return db.get(Category, category_id)
+
+
+def _check_parent(db: Session, category_id: Optional[int], parent_id: Optional[int]):
+    """
+    부모가 없거나 자기 자신/자손이면 ValueError (스냅샷이 아니라 DB 기준으로 위로 올라가며 확인)
+    """
+    seen = set()
+    while parent_id is not None:
+        if parent_id == category_id or parent_id in seen:
+            raise ValueError("category_cycle")
+        seen.add(parent_id)
+        parent = db.get(Category, parent_id)
+        if parent is None:
+            raise ValueError("parent_not_found")
+        parent_id = parent.parent_id
+
+
+def create_category(db: Session, data: CategoryCreate) -> Category:
+    _check_parent(db, None, data.parent_id)
+    category = Category(**data.model_dump())
+    db.add(category)
+    db.flush()  # category.id 생성용
+    on_commit(db, category_trees.invalidate)
+    return category
+
+
+def update_category(db: Session, category: Category, data: CategoryUpdate) -> Category:
+    fields = data.model_dump(exclude_unset=True)
+    if "parent_id" in fields:
+        _check_parent(db, category.id, fields["parent_id"])
+    for field, value in fields.items():
+        setattr(category, field, value)
+    db.flush()
+    on_commit(db, category_trees.invalidate)
+    return category
@@ -0,0 +1,329 @@
+# db/crud_chat.py
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import and_, bindparam, case, func, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from db import models
+
+# 인박스 미리보기 길이
+PREVIEW_LENGTH = 100
+
+
+# =========================
+# 채팅방
+# =========================
+
+def get_room(db: Session, room_id: int) -> Optional[models.ChatRoom]:
+    return db.get(models.ChatRoom, room_id)
+
+
+def _find_room(db: Session, product_id: int, buyer_id: int, *, locking: bool = False) -> Optional[models.ChatRoom]:
+    """
+    locking=True: FOR SHARE (current read). 트랜잭션 snapshot 이후에 commit 된 행도 보인다
+    """
+    query = db.query(models.ChatRoom).filter(
+        models.ChatRoom.product_id == product_id,
+        models.ChatRoom.buyer_id == buyer_id,
+    )
+    if locking:
+        query = query.with_for_update(read=True)
+    return query.first()
+
+
+def get_or_create_room(db: Session, *, product: models.Product, buyer_id: int) -> models.ChatRoom:
+    """
+    상품 + 구매자 당 채팅방 1개 (uq_chat_room_product_buyer)
+    동시에 두 번 눌러도 같은 방을 돌려준다.
+    """
+    room = _find_room(db, product.id, buyer_id)
+    if room:
+        return room
+
+    now = datetime.utcnow()
+    room = models.ChatRoom(
+        product_id=product.id,
+        seller_id=product.seller_id,
+        buyer_id=buyer_id,
+        created_at=now,
+    )
+    # 메시지가 아직 없는 방도 인박스에 보이도록 생성 시각으로 정렬 키를 채운다
+    room.members = [
+        models.ChatRoomMember(user_id=user_id, last_message_at=now)
+        for user_id in (product.seller_id, buyer_id)
+    ]
+    try:
+        with db.begin_nested():
+            db.add(room)
+    except IntegrityError:
+        # 다른 요청이 먼저 만들었음. 앞의 조회가 잡은 snapshot 에는 없으므로 locking read 로 다시 읽는다
+        room = _find_room(db, product.id, buyer_id, locking=True)
+        if room is None:
+            raise RuntimeError(f"chat room for product {product.id} / buyer {buyer_id} not found after conflict")
+    return room
+
+
+def is_member(room: models.ChatRoom, user_id: int) -> bool:
+    return user_id in (room.seller_id, room.buyer_id)
+
+
+# =========================
+# 메시지
+# =========================
+
+def insert_messages(db: Session, rows: List[dict]) -> List[int]:
+    """
+    rows: [{"room_id", "sender_id", "message", "created_at"}, ...]
+    한 행씩 INSERT 해서 각 문장의 lastrowid 로 행 순서대로 id 반환 (commit은 호출자, 배치당 한 번)
+    multi-row INSERT 의 id 는 연속이라는 보장이 없다 (innodb_autoinc_lock_mode=2, auto_increment_increment > 1)
+    """
+    messages = models.ChatMessage.__table__
+    return [db.execute(insert(messages).values(row)).inserted_primary_key[0] for row in rows]
+
+
+def apply_new_messages(db: Session, rows: List[dict], message_ids: List[int]):
+    """
+    group commit 배치에 대한 방/참여자 상태 증분 갱신 (insert_messages와 같은 트랜잭션)
+    - 방: 마지막 메시지 id/미리보기/시각
+    - 보낸 사람: 자기 마지막 메시지까지 읽은 것으로 보고 그 뒤 상대 메시지 수만 unread
+    - 나머지 참여자: unread += 배치 내 메시지 수
+    """
+    by_room: dict = {}
+    for message_id, row in zip(message_ids, rows):
+        by_room.setdefault(row["room_id"], []).append((message_id, row))
+
+    rooms = models.ChatRoom.__table__
+    members = models.ChatRoomMember.__table__
+
+    # 락 순서 고정: 방은 room_id 오름차순, 참여자는 방마다 UPDATE 한 문장으로
+    # uq_chat_room_member(room_id, user_id) 범위를 user_id 오름차순으로 잡는다
+    # (배치마다 순서가 다르면 다른 pod 의 flush 와 교착)
+    for room_id, messages in sorted(by_room.items()):
+        last_id, last = messages[-1]
+        db.execute(
+            update(rooms)
+            .where(rooms.c.id == room_id)
+            .values(
+                last_message_id=last_id,
+                last_message_preview=last["message"][:PREVIEW_LENGTH],
+                last_message_at=last["created_at"],
+            )
+        )
+
+        sender_state = {}
+        for idx, (message_id, row) in enumerate(messages):
+            sender_state[row["sender_id"]] = (idx, message_id)
+        senders = sorted(sender_state.items())
+
+        db.execute(
+            update(members)
+            .where(members.c.room_id == room_id)
+            .values(
+                unread_count=case(
+                    *[(members.c.user_id == sender_id, len(messages) - idx - 1)
+                      for sender_id, (idx, _) in senders],
+                    else_=members.c.unread_count + len(messages),
+                ),
+                last_read_message_id=case(
+                    *[(members.c.user_id == sender_id, message_id)
+                      for sender_id, (_, message_id) in senders],
+                    else_=members.c.last_read_message_id,
+                ),
+                last_message_at=last["created_at"],
+            )
+        )
+
+
+def list_messages(
+    db: Session,
+    room_id: int,
+    *,
+    before_id: Optional[int] = None,
+    limit: int = 30,
+):
+    """
+    (room_id, id) 인덱스 keyset: 최신 메시지부터 limit개
+    """
+    messages = models.ChatMessage.__table__
+    stmt = (
+        select(
+            messages.c.id,
+            messages.c.room_id,
+            messages.c.sender_id,
+            messages.c.message,
+            messages.c.created_at,
+        )
+        .where(messages.c.room_id == room_id)
+        .order_by(messages.c.id.desc())
+        .limit(limit)
+    )
+    if before_id is not None:
+        stmt = stmt.where(messages.c.id < before_id)
+    return db.execute(stmt).all()
+
+
+def mark_read(db: Session, room: models.ChatRoom, user_id: int, message_id: Optional[int] = None):
+    """
+    message_id까지 읽음 처리. 없거나 마지막 메시지 이상이면 전부 읽음
+    """
+    members = models.ChatRoomMember.__table__
+    last_id = room.last_message_id or 0
+
+    if message_id is None or message_id >= last_id:
+        read_id, unread = last_id, 0
+    else:
+        messages = models.ChatMessage.__table__
+        read_id = message_id
+        unread = db.execute(
+            select(func.count())
+            .select_from(messages)
+            .where(
+                messages.c.room_id == room.id,
+                messages.c.id > message_id,
+                messages.c.sender_id != user_id,
+            )
+        ).scalar_one()
+
+    # 이미 더 뒤까지 읽었으면 되돌리지 않는다
+    db.execute(
+        update(members)
+        .where(
+            members.c.room_id == room.id,
+            members.c.user_id == user_id,
+            members.c.last_read_message_id <= read_id,
+        )
+        .values(last_read_message_id=read_id, unread_count=unread)
+    )
+
+
+def list_inbox(
+    db: Session,
+    user_id: int,
+    *,
+    before: Optional[tuple] = None,
+    limit: int = 20,
+):
+    """
+    내 채팅방 목록 (마지막 메시지 최신순). 화면에 보이는 방 수만큼만 읽는다
+    before: (last_message_at, room_id) keyset 커서
+    """
+    members = models.ChatRoomMember.__table__
+    rooms = models.ChatRoom.__table__
+    stmt = (
+        select(
+            rooms.c.id.label("room_id"),
+            rooms.c.product_id,
+            rooms.c.seller_id,
+            rooms.c.buyer_id,
+            rooms.c.last_message_id,
+            rooms.c.last_message_preview,
+            members.c.last_message_at,
+            members.c.unread_count,
+            members.c.last_read_message_id,
+        )
+        .join(rooms, rooms.c.id == members.c.room_id)
+        .where(members.c.user_id == user_id)
+        .order_by(members.c.last_message_at.desc(), members.c.room_id.desc())
+        .limit(limit)
+    )
+    if before is not None:
+        before_at, before_room_id = before
+        stmt = stmt.where(
+            or_(
+                members.c.last_message_at < before_at,
+                and_(
+                    members.c.last_message_at == before_at,
+                    members.c.room_id < before_room_id,
+                ),
+            )
+        )
+    return db.execute(stmt).all()
+
+
+# =========================
+# 기존 방 보정 (migrations/031)
+# =========================
+
+def backfill_inbox(db: Session, *, after_id: int = 0, batch_size: int = 500) -> Tuple[int, Optional[int]]:
+    """
+    인박스 이전에 만든 방의 last_message_* 와 참여자 행(chat_room_members)을 채운다
+    - 방: 마지막 메시지 id/미리보기/시각 (메시지가 없으면 그대로)
+    - 참여자: 읽음 상태가 없던 때의 방이므로 마지막 메시지까지 읽은 것으로 (unread 0).
+      이미 있는 참여자 행은 건드리지 않는다 (INSERT IGNORE, uq_chat_room_member)
+    id 순으로 batch_size 개 방만 처리하고 (처리 건수, 마지막 id)를 돌려준다. commit은 호출자 몫
+    """
+    rooms = models.ChatRoom.__table__
+    members = models.ChatRoomMember.__table__
+    messages = models.ChatMessage.__table__
+
+    room_rows = db.execute(
+        select(rooms.c.id, rooms.c.seller_id, rooms.c.buyer_id, rooms.c.created_at)
+        .where(rooms.c.id > after_id)
+        .order_by(rooms.c.id)
+        .limit(batch_size)
+    ).all()
+    if not room_rows:
+        return 0, None
+
+    last_ids = (
+        select(func.max(messages.c.id).label("id"))
+        .where(messages.c.room_id.in_([r.id for r in room_rows]))
+        .group_by(messages.c.room_id)
+        .subquery()
+    )
+    last = {
+        row.room_id: row
+        for row in db.execute(
+            select(messages.c.room_id, messages.c.id, messages.c.message, messages.c.created_at)
+            .join(last_ids, messages.c.id == last_ids.c.id)
+        ).all()
+    }
+
+    if last:
+        db.execute(
+            update(rooms)
+            .where(rooms.c.id == bindparam("b_id"))
+            .values(
+                last_message_id=bindparam("b_message_id"),
+                last_message_preview=bindparam("b_preview"),
+                last_message_at=bindparam("b_at"),
+            ),
+            [
+                {
+                    "b_id": room_id,
+                    "b_message_id": m.id,
+                    "b_preview": m.message[:PREVIEW_LENGTH],
+                    "b_at": m.created_at,
+                }
+                for room_id, m in sorted(last.items())
+            ],
+        )
+
+    member_rows = []
+    for r in room_rows:
+        m = last.get(r.id)
+        for user_id in (r.seller_id, r.buyer_id):
+            if user_id is None:
+                continue
+            member_rows.append({
+                "room_id": r.id,
+                "user_id": user_id,
+                "last_read_message_id": m.id if m else 0,
+                "unread_count": 0,
+                "last_message_at": m.created_at if m else r.created_at,
+            })
+    if member_rows:
+        db.execute(insert(members).prefix_with("IGNORE"), member_rows)
+
+    return len(room_rows), room_rows[-1].id
+
+
+def new_message_row(room_id: int, sender_id: int, message: str) -> dict:
+    return {
+        "room_id": room_id,
+        "sender_id": sender_id,
+        "message": message,
+        "created_at": datetime.utcnow(),
+    }
@@ -1,5 +1,8 @@
 from sqlalchemy.orm import Session, joinedload
-from db import models
+from sqlalchemy.orm.attributes import set_committed_value
+from core.events import KIND_POST, counter_changed
+from db import crud_notification, models
+from db.crud_community import refresh_hot_score
 from schemas.comment import CommentCreate
 
 
@@ -13,12 +16,18 @@ def create_comment(db: Session, post_id: int, user_id: int, payload: CommentCrea
 
     db.add(comment)
 
-    # 게시글 댓글 수 증가
-    post = db.query(models.CommunityPost).filter(models.CommunityPost.id == post_id).first()
+    # 게시글 댓글 수 증가 (라우터에서 이미 조회한 게시글이면 identity map에서 가져옴)
+    post = db.get(models.CommunityPost, post_id)
     post.comment_count = (post.comment_count or 0) + 1
-
-    db.commit()
-    db.refresh(comment)
+    refresh_hot_score(post)
+    counter_changed(db, KIND_POST, post_id, "comment_count", 1)
+
+    db.flush()  # comment.id 생성용
+    if payload.parent_id:
+        # 부모 댓글 작성자에게 답글 알림 (commit 뒤 jobs 큐에서 묶어서 쓴다)
+        crud_notification.comment_replied(db, payload.parent_id, post_id, user_id)
+    # 새 댓글은 자식이 없으므로 응답 직렬화 때 children lazy load를 하지 않게 한다
+    set_committed_value(comment, "children", [])
     return comment
 
 
@@ -31,9 +40,7 @@ def delete_comment(db: Session, comment_id: int, user_id: int):
     if not comment:
         return None
 
-    post = db.query(models.CommunityPost).filter(
-        models.CommunityPost.id == comment.post_id
-    ).first()
+    post = db.get(models.CommunityPost, comment.post_id)
 
     # 자식 댓글 수 포함 재귀 삭제 개수 계산
     def count_children(node):
@@ -43,8 +50,11 @@ def delete_comment(db: Session, comment_id: int, user_id: int):
 
     db.delete(comment)
 
-    post.comment_count = max((post.comment_count or 0) - total, 0)
-    db.commit()
+    removed = min(post.comment_count or 0, total)
+    post.comment_count = (post.comment_count or 0) - removed
+    if removed:
+        refresh_hot_score(post)
+        counter_changed(db, KIND_POST, post.id, "comment_count", -removed)
 
     return True
 
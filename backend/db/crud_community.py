@@ -1,10 +1,22 @@
 # db/crud_community.py
-from typing import List, Optional, Tuple
+from datetime import datetime
+from typing import Collection, Dict, List, Optional, Set, Tuple
 
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import and_, bindparam, delete, func, insert, or_, select, update
+
+from core.config import settings
+from core.events import KIND_POST, counter_changed
+from core.jobs import job
+from core.ranking import hot_score, hot_score_sql
+from core.timeline import PostRow, post_rows, timeline
 from db import models
+from db.crud_counter import add_like_count
+from db.crud_job import enqueue
+from db import crud_notification
+from db.crud_media import build_image_rows, cover_thumbnail
+from db.session import on_commit
 from schemas.community import (
     CommunityPostCreate,
     CommunityPostUpdate,
@@ -15,14 +27,27 @@ from schemas.community import (
 # 게시글 CRUD
 # =========================
 
+def _image_rows(db: Session, asset_ids: Optional[List[int]], urls: Optional[List[str]]) -> List[dict]:
+    # 업로드 이미지 먼저, 외부 URL 은 그 뒤 순서로
+    sources = [(asset_id, None) for asset_id in asset_ids or []] + [(None, url) for url in urls or []]
+    return build_image_rows(db, [(asset_id, url, i) for i, (asset_id, url) in enumerate(sources)])
+
+
 def create_post(
     db: Session,
     *,
     user: models.User,
     data: CommunityPostCreate,
 ) -> models.CommunityPost:
+    """
+    업로드 이미지(image_asset_ids)가 없거나 변환 실패한 것이면 ValueError
+    """
     # region_id 없으면 유저의 home_region 사용
     region_id = data.region_id or user.home_region_id
+    # created_at 은 DATETIME(초 단위, MySQL 은 반올림해서 저장). 타임라인 점수/행 캐시도 DB 와 같은 값이어야
+    # 캐시 경로와 DB 경로 사이에 커서를 넘겨도 글이 겹치거나 빠지지 않는다
+    now = datetime.utcnow().replace(microsecond=0)
+    image_rows = _image_rows(db, data.image_asset_ids, data.image_urls)
 
     post = models.CommunityPost(
         user_id=user.id,
@@ -30,23 +55,17 @@ def create_post(
         category_id=data.category_id,
         title=data.title,
         content=data.content,
+        created_at=now,
+        hot_score=hot_score(0, 0, 0, now),
+        thumbnail_url=cover_thumbnail(image_rows),
     )
+    # 이미지가 있으면 게시글과 같은 flush에서 저장
+    post.images = [models.CommunityPostImage(**row) for row in image_rows]
     db.add(post)
     db.flush()  # post.id 생성용
 
-    # 이미지가 있으면 저장
-    if data.image_urls:
-        for idx, url in enumerate(data.image_urls):
-            img = models.CommunityPostImage(
-                post_id=post.id,
-                image_url=url,
-                # sort_order가 모델에 없으면 이 줄 삭제
-                # sort_order=idx,
-            )
-            db.add(img)
-
-    db.commit()
-    db.refresh(post)
+    row = _post_row(post)
+    on_commit(db, lambda: _cache_post_created(row))
     return post
 
 
@@ -65,27 +84,220 @@ def list_posts(
     size: int,
     sort: str = "recent",
     region_id: Optional[int] = None,
-) -> Tuple[List[models.CommunityPost], int]:
+    category_ids: Optional[Collection[int]] = None,
+    after: Optional[tuple] = None,
+) -> Tuple[list, Optional[int]]:
     """
-    sort: recent | popular
+    sort: recent | popular (hot_score 순)
+    category_ids: 카테고리와 그 하위 카테고리 id (crud_category.category_tree().expand)
+    after: 이전 페이지 마지막 글의 (정렬 키, id) keyset 커서.
+           커서가 있으면 OFFSET/COUNT 없이 인덱스에서 바로 이어 읽고 total은 None
+    목록에 필요한 컬럼만 Core row 로 돌려준다 (ORM 엔티티 로딩 없음)
     """
-    q = db.query(models.CommunityPost).filter(models.CommunityPost.is_hidden == 0)
-
+    posts = models.CommunityPost.__table__
+    conditions = [posts.c.is_hidden == 0]
     if region_id:
-        q = q.filter(models.CommunityPost.region_id == region_id)
-
-    total = q.count()
+        conditions.append(posts.c.region_id == region_id)
+    if category_ids:
+        conditions.append(posts.c.category_id.in_(sorted(category_ids)))
+
+    sort_col = posts.c.hot_score if sort == "popular" else posts.c.created_at
+
+    total = None
+    if after is None:
+        total = db.execute(
+            select(func.count()).select_from(posts).where(*conditions)
+        ).scalar_one()
+    else:
+        after_value, after_id = after
+        conditions.append(
+            or_(
+                sort_col < after_value,
+                and_(sort_col == after_value, posts.c.id < after_id),
+            )
+        )
 
-    if sort == "popular":
-        q = q.order_by(
-            models.CommunityPost.like_count.desc(),
-            models.CommunityPost.id.desc(),
+    stmt = (
+        select(
+            posts.c.id, posts.c.title, posts.c.region_id, posts.c.user_id,
+            posts.c.like_count, posts.c.comment_count, posts.c.view_count,
+            posts.c.created_at, posts.c.thumbnail_url, posts.c.hot_score,
         )
-    else:  # recent
-        q = q.order_by(models.CommunityPost.created_at.desc())
+        .where(*conditions)
+        .order_by(sort_col.desc(), posts.c.id.desc())
+        .limit(size)
+    )
+    if after is None:
+        stmt = stmt.offset((page - 1) * size)
+    return db.execute(stmt).all(), total
+
+
+def post_sort_key(post, sort: str) -> tuple:
+    """
+    list_posts(after=...)에 넘길 keyset 커서 값
+    """
+    return (post.hot_score if sort == "popular" else post.created_at, post.id)
+
+
+def refresh_hot_score(post: models.CommunityPost):
+    """
+    카운터를 바꾼 뒤 호출. 같은 UPDATE 문에 hot_score가 함께 실린다
+    """
+    post.hot_score = hot_score(
+        post.like_count, post.comment_count, post.view_count, post.created_at or datetime.utcnow()
+    )
+
+
+def rebase_hot_scores(
+    db: Session,
+    *,
+    after_id: int = 0,
+    batch_size: int = 1000,
+    since: Optional[datetime] = None,
+) -> Tuple[int, Optional[int]]:
+    """
+    저장된 카운터로 hot_score를 다시 계산 (가중치 변경, 카운터를 직접 고친 경우 보정)
+    id 순으로 batch_size 개만 처리하고 (처리 건수, 마지막 id)를 돌려준다. commit은 호출자 몫
+    """
+    posts = models.CommunityPost.__table__
+    stmt = (
+        select(posts.c.id, posts.c.like_count, posts.c.comment_count, posts.c.view_count, posts.c.created_at)
+        .where(posts.c.id > after_id)
+        .order_by(posts.c.id)
+        .limit(batch_size)
+    )
+    if since is not None:
+        stmt = stmt.where(posts.c.created_at >= since)
+    rows = db.execute(stmt).all()
+    if not rows:
+        return 0, None
+
+    db.execute(
+        update(posts)
+        .where(posts.c.id == bindparam("b_id"))
+        # 점수 보정은 내용 변경이 아니므로 updated_at(증분 export 기준)은 그대로 둔다
+        .values(hot_score=bindparam("b_score"), updated_at=posts.c.updated_at),
+        [
+            {
+                "b_id": r.id,
+                "b_score": hot_score(r.like_count, r.comment_count, r.view_count, r.created_at or datetime.utcnow()),
+            }
+            for r in rows
+        ],
+    )
+    return len(rows), rows[-1].id
+
+
+# =========================
+# 동네 타임라인 캐시
+# =========================
+
+def _post_row(post: models.CommunityPost) -> PostRow:
+    return PostRow(
+        id=post.id,
+        title=post.title,
+        region_id=post.region_id,
+        user_id=post.user_id,
+        like_count=post.like_count or 0,
+        comment_count=post.comment_count or 0,
+        view_count=post.view_count or 0,
+        created_at=post.created_at,
+        thumbnail_url=post.thumbnail_url,
+    )
 
-    items = q.offset((page - 1) * size).limit(size).all()
-    return items, total
+
+def _cache_post_created(row: PostRow):
+    post_rows.put_many([row])
+    timeline.push(row.region_id, row.id, row.created_at)
+
+
+def _cache_post_removed(region_id: int, post_id: int):
+    timeline.remove(region_id, post_id)
+    post_rows.delete(post_id)
+
+
+def _load_region_timeline(db: Session, region_id: int):
+    posts = models.CommunityPost.__table__
+    visible = and_(posts.c.region_id == region_id, posts.c.is_hidden == 0)
+    limit = settings.TIMELINE_MAX_ENTRIES
+    entries = db.execute(
+        select(posts.c.id, posts.c.created_at)
+        .where(visible)
+        .order_by(posts.c.created_at.desc(), posts.c.id.desc())
+        .limit(limit)
+    ).all()
+    total = len(entries)
+    if total == limit:
+        total = db.execute(select(func.count()).select_from(posts).where(visible)).scalar_one()
+    timeline.load(region_id, entries, total, complete=len(entries) < limit)
+
+
+def get_post_rows(db: Session, post_ids: List[int]) -> List[PostRow]:
+    """
+    목록 한 페이지 hydrate: 행 캐시 multi-get, 빠진 것만 IN 쿼리 한 번. 숨김/삭제 글은 빠진다
+    """
+    found = post_rows.get_many(post_ids)
+    missing = [i for i in post_ids if i not in found]
+    if missing:
+        posts = models.CommunityPost.__table__
+        loaded = [
+            PostRow(
+                id=r.id,
+                title=r.title,
+                region_id=r.region_id,
+                user_id=r.user_id,
+                like_count=r.like_count or 0,
+                comment_count=r.comment_count or 0,
+                view_count=r.view_count or 0,
+                created_at=r.created_at,
+                thumbnail_url=r.thumbnail_url,
+            )
+            for r in db.execute(
+                select(
+                    posts.c.id, posts.c.title, posts.c.region_id, posts.c.user_id,
+                    posts.c.like_count, posts.c.comment_count, posts.c.view_count, posts.c.created_at,
+                    posts.c.thumbnail_url,
+                ).where(posts.c.id.in_(missing), posts.c.is_hidden == 0)
+            )
+        ]
+        post_rows.put_many(loaded)
+        found.update((row.id, row) for row in loaded)
+    return [found[i] for i in post_ids if i in found]
+
+
+def get_post_rows_by_id(db: Session, post_ids: List[int]) -> Dict[int, PostRow]:
+    """
+    batchGet (db.loader) 용 get_post_rows
+    """
+    return {row.id: row for row in get_post_rows(db, post_ids)}
+
+
+def list_recent_posts_cached(
+    db: Session,
+    *,
+    region_id: int,
+    page: int,
+    size: int,
+    after: Optional[tuple] = None,
+) -> Optional[Tuple[List[PostRow], Optional[int]]]:
+    """
+    list_posts(sort="recent", region_id=...) 의 캐시 경로. 타임라인이 채워져 있으면
+    첫 페이지들은 DB를 읽지 않는다. 타임라인 범위를 벗어나면 None (호출자가 DB 경로로)
+    """
+    offset = (page - 1) * size
+    ids = timeline.page(region_id, offset=offset, limit=size, after=after)
+    if ids is None:
+        _load_region_timeline(db, region_id)
+        ids = timeline.page(region_id, offset=offset, limit=size, after=after)
+        if ids is None:
+            return None
+
+    total = None
+    if after is None:
+        total = timeline.count(region_id)
+        if total is None:
+            return None
+    return get_post_rows(db, ids), total
 
 
 def update_post(
@@ -94,6 +306,7 @@ def update_post(
     post: models.CommunityPost,
     data: CommunityPostUpdate,
 ):
+    was_hidden = bool(post.is_hidden)
     if data.title is not None:
         post.title = data.title
     if data.content is not None:
@@ -102,22 +315,31 @@ def update_post(
         post.is_hidden = 1 if data.is_hidden else 0
 
     # 이미지 전체 교체 (옵션)
-    if data.image_urls is not None:
+    if data.image_urls is not None or data.image_asset_ids is not None:
+        image_rows = _image_rows(db, data.image_asset_ids, data.image_urls)
         # 기존 이미지 삭제
         db.query(models.CommunityPostImage).filter(
             models.CommunityPostImage.post_id == post.id
         ).delete()
         # 새로 추가
-        for idx, url in enumerate(data.image_urls):
-            img = models.CommunityPostImage(
-                post_id=post.id,
-                image_url=url,
-                # sort_order=idx,
-            )
-            db.add(img)
+        images = [models.CommunityPostImage(post_id=post.id, **row) for row in image_rows]
+        post.thumbnail_url = cover_thumbnail(image_rows)
+        db.add_all(images)
+        db.flush()
+        # 응답용 컬렉션을 재조회 없이 교체
+        set_committed_value(post, "images", images)
+
+    # 타임라인/행 캐시 write-through
+    if post.is_hidden:
+        if not was_hidden:
+            on_commit(db, lambda region_id=post.region_id, post_id=post.id: _cache_post_removed(region_id, post_id))
+    else:
+        row = _post_row(post)
+        if was_hidden:
+            on_commit(db, lambda: _cache_post_created(row))
+        else:
+            on_commit(db, lambda: post_rows.put_many([row]))
 
-    db.commit()
-    db.refresh(post)
     return post
 
 
@@ -127,18 +349,56 @@ def soft_delete_post(
     post: models.CommunityPost,
 ):
     post.is_hidden = 1
-    db.commit()
-    db.refresh(post)
+    on_commit(db, lambda region_id=post.region_id, post_id=post.id: _cache_post_removed(region_id, post_id))
     return post
 
 
 def increase_view_count(db: Session, post: models.CommunityPost):
-    post.view_count = (post.view_count or 0) + 1
-    db.commit()
-    db.refresh(post)
+    """
+    조회 한 건 = 작업 INSERT 한 건 (인기글 행을 요청 안에서 잠그지 않는다).
+    view_count/hot_score 는 apply_post_views 가 모아서 반영한다
+    """
+    enqueue(db, "post.viewed", {"post_id": post.id})
     return post
 
 
+@job("post.viewed", queue="counters", batch=True)
+def apply_post_views(db: Session, payloads: List[dict]):
+    """
+    한 번에 꺼낸 조회 작업을 게시글별로 합쳐 executemany UPDATE 한 번 (hot_score 도 같은 문장에서)
+    """
+    views: Dict[int, int] = {}
+    for payload in payloads:
+        views[payload["post_id"]] = views.get(payload["post_id"], 0) + 1
+
+    posts = models.CommunityPost.__table__
+    view_count = func.coalesce(posts.c.view_count, 0) + bindparam("b_views")
+    db.execute(
+        update(posts)
+        .where(posts.c.id == bindparam("b_id"))
+        # 조회수는 내용 변경이 아니므로 updated_at(증분 export 기준)은 그대로 둔다
+        .values(
+            view_count=view_count,
+            hot_score=hot_score_sql(posts.c.like_count, posts.c.comment_count, view_count, posts.c.created_at),
+            updated_at=posts.c.updated_at,
+        ),
+        [{"b_id": post_id, "b_views": count} for post_id, count in sorted(views.items())],
+    )
+    for post_id, count in views.items():
+        counter_changed(db, KIND_POST, post_id, "view_count", count)
+
+
+def get_post_counters(db: Session, post_ids: List[int]):
+    """
+    실시간 카운터 구독 시작 시점 스냅샷
+    """
+    posts = models.CommunityPost.__table__
+    return db.execute(
+        select(posts.c.id, posts.c.like_count, posts.c.comment_count, posts.c.view_count)
+        .where(posts.c.id.in_(post_ids))
+    ).all()
+
+
 # =========================
 # 댓글
 # =========================
@@ -159,9 +419,10 @@ def create_comment(
 
     # 댓글 수 증가
     post.comment_count = (post.comment_count or 0) + 1
+    refresh_hot_score(post)
+    counter_changed(db, KIND_POST, post.id, "comment_count", 1)
 
-    db.commit()
-    db.refresh(comment)
+    db.flush()  # comment.id 생성용
     return comment
 
 
@@ -183,16 +444,13 @@ def delete_comment(
     comment: models.CommunityComment,
 ):
     # 댓글 수 감소
-    post = (
-        db.query(models.CommunityPost)
-        .filter(models.CommunityPost.id == comment.post_id)
-        .first()
-    )
+    post = db.get(models.CommunityPost, comment.post_id)
     if post and post.comment_count and post.comment_count > 0:
         post.comment_count -= 1
+        refresh_hot_score(post)
+        counter_changed(db, KIND_POST, post.id, "comment_count", -1)
 
     db.delete(comment)
-    db.commit()
 
 
 # =========================
@@ -214,42 +472,48 @@ def get_post_like(
         .first()
     )
 
-def like_post(db: Session, user: models.User, post_id: int):
-    post = db.query(models.CommunityPost).filter(models.CommunityPost.id == post_id).first()
-    if not post:
-        return None
-
-    exists = db.query(models.CommunityPostLike).filter(
-        models.CommunityPostLike.user_id == user.id,
-        models.CommunityPostLike.post_id == post_id
-    ).first()
-
-    if exists:
-        return exists
-
-    like = models.CommunityPostLike(user_id=user.id, post_id=post_id)
-    db.add(like)
-
-    post.like_count = (post.like_count or 0) + 1
-
-    db.commit()
-    return like
-
-
-def unlike_post(db: Session, user: models.User, post_id: int):
-    like = db.query(models.CommunityPostLike).filter(
-        models.CommunityPostLike.user_id == user.id,
-        models.CommunityPostLike.post_id == post_id
-    ).first()
-
-    if not like:
-        return
+def liked_post_ids(db: Session, user_id: int, post_ids: List[int]) -> Set[int]:
+    """
+    목록 한 페이지의 liked_by_me: 글마다 조회하지 않고 IN 쿼리 한 번
+    """
+    if not post_ids:
+        return set()
+    likes = models.CommunityPostLike.__table__
+    return set(
+        db.execute(
+            select(likes.c.post_id).where(
+                likes.c.user_id == user_id,
+                likes.c.post_id.in_(post_ids),
+            )
+        ).scalars()
+    )
 
-    post = db.query(models.CommunityPost).filter(models.CommunityPost.id == post_id).first()
 
-    db.delete(like)
+def like_post(db: Session, user_id: int, post_id: int) -> bool:
+    """
+    INSERT IGNORE 한 문장 (uq_community_post_like). 이미 눌렀거나 없는 글이면 0 rows -> False
+    실제로 추가됐을 때만 like_count +1
+    """
+    likes = models.CommunityPostLike.__table__
+    result = db.execute(
+        insert(likes).prefix_with("IGNORE").values(user_id=user_id, post_id=post_id)
+    )
+    if result.rowcount != 1:
+        return False
+    add_like_count(db, KIND_POST, post_id, 1)
+    crud_notification.post_liked(db, post_id, user_id)
+    return True
 
-    if post.like_count:
-        post.like_count -= 1
 
-    db.commit()
+def unlike_post(db: Session, user_id: int, post_id: int) -> bool:
+    """
+    DELETE ... WHERE 한 문장. 지워진 행이 있을 때만 like_count -1
+    """
+    likes = models.CommunityPostLike.__table__
+    result = db.execute(
+        delete(likes).where(likes.c.user_id == user_id, likes.c.post_id == post_id)
+    )
+    if result.rowcount == 0:
+        return False
+    add_like_count(db, KIND_POST, post_id, -1)
+    return True
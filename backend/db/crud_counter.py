@@ -0,0 +1,184 @@
+# db/crud_counter.py
+"""
+좋아요 수 증감
+
+- 보통: 대상 행에 UPDATE ... SET like_count = like_count + :d  (행을 읽지 않는 한 문장)
+- 인기 대상(sharded): counter_shards 의 K개 행 중 무작위 하나에 upsert.
+  같은 행 잠금에 줄 서지 않으므로 한 대상의 좋아요 처리량이 shard 수만큼 늘어난다.
+  compact_counter_shards() 가 주기적으로 shard 합계를 like_count에 합치고 shard 행을 지운다.
+
+인기 대상 감지: 프로세스별로 COUNTER_HOT_WINDOW_SECONDS 동안 좋아요가 COUNTER_HOT_THRESHOLD 를
+넘으면 공유 캐시에 sharded 표시(TTL)를 남긴다. 표시가 있는 동안 모든 파드가 shard로 보낸다.
+"""
+import random
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List, Tuple
+
+from sqlalchemy import bindparam, delete, func, select, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.orm import Session
+
+from core.cache import cache
+from core.config import settings
+from core.events import KIND_POST, KIND_PRODUCT, counter_changed
+from core.ranking import hot_score_sql
+from db import models
+
+_TARGET_TABLES = {
+    KIND_POST: models.CommunityPost.__table__,
+    KIND_PRODUCT: models.Product.__table__,
+}
+
+
+def _sharded_key(kind: str, target_id: int) -> str:
+    return f"ctr:sharded:{kind}:{target_id}"
+
+
+def _pending_key(kind: str, target_id: int) -> str:
+    return f"ctr:pending:{kind}:{target_id}"
+
+
+class HotTargetDetector:
+    """
+    고정 윈도우 카운트. 윈도우가 바뀌면 초기화하므로 메모리는 윈도우 안 대상 수만큼만 쓴다
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._window = 0
+        self._hits: Dict[Tuple[str, int], int] = defaultdict(int)
+
+    def hit(self, kind: str, target_id: int) -> bool:
+        """
+        이번 윈도우에서 임계치를 막 넘었으면 True (한 번만)
+        """
+        window = int(time.monotonic() // settings.COUNTER_HOT_WINDOW_SECONDS)
+        with self._lock:
+            if window != self._window:
+                self._window = window
+                self._hits.clear()
+            self._hits[(kind, target_id)] += 1
+            return self._hits[(kind, target_id)] == settings.COUNTER_HOT_THRESHOLD
+
+
+hot_targets = HotTargetDetector()
+
+
+def is_sharded(kind: str, target_id: int) -> bool:
+    return settings.COUNTER_SHARDING_ENABLED and cache.get(_sharded_key(kind, target_id)) is not None
+
+
+def mark_sharded(kind: str, target_id: int):
+    cache.set(_sharded_key(kind, target_id), "1", settings.COUNTER_SHARDED_TTL_SECONDS)
+
+
+def _target_values(kind: str, table, delta):
+    like_count = func.greatest(table.c.like_count + delta, 0)
+    values = {"like_count": like_count}
+    if kind == KIND_POST:
+        values["hot_score"] = hot_score_sql(
+            like_count, table.c.comment_count, table.c.view_count, table.c.created_at
+        )
+    return values
+
+
+def add_like_count(db: Session, kind: str, target_id: int, delta: int):
+    """
+    like_count += delta. 같은 트랜잭션에서 좋아요 행 insert/delete와 함께 commit된다
+    """
+    if settings.COUNTER_SHARDING_ENABLED and hot_targets.hit(kind, target_id):
+        mark_sharded(kind, target_id)
+
+    if is_sharded(kind, target_id):
+        stmt = mysql_insert(models.CounterShard.__table__).values(
+            kind=kind,
+            target_id=target_id,
+            shard=random.randrange(settings.COUNTER_SHARDS),
+            delta=delta,
+        )
+        db.execute(stmt.on_duplicate_key_update(delta=models.CounterShard.__table__.c.delta + delta))
+    else:
+        table = _TARGET_TABLES[kind]
+        db.execute(
+            update(table)
+            .where(table.c.id == target_id)
+            .values(**_target_values(kind, table, delta))
+        )
+
+    counter_changed(db, kind, target_id, "like_count", delta)
+
+
+def pending_like_deltas(db: Session, kind: str, target_ids: Iterable[int], *, fresh: bool = False) -> Dict[int, int]:
+    """
+    아직 like_count에 합쳐지지 않은 shard 합계. sharded 대상만 조회하고 짧게 캐시한다
+    fresh=True 면 캐시된 합계를 쓰지 않고 DB에서 (실시간 구독 스냅샷: 이후 delta 와 맞아야 한다)
+    """
+    if not settings.COUNTER_SHARDING_ENABLED:
+        return {}
+    target_ids = list(target_ids)
+    if not target_ids:
+        return {}
+
+    flags = cache.get_many([_sharded_key(kind, i) for i in target_ids])
+    sharded = [i for i, flag in zip(target_ids, flags) if flag is not None]
+    if not sharded:
+        return {}
+
+    result = {}
+    if not fresh:
+        cached = cache.get_many([_pending_key(kind, i) for i in sharded])
+        result = {i: int(raw) for i, raw in zip(sharded, cached) if raw is not None}
+    missing = [i for i in sharded if i not in result]
+    if missing:
+        shards = models.CounterShard.__table__
+        sums = dict(
+            db.execute(
+                select(shards.c.target_id, func.sum(shards.c.delta))
+                .where(shards.c.kind == kind, shards.c.target_id.in_(missing))
+                .group_by(shards.c.target_id)
+            ).all()
+        )
+        loaded = {i: int(sums.get(i) or 0) for i in missing}
+        cache.set_many(
+            {_pending_key(kind, i): str(v) for i, v in loaded.items()},
+            settings.COUNTER_PENDING_CACHE_SECONDS,
+        )
+        result.update(loaded)
+    return {i: v for i, v in result.items() if v}
+
+
+def compact_counter_shards(db: Session, batch_size: int = 1000) -> int:
+    """
+    shard 행을 최대 batch_size 개 잠그고(SKIP LOCKED, 다른 compactor와 겹치지 않음)
+    대상별 합계를 like_count에 더한 뒤 지운다. 처리한 shard 행 수를 돌려준다. commit은 호출자 몫
+    """
+    shards = models.CounterShard.__table__
+    rows = db.execute(
+        select(shards.c.id, shards.c.kind, shards.c.target_id, shards.c.delta)
+        .order_by(shards.c.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).all()
+    if not rows:
+        return 0
+
+    totals: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+    for row in rows:
+        totals[row.kind][row.target_id] += row.delta
+
+    for kind, per_target in totals.items():
+        table = _TARGET_TABLES.get(kind)
+        params: List[dict] = [{"b_id": i, "b_delta": d} for i, d in per_target.items() if d]
+        if table is None or not params:
+            continue
+        db.execute(
+            update(table)
+            .where(table.c.id == bindparam("b_id"))
+            .values(**_target_values(kind, table, bindparam("b_delta"))),
+            params,
+        )
+
+    db.execute(delete(shards).where(shards.c.id.in_([row.id for row in rows])))
+    return len(rows)
@@ -0,0 +1,93 @@
+# db/crud_export.py
+"""
+분석/백업용 전체 테이블 덤프 (NDJSON)
+
+ORM 엔티티 대신 Core select의 row 튜플을 서버 사이드 커서(stream_results)로
+yield_per 단위로 받아 바로 한 줄씩 인코딩한다. 메모리 사용량은 행 수와 무관하다.
+id 오름차순이므로 마지막으로 받은 id를 after_id로 넘기면 이어받을 수 있다.
+"""
+import enum
+import json
+from datetime import date, datetime
+from typing import Iterator, Optional
+
+from sqlalchemy import select
+
+from db.session import engine
+from db.models import CommunityComment, CommunityPost, Product, User
+
+# 민감 정보는 덤프에서 제외
+_EXCLUDED_COLUMNS = {
+    "users": {"password_hash", "refresh_token"},
+}
+
+EXPORT_TABLES = {
+    model.__tablename__: model.__table__
+    for model in (Product, CommunityPost, CommunityComment, User)
+}
+
+EXPORT_BATCH_SIZE = 1000
+
+
+def _export_columns(table):
+    excluded = _EXCLUDED_COLUMNS.get(table.name, set())
+    return [c for c in table.c if c.name not in excluded]
+
+
+def _since_clause(table, updated_since: datetime):
+    # updated_at 은 만들 때도 채우므로 하나만 본다 ((updated_at, id) 인덱스 range 스캔)
+    # updated_at이 없는 테이블(users, community_comments)은 (created_at, id) 인덱스
+    col = table.c.updated_at if "updated_at" in table.c else table.c.created_at
+    return col >= updated_since
+
+
+def build_export_query(
+    table_name: str,
+    *,
+    after_id: Optional[int] = None,
+    until_id: Optional[int] = None,
+    updated_since: Optional[datetime] = None,
+    limit: Optional[int] = None,
+):
+    table = EXPORT_TABLES[table_name]
+    stmt = select(*_export_columns(table))
+
+    if after_id is not None:
+        stmt = stmt.where(table.c.id > after_id)
+    if until_id is not None:
+        stmt = stmt.where(table.c.id <= until_id)
+    if updated_since is not None:
+        stmt = stmt.where(_since_clause(table, updated_since))
+
+    stmt = stmt.order_by(table.c.id)
+    if limit:
+        stmt = stmt.limit(limit)
+    return stmt
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    raise TypeError(f"Unsupported type: {type(value).__name__}")
+
+
+def iter_export_ndjson(table_name: str, **filters) -> Iterator[bytes]:
+    """
+    NDJSON을 EXPORT_BATCH_SIZE 행 단위 bytes 청크로 yield
+    """
+    stmt = build_export_query(table_name, **filters)
+
+    with engine.connect() as conn:
+        result = conn.execution_options(
+            stream_results=True,
+            yield_per=EXPORT_BATCH_SIZE,
+        ).execute(stmt)
+        keys = list(result.keys())
+
+        for partition in result.partitions():
+            yield "".join(
+                json.dumps(dict(zip(keys, row)), default=_json_default, ensure_ascii=False) + "\n"
+                for row in partition
+            ).encode("utf-8")
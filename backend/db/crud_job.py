@@ -0,0 +1,173 @@
+# db/crud_job.py
+import json
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import delete, func, insert, select, tuple_, update
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from core.jobs import get_spec, notify
+from core.metrics import counter
+from db.models import Job, JobStatus
+from db.session import on_commit
+
+jobs_enqueued = counter("jobs_enqueued_total", "Background jobs committed to the queue by kind")
+
+
+@dataclass
+class ClaimedJob:
+    id: int
+    kind: str
+    payload: dict
+    attempts: int      # 이번 실행을 포함한 시도 횟수 (완료/재시도 때 lease 확인용)
+    max_attempts: int
+
+
+def enqueue(db: Session, kind: str, payload: Optional[dict] = None, *, delay_seconds: float = 0):
+    """
+    호출한 트랜잭션에 작업 INSERT 를 싣는다. commit 되면 같은 프로세스의 실행기를 바로 깨우고,
+    rollback 되면 작업도 없다. 등록되지 않은 kind 면 ValueError
+    """
+    spec = get_spec(kind)
+    if spec is None:
+        raise ValueError(f"Unknown job kind: {kind}")
+    db.execute(
+        insert(Job.__table__).values(
+            queue=spec.queue,
+            kind=kind,
+            payload=json.dumps(payload or {}, separators=(",", ":")),
+            status=JobStatus.queued,
+            attempts=0,
+            max_attempts=spec.max_attempts or settings.JOB_MAX_ATTEMPTS,
+            run_at=datetime.utcnow() + timedelta(seconds=delay_seconds),
+            created_at=datetime.utcnow(),
+        )
+    )
+
+    def committed():
+        jobs_enqueued.inc(kind=kind)
+        notify(spec.queue)
+
+    on_commit(db, committed)
+
+
+def claim_jobs(db: Session, queue: str, limit: int, lease_seconds: int) -> List[ClaimedJob]:
+    """
+    실행할 수 있는 작업을 limit 개까지 가져가 running 으로 바꾸고 lease 를 건다. commit 은 호출자 몫
+    SKIP LOCKED: 다른 워커/파드가 잡고 있는 행은 건너뛴다.
+    lease 가 끝난 running 작업(실행 중 프로세스가 죽음)도 다시 가져간다. 시도를 다 썼으면 failed
+    """
+    jobs = Job.__table__
+    now = datetime.utcnow()
+    rows = db.execute(
+        select(jobs.c.id, jobs.c.kind, jobs.c.payload, jobs.c.attempts, jobs.c.max_attempts)
+        .where(
+            jobs.c.queue == queue,
+            jobs.c.status.in_([JobStatus.queued, JobStatus.running]),
+            jobs.c.run_at <= now,
+        )
+        .order_by(jobs.c.run_at, jobs.c.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    ).all()
+    if not rows:
+        return []
+
+    exhausted = [r.id for r in rows if r.attempts >= r.max_attempts]
+    if exhausted:
+        db.execute(
+            update(jobs)
+            .where(jobs.c.id.in_(exhausted))
+            .values(status=JobStatus.failed, last_error="lease expired")
+        )
+    claimed = [r for r in rows if r.attempts < r.max_attempts]
+    if claimed:
+        db.execute(
+            update(jobs)
+            .where(jobs.c.id.in_([r.id for r in claimed]))
+            .values(
+                status=JobStatus.running,
+                attempts=jobs.c.attempts + 1,
+                run_at=now + timedelta(seconds=lease_seconds),
+            )
+        )
+    return [
+        ClaimedJob(r.id, r.kind, json.loads(r.payload), r.attempts + 1, r.max_attempts)
+        for r in claimed
+    ]
+
+
+def finish_jobs(db: Session, claimed: Sequence[ClaimedJob]) -> bool:
+    """
+    성공한 작업 행 삭제 (핸들러의 쓰기와 같은 트랜잭션).
+    lease 가 끝나 다른 실행기가 다시 가져간 작업이 있으면 False -> 호출자가 rollback 한다
+    """
+    jobs = Job.__table__
+    result = db.execute(
+        delete(jobs).where(
+            tuple_(jobs.c.id, jobs.c.attempts).in_([(j.id, j.attempts) for j in claimed]),
+            jobs.c.status == JobStatus.running,
+        )
+    )
+    return result.rowcount == len(claimed)
+
+
+def retry_delay(attempts: int) -> float:
+    """
+    지수 backoff (JOB_RETRY_BASE_SECONDS * 2^(attempts-1), 최대 JOB_RETRY_MAX_SECONDS) + jitter
+    """
+    delay = min(settings.JOB_RETRY_BASE_SECONDS * 2 ** (attempts - 1), settings.JOB_RETRY_MAX_SECONDS)
+    return delay * random.uniform(0.5, 1.0)
+
+
+def fail_jobs(db: Session, claimed: Sequence[ClaimedJob], error: str, *, retry: bool = True) -> Tuple[int, int]:
+    """
+    실패한 작업: 시도가 남았으면 backoff 뒤로 다시 queued, 아니면(또는 retry=False) failed. (재시도 수, 포기 수)
+    """
+    jobs = Job.__table__
+    now = datetime.utcnow()
+    retried = gave_up = 0
+    for j in claimed:
+        values = {"last_error": error[:2000]}
+        if retry and j.attempts < j.max_attempts:
+            values.update(status=JobStatus.queued, run_at=now + timedelta(seconds=retry_delay(j.attempts)))
+            retried += 1
+        else:
+            values.update(status=JobStatus.failed)
+            gave_up += 1
+        db.execute(
+            update(jobs)
+            .where(jobs.c.id == j.id, jobs.c.attempts == j.attempts, jobs.c.status == JobStatus.running)
+            .values(**values)
+        )
+    return retried, gave_up
+
+
+def job_stats(db: Session):
+    """
+    (queue, status, 개수, 가장 오래된 run_at)  - cli job-stats
+    """
+    jobs = Job.__table__
+    return db.execute(
+        select(jobs.c.queue, jobs.c.status, func.count(), func.min(jobs.c.run_at))
+        .group_by(jobs.c.queue, jobs.c.status)
+        .order_by(jobs.c.queue, jobs.c.status)
+    ).all()
+
+
+def requeue_failed(db: Session, queue: Optional[str] = None) -> int:
+    """
+    failed 작업을 시도 횟수를 0으로 돌려 다시 queued 로 (원인을 고친 뒤 수동 재실행)
+    """
+    jobs = Job.__table__
+    stmt = (
+        update(jobs)
+        .where(jobs.c.status == JobStatus.failed)
+        .values(status=JobStatus.queued, attempts=0, run_at=datetime.utcnow())
+    )
+    if queue is not None:
+        stmt = stmt.where(jobs.c.queue == queue)
+    return db.execute(stmt).rowcount
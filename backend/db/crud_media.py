@@ -0,0 +1,133 @@
+# db/crud_media.py
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+
+from core.storage import media_key, storage
+from db.models import MediaAsset, MediaAssetStatus
+
+THUMB = "thumb.jpg"
+MEDIUM = "medium.jpg"
+ORIGINAL = "original"
+
+
+def asset_url(sha256: str, name: str) -> str:
+    return storage.url(media_key(sha256, name))
+
+
+def get_asset(db: Session, asset_id: int):
+    assets = MediaAsset.__table__
+    return db.execute(select(assets).where(assets.c.id == asset_id)).first()
+
+
+def get_asset_by_sha(db: Session, sha256: str):
+    assets = MediaAsset.__table__
+    return db.execute(select(assets).where(assets.c.sha256 == sha256)).first()
+
+
+def create_asset(
+    db: Session,
+    *,
+    sha256: str,
+    uploader_id: int,
+    content_type: str,
+    byte_size: int,
+    width: int,
+    height: int,
+):
+    """
+    INSERT IGNORE (uq_media_asset_sha256) 후 sha256 으로 다시 읽는다
+    같은 파일이 동시에 올라와도 행은 하나. 변환에 실패했던 행이면 processing 으로 되돌린다
+    """
+    assets = MediaAsset.__table__
+    db.execute(
+        insert(assets).prefix_with("IGNORE").values(
+            sha256=sha256,
+            uploader_id=uploader_id,
+            content_type=content_type,
+            byte_size=byte_size,
+            width=width,
+            height=height,
+            status=MediaAssetStatus.processing,
+            created_at=datetime.utcnow(),
+        )
+    )
+    db.execute(
+        update(assets)
+        .where(assets.c.sha256 == sha256, assets.c.status == MediaAssetStatus.failed)
+        .values(status=MediaAssetStatus.processing, processed_at=None)
+    )
+    return get_asset_by_sha(db, sha256)
+
+
+def mark_processed(db: Session, asset_id: int, status: MediaAssetStatus):
+    assets = MediaAsset.__table__
+    db.execute(
+        update(assets)
+        .where(assets.c.id == asset_id)
+        .values(status=status, processed_at=datetime.utcnow())
+    )
+
+
+def stale_processing_assets(db: Session, created_before: datetime, limit: int = 100):
+    """
+    변환 도중 프로세스가 죽어서 processing 으로 남은 것 (cli process-media)
+    """
+    assets = MediaAsset.__table__
+    return db.execute(
+        select(assets.c.id, assets.c.sha256, assets.c.content_type)
+        .where(assets.c.status == MediaAssetStatus.processing, assets.c.created_at < created_before)
+        .order_by(assets.c.id)
+        .limit(limit)
+    ).all()
+
+
+# =========================
+# 상품/게시글 이미지 행
+# =========================
+
+def build_image_rows(db: Session, images: Sequence[Tuple[Optional[int], Optional[str], int]]) -> List[dict]:
+    """
+    (asset_id, image_url, sort_order) 목록 -> ProductImage/CommunityPostImage 컬럼 dict
+    업로드 이미지(asset_id)는 IN 쿼리 한 번으로 확인하고 medium/thumb URL 을 채운다.
+    변환이 아직 안 끝났어도 URL 은 내용 해시로 정해져 있으므로 그대로 쓴다.
+    없는 asset, 변환에 실패한 asset 이면 ValueError
+    """
+    asset_ids = {asset_id for asset_id, _, _ in images if asset_id is not None}
+    found: Dict[int, tuple] = {}
+    if asset_ids:
+        assets = MediaAsset.__table__
+        found = {
+            row.id: row
+            for row in db.execute(
+                select(assets.c.id, assets.c.sha256, assets.c.status).where(assets.c.id.in_(asset_ids))
+            )
+        }
+
+    rows = []
+    for asset_id, image_url, sort_order in images:
+        if asset_id is None:
+            rows.append({"asset_id": None, "image_url": image_url, "thumbnail_url": None, "sort_order": sort_order})
+            continue
+        asset = found.get(asset_id)
+        if asset is None or asset.status == MediaAssetStatus.failed:
+            raise ValueError("invalid_media_asset")
+        rows.append({
+            "asset_id": asset_id,
+            "image_url": asset_url(asset.sha256, MEDIUM),
+            "thumbnail_url": asset_url(asset.sha256, THUMB),
+            "sort_order": sort_order,
+        })
+    return rows
+
+
+def cover_thumbnail(rows: List[dict]) -> Optional[str]:
+    """
+    목록용 대표 이미지: sort_order 가 가장 앞인 이미지의 thumb (외부 URL 이미지면 그 URL)
+    """
+    if not rows:
+        return None
+    first = min(rows, key=lambda r: r["sort_order"])
+    return first["thumbnail_url"] or first["image_url"]
@@ -0,0 +1,215 @@
+# db/crud_notification.py
+"""
+답글/좋아요 알림
+
+write path : like_post / create_comment 가 같은 트랜잭션에 "notification.event" 작업만 싣는다
+             (받는 사람 조회, 알림 INSERT, 안 읽은 수 갱신은 요청 밖)
+작업 핸들러: 한 번에 꺼낸 이벤트를 (받는 사람, 묶음) 별로 합쳐서 알림 행을 multi-row INSERT 한 번으로 쓴다.
+             같은 묶음의 안 읽은 알림이 있으면 지우고 새 행으로 바꾼다 (목록 맨 위로).
+             actor_count 는 서로 다른 사람 수: 묶음 행의 actor_ids 에 없는 사람만 더한다
+
+    notif:unread:{user_id}   안 읽은 알림 수 (core/cache.py, TTL). 뱃지 조회는 이 키 하나만 읽는다
+                             새 묶음이 생기면 +n, 읽음 처리하면 -n (commit 뒤). 키가 없을 때만 DB COUNT 로 채운다
+"""
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, select, tuple_, update
+from sqlalchemy.orm import Session
+
+from core.cache import cache
+from core.config import settings
+from core.jobs import job
+from db import models
+from db.crud_job import enqueue
+from db.session import on_commit
+
+KIND_POST_LIKE = "post_like"
+KIND_COMMENT_REPLY = "comment_reply"
+
+EVENT_JOB = "notification.event"
+
+
+def unread_key(user_id: int) -> str:
+    return f"notif:unread:{user_id}"
+
+
+def _group_key(kind: str, target_id: int) -> str:
+    return f"{kind}:{target_id}"
+
+
+# =========================
+# 이벤트 (요청 트랜잭션 안)
+# =========================
+
+def post_liked(db: Session, post_id: int, actor_id: int):
+    enqueue(db, EVENT_JOB, {"kind": KIND_POST_LIKE, "target_id": post_id, "post_id": post_id, "actor_id": actor_id})
+
+
+def comment_replied(db: Session, parent_id: int, post_id: int, actor_id: int):
+    enqueue(db, EVENT_JOB, {"kind": KIND_COMMENT_REPLY, "target_id": parent_id, "post_id": post_id, "actor_id": actor_id})
+
+
+# =========================
+# 묶어서 쓰기 (jobs 핸들러)
+# =========================
+
+def _recipients(db: Session, events: List[dict]) -> Dict[Tuple[str, int], int]:
+    """
+    (kind, target_id) -> 받는 사람. 게시글/댓글 작성자를 종류별 IN 쿼리 한 번씩
+    """
+    post_ids = {e["target_id"] for e in events if e["kind"] == KIND_POST_LIKE}
+    comment_ids = {e["target_id"] for e in events if e["kind"] == KIND_COMMENT_REPLY}
+    owners: Dict[Tuple[str, int], int] = {}
+    if post_ids:
+        posts = models.CommunityPost.__table__
+        for post_id, user_id in db.execute(
+            select(posts.c.id, posts.c.user_id).where(posts.c.id.in_(sorted(post_ids)))
+        ):
+            owners[(KIND_POST_LIKE, post_id)] = user_id
+    if comment_ids:
+        comments = models.CommunityComment.__table__
+        for comment_id, user_id in db.execute(
+            select(comments.c.id, comments.c.user_id).where(comments.c.id.in_(sorted(comment_ids)))
+        ):
+            owners[(KIND_COMMENT_REPLY, comment_id)] = user_id
+    return owners
+
+
+def _parse_actor_ids(row) -> List[int]:
+    if row.actor_ids:
+        return [int(i) for i in row.actor_ids.split(",")]
+    return [row.actor_id] if row.actor_id is not None else []
+
+
+@job(EVENT_JOB, queue="notifications", batch=True)
+def deliver_notifications(db: Session, events: List[dict]):
+    owners = _recipients(db, events)
+
+    # (받는 사람, group_key) -> 합칠 이벤트 (자기 글/댓글에 한 것, 지워진 대상은 버린다)
+    groups: Dict[Tuple[int, str], List[dict]] = defaultdict(list)
+    for event in events:
+        user_id = owners.get((event["kind"], event["target_id"]))
+        if user_id is None or user_id == event["actor_id"]:
+            continue
+        groups[(user_id, _group_key(event["kind"], event["target_id"]))].append(event)
+    if not groups:
+        return
+
+    notifications = models.Notification.__table__
+    existing = {
+        (row.user_id, row.group_key): row
+        for row in db.execute(
+            select(
+                notifications.c.id, notifications.c.user_id, notifications.c.group_key,
+                notifications.c.actor_id, notifications.c.actor_count, notifications.c.actor_ids,
+            )
+            .where(
+                tuple_(notifications.c.user_id, notifications.c.group_key).in_(list(groups)),
+                notifications.c.is_read == 0,
+            )
+            .with_for_update()
+        )
+    }
+    if existing:
+        db.execute(delete(notifications).where(notifications.c.id.in_([row.id for row in existing.values()])))
+
+    now = datetime.utcnow()
+    rows = []
+    new_unread: Dict[int, int] = defaultdict(int)
+    for (user_id, group_key), group in groups.items():
+        previous = existing.get((user_id, group_key))
+        if previous is None:
+            new_unread[user_id] += 1
+        # 사람 기준: 이미 센 행위자(좋아요 취소 후 다시 누름, 답글 여러 개)는 다시 세지 않는다
+        known = _parse_actor_ids(previous) if previous else []
+        seen = set(known)
+        new_actors = []
+        for event in group:
+            if event["actor_id"] not in seen:
+                seen.add(event["actor_id"])
+                new_actors.append(event["actor_id"])
+        last = group[-1]
+        rows.append({
+            "user_id": user_id,
+            "kind": last["kind"],
+            "group_key": group_key,
+            "target_id": last["target_id"],
+            "post_id": last["post_id"],
+            "actor_id": last["actor_id"],
+            "actor_count": (previous.actor_count if previous else 0) + len(new_actors),
+            "actor_ids": ",".join(map(str, (known + new_actors)[-settings.NOTIFICATION_MAX_TRACKED_ACTORS:])),
+            "is_read": 0,
+            "created_at": now,
+        })
+    db.execute(insert(notifications).values(rows))
+
+    def bump_unread():
+        for user_id, count in new_unread.items():
+            cache.incr(unread_key(user_id), count)
+
+    on_commit(db, bump_unread)
+
+
+# =========================
+# 읽기
+# =========================
+
+def list_notifications(db: Session, user_id: int, size: int, after_id: Optional[int] = None):
+    """
+    최신순 keyset (ix_notifications_user). 행위자 닉네임은 JOIN 으로 같이
+    """
+    notifications = models.Notification.__table__
+    users = models.User.__table__
+    stmt = (
+        select(
+            notifications.c.id, notifications.c.kind, notifications.c.target_id, notifications.c.post_id,
+            notifications.c.actor_id, users.c.nickname.label("actor_nickname"), notifications.c.actor_count,
+            notifications.c.is_read, notifications.c.created_at,
+        )
+        .outerjoin(users, users.c.id == notifications.c.actor_id)
+        .where(notifications.c.user_id == user_id)
+        .order_by(notifications.c.id.desc())
+        .limit(size)
+    )
+    if after_id is not None:
+        stmt = stmt.where(notifications.c.id < after_id)
+    return db.execute(stmt).all()
+
+
+def unread_count(db: Session, user_id: int) -> int:
+    """
+    캐시 키 하나. 없을 때만 COUNT (ix_notifications_user_unread) 로 채운다
+    채우는 사이에 들어온 증감은 놓칠 수 있어 TTL 로 주기적으로 다시 센다
+    """
+    raw = cache.get(unread_key(user_id))
+    if raw is not None:
+        return max(int(raw), 0)
+    notifications = models.Notification.__table__
+    count = db.execute(
+        select(func.count()).select_from(notifications)
+        .where(notifications.c.user_id == user_id, notifications.c.is_read == 0)
+    ).scalar_one()
+    cache.set(unread_key(user_id), str(count), settings.NOTIFICATION_UNREAD_TTL_SECONDS)
+    return count
+
+
+def mark_read(db: Session, user_id: int, ids: Optional[List[int]] = None) -> int:
+    """
+    ids 가 None 이면 전부 읽음. 실제로 바뀐 행 수만큼 안 읽은 수를 줄인다 (commit 뒤)
+    """
+    notifications = models.Notification.__table__
+    stmt = (
+        update(notifications)
+        .where(notifications.c.user_id == user_id, notifications.c.is_read == 0)
+        .values(is_read=1)
+    )
+    if ids is not None:
+        if not ids:
+            return 0
+        stmt = stmt.where(notifications.c.id.in_(ids))
+    changed = db.execute(stmt).rowcount
+    if changed:
+        on_commit(db, lambda: cache.incr(unread_key(user_id), -changed))
+    return changed
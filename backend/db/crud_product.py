@@ -1,10 +1,25 @@
 # db/crud_product.py
+from typing import Collection, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, delete, func, insert, or_, select
 from sqlalchemy.orm import Session
-from db.models import Product, ProductImage, ProductLike
+from core.events import KIND_PRODUCT
+from db.crud_counter import add_like_count
+from db.crud_media import build_image_rows, cover_thumbnail
+from db.models import ChatRoom, Product, ProductCondition, ProductImage, ProductLike, ProductStatus, ProductTradeType
+from schemas.dto import ProductCard, ProductDetail, ProductImageItem, ProductItem
 from schemas.product import ProductCreate, ProductUpdate
 
 
+def _image_rows(db: Session, payload: ProductCreate) -> List[dict]:
+    return build_image_rows(db, [(img.asset_id, img.image_url, img.sort_order) for img in payload.images])
+
+
 def create_product(db: Session, user_id: int, payload: ProductCreate):
+    """
+    업로드 이미지(asset_id)가 없거나 변환 실패한 것이면 ValueError
+    """
+    image_rows = _image_rows(db, payload)
     product = Product(
         seller_id=user_id,
         region_id=payload.region_id,
@@ -16,78 +31,331 @@ def create_product(db: Session, user_id: int, payload: ProductCreate):
         trade_type=payload.trade_type,
         lat=payload.lat,
         lng=payload.lng,
+        thumbnail_url=cover_thumbnail(image_rows),
     )
+    # 이미지 생성 (상품 INSERT와 같은 flush에서 저장)
+    product.images = [ProductImage(**row) for row in image_rows]
     db.add(product)
-    db.commit()
-    db.refresh(product)
-
-    # 이미지 생성
-    for img in payload.images:
-        image = ProductImage(
-            product_id=product.id,
-            image_url=img.image_url,
-            sort_order=img.sort_order
-        )
-        db.add(image)
-
-    db.commit()
+    db.flush()  # product.id 생성용
     return product
 
 
+def bulk_create_products(db: Session, user_id: int, payloads: List[ProductCreate]) -> int:
+    """
+    상품/이미지를 저장하고 만든 상품 수 반환. commit은 호출자가 한다 (대량 등록은 청크 단위로 commit)
+    - 이미지 없는 상품: multi-row INSERT 한 번
+    - 이미지 있는 상품: 상품은 한 행씩 INSERT (lastrowid 로 id 를 받는다), 이미지는 모아서 multi-row INSERT 한 번
+    multi-row INSERT 의 id 가 lastrowid 부터 연속이라고 가정하지 않는다
+    (innodb_autoinc_lock_mode=2 의 동시 INSERT, auto_increment_increment > 1 이면 연속이 아니다)
+    """
+    # 청크 전체의 asset_id 를 IN 쿼리 한 번으로 확인
+    flat = build_image_rows(db, [
+        (img.asset_id, img.image_url, img.sort_order) for p in payloads for img in p.images
+    ])
+    images_per_product, start = [], 0
+    for p in payloads:
+        images_per_product.append(flat[start:start + len(p.images)])
+        start += len(p.images)
+
+    def product_row(p: ProductCreate, rows: List[dict]) -> dict:
+        return {
+            "seller_id": user_id,
+            "region_id": p.region_id,
+            "category_id": p.category_id,
+            "title": p.title,
+            "price": p.price,
+            "description": p.description,
+            "condition": p.condition,
+            "trade_type": p.trade_type,
+            "lat": p.lat,
+            "lng": p.lng,
+            "thumbnail_url": cover_thumbnail(rows),
+        }
+
+    products = Product.__table__
+    plain = [product_row(p, rows) for p, rows in zip(payloads, images_per_product) if not rows]
+    if plain:
+        db.execute(insert(products).values(plain))
+
+    image_rows = []
+    for p, rows in zip(payloads, images_per_product):
+        if not rows:
+            continue
+        product_id = db.execute(insert(products).values(product_row(p, rows))).inserted_primary_key[0]
+        image_rows.extend({"product_id": product_id, **row} for row in rows)
+    if image_rows:
+        db.execute(insert(ProductImage.__table__).values(image_rows))
+
+    return len(payloads)
+
+
 def update_product(db: Session, product: Product, payload: ProductUpdate):
     for field, value in payload.dict(exclude_none=True).items():
         setattr(product, field, value)
-
-    db.commit()
-    db.refresh(product)
     return product
 
 
 def delete_product(db: Session, product: Product):
     db.delete(product)
-    db.commit()
 
 
 def get_product(db: Session, product_id: int):
     return db.query(Product).filter(Product.id == product_id).first()
 
 
-def get_products_by_region(db: Session, region_id: int, limit: int = 50):
+def _item_columns():
+    # schemas.dto.ProductItem 필드 순서
+    products = Product.__table__
     return (
-        db.query(Product)
-        .filter(Product.region_id == region_id)
-        .order_by(Product.id.desc())
+        products.c.id, products.c.title, products.c.price, products.c.description,
+        products.c.status, func.coalesce(products.c.like_count, 0), products.c.seller_id, products.c.region_id,
+        products.c.thumbnail_url,
+    )
+
+
+def get_products_by_region(db: Session, region_id: int, limit: int = 50) -> List[ProductItem]:
+    """
+    (deprecated) browse_products 로 대체. 숨김/삭제 상품은 빼고 최신 limit 개
+    """
+    products = Product.__table__
+    rows = db.execute(
+        select(*_item_columns())
+        .where(
+            products.c.region_id == region_id,
+            products.c.status != ProductStatus.hidden,
+            products.c.deleted_at.is_(None),
+        )
+        .order_by(products.c.id.desc())
         .limit(limit)
-        .all()
     )
+    return [ProductItem(*row) for row in rows]
+
+
+# =========================
+# 상품 목록 (필터 + keyset)
+# =========================
+
+# sort -> (정렬 키 컬럼 이름, 내림차순 여부). id 가 같은 방향으로 tie-break
+BROWSE_SORTS = {
+    "recent": ("id", True),
+    "price_asc": ("price", False),
+    "price_desc": ("price", True),
+    "likes": ("like_count", True),
+}
 
 
-def get_products_by_user(db: Session, user_id: int):
+def _card_columns(products):
+    # schemas.dto.ProductCard 필드 순서
     return (
-        db.query(Product)
-        .filter(Product.seller_id == user_id)
-        .order_by(Product.id.desc())
-        .all()
+        products.c.id, products.c.title, products.c.price, products.c.status,
+        products.c.condition, products.c.trade_type, func.coalesce(products.c.like_count, 0),
+        products.c.region_id, products.c.thumbnail_url, products.c.created_at,
+    )
+
+
+def browse_products(
+    db: Session,
+    *,
+    region_id: int,
+    size: int,
+    status: ProductStatus = ProductStatus.selling,
+    sort: str = "recent",
+    category_ids: Optional[Collection[int]] = None,
+    condition: Optional[ProductCondition] = None,
+    trade_type: Optional[ProductTradeType] = None,
+    min_price: Optional[int] = None,
+    max_price: Optional[int] = None,
+    after: Optional[tuple] = None,
+) -> List[ProductCard]:
+    """
+    category_ids: 카테고리와 그 하위 카테고리 id (crud_category.category_tree().expand)
+    after: 이전 페이지 마지막 상품의 keyset 커서 (browse_sort_key). OFFSET/COUNT 없음
+
+    deferred join: 안쪽 select 는 ix_products_browse_* 인덱스만 읽어 한 페이지의 id 를 고르고
+    (필터/정렬/커서 컬럼이 모두 인덱스에 있다), 바깥 select 가 그 size 개만 PK 로 읽어 카드 컬럼을 채운다
+    """
+    products = Product.__table__
+    key_name, descending = BROWSE_SORTS[sort]
+    key = products.c[key_name]
+
+    conditions = [
+        products.c.region_id == region_id,
+        products.c.status == status,
+        products.c.deleted_at.is_(None),
+    ]
+    if category_ids:
+        conditions.append(products.c.category_id.in_(sorted(category_ids)))
+    if condition is not None:
+        conditions.append(products.c.condition == condition)
+    if trade_type is not None:
+        conditions.append(products.c.trade_type == trade_type)
+    if min_price is not None:
+        conditions.append(products.c.price >= min_price)
+    if max_price is not None:
+        conditions.append(products.c.price <= max_price)
+
+    if after is not None:
+        if key_name == "id":
+            (after_id,) = after
+            conditions.append(products.c.id < after_id)
+        else:
+            after_value, after_id = after
+            if descending:
+                conditions.append(or_(key < after_value, and_(key == after_value, products.c.id < after_id)))
+            else:
+                conditions.append(or_(key > after_value, and_(key == after_value, products.c.id > after_id)))
+
+    def ordering(table):
+        cols = [table.c[key_name]] if key_name != "id" else []
+        cols.append(table.c.id)
+        return [c.desc() if descending else c.asc() for c in cols]
+
+    page = (
+        select(products.c.id, *([key] if key_name != "id" else []))
+        .where(*conditions)
+        .order_by(*ordering(products))
+        .limit(size)
+        .subquery("page")
     )
+    rows = db.execute(
+        select(*_card_columns(products))
+        .join_from(page, products, products.c.id == page.c.id)
+        .order_by(*ordering(page))
+    )
+    return [ProductCard(*row) for row in rows]
+
 
+def browse_sort_key(card: ProductCard, sort: str) -> Tuple:
+    """
+    browse_products(after=...)에 넘길 keyset 커서 값 (like_count 는 shard 보정 전 값이어야 한다)
+    """
+    key_name, _ = BROWSE_SORTS[sort]
+    if key_name == "id":
+        return (card.id,)
+    return (getattr(card, key_name), card.id)
 
-def toggle_like(db: Session, user_id: int, product_id: int):
-    like = (
-        db.query(ProductLike)
-        .filter(ProductLike.user_id == user_id, ProductLike.product_id == product_id)
-        .first()
+
+def get_products_by_user(db: Session, user_id: int) -> List[ProductItem]:
+    products = Product.__table__
+    rows = db.execute(
+        select(*_item_columns())
+        .where(products.c.seller_id == user_id)
+        .order_by(products.c.id.desc())
     )
+    return [ProductItem(*row) for row in rows]
 
-    if like:
-        db.delete(like)
-        db.commit()
-        return False
 
-    new_like = ProductLike(user_id=user_id, product_id=product_id)
-    db.add(new_like)
+def get_product_detail(db: Session, product_id: int) -> Optional[ProductDetail]:
+    row = db.execute(select(*_item_columns()).where(Product.__table__.c.id == product_id)).first()
+    if row is None:
+        return None
+    images = ProductImage.__table__
+    detail = ProductDetail(*row)
+    detail.images = [
+        ProductImageItem(image_url, thumbnail_url, sort_order or 0)
+        for image_url, thumbnail_url, sort_order in db.execute(
+            select(images.c.image_url, images.c.thumbnail_url, images.c.sort_order)
+            .where(images.c.product_id == product_id)
+            .order_by(images.c.sort_order, images.c.id)
+        )
+    ]
+    return detail
 
-    product = db.query(Product).filter(Product.id == product_id).first()
-    product.like_count += 1
-    db.commit()
 
+def get_product_details(db: Session, product_ids: List[int]) -> Dict[int, ProductDetail]:
+    """
+    batchGet (db.loader): 상품 IN 쿼리 한 번 + 이미지 IN 쿼리 한 번. 삭제/숨김 상품은 빠진다
+    """
+    products = Product.__table__
+    details = {
+        row[0]: ProductDetail(*row)
+        for row in db.execute(
+            select(*_item_columns()).where(
+                products.c.id.in_(product_ids),
+                products.c.status != ProductStatus.hidden,
+                products.c.deleted_at.is_(None),
+            )
+        )
+    }
+    if details:
+        images = ProductImage.__table__
+        for product_id, image_url, thumbnail_url, sort_order in db.execute(
+            select(images.c.product_id, images.c.image_url, images.c.thumbnail_url, images.c.sort_order)
+            .where(images.c.product_id.in_(list(details)))
+            .order_by(images.c.product_id, images.c.sort_order, images.c.id)
+        ):
+            details[product_id].images.append(ProductImageItem(image_url, thumbnail_url, sort_order or 0))
+    return details
+
+
+def like_product(db: Session, user_id: int, product_id: int) -> bool:
+    """
+    INSERT IGNORE 한 문장 (uq_product_like). 실제로 추가됐을 때만 like_count +1
+    """
+    likes = ProductLike.__table__
+    result = db.execute(
+        insert(likes).prefix_with("IGNORE").values(user_id=user_id, product_id=product_id)
+    )
+    if result.rowcount != 1:
+        return False
+    add_like_count(db, KIND_PRODUCT, product_id, 1)
     return True
+
+
+def unlike_product(db: Session, user_id: int, product_id: int) -> bool:
+    """
+    DELETE ... WHERE 한 문장. 지워진 행이 있을 때만 like_count -1
+    """
+    likes = ProductLike.__table__
+    result = db.execute(
+        delete(likes).where(likes.c.user_id == user_id, likes.c.product_id == product_id)
+    )
+    if result.rowcount == 0:
+        return False
+    add_like_count(db, KIND_PRODUCT, product_id, -1)
+    return True
+
+
+def liked_product_ids(db: Session, user_id: int, product_ids: List[int]) -> Set[int]:
+    """
+    목록 한 페이지의 liked_by_me: IN 쿼리 한 번
+    """
+    if not product_ids:
+        return set()
+    likes = ProductLike.__table__
+    return set(
+        db.execute(
+            select(likes.c.product_id).where(
+                likes.c.user_id == user_id,
+                likes.c.product_id.in_(product_ids),
+            )
+        ).scalars()
+    )
+
+
+def chatted_product_ids(db: Session, user_id: int, product_ids: List[int]) -> Set[int]:
+    """
+    목록 한 페이지의 chatted: 내가 구매자로 채팅방을 연 상품 (IN 쿼리 한 번)
+    """
+    if not product_ids:
+        return set()
+    rooms = ChatRoom.__table__
+    return set(
+        db.execute(
+            select(rooms.c.product_id).where(
+                rooms.c.buyer_id == user_id,
+                rooms.c.product_id.in_(product_ids),
+            )
+        ).scalars()
+    )
+
+
+def get_product_counters(db: Session, product_ids: List[int]):
+    """
+    실시간 카운터 구독 시작 시점 스냅샷
+    """
+    products = Product.__table__
+    return db.execute(
+        select(products.c.id, products.c.like_count, products.c.view_count)
+        .where(products.c.id.in_(product_ids))
+    ).all()
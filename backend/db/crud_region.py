@@ -17,8 +17,7 @@ def create_region(db: Session, data: RegionCreate) -> models.Region:
         radius_km=data.radius_km,
     )
     db.add(region)
-    db.commit()
-    db.refresh(region)
+    db.flush()  # region.id 생성용
     return region
 
 
@@ -0,0 +1,53 @@
+# db/loader.py
+"""
+요청 단위 batch loader (세션 하나 = 요청 하나, db.info 에 붙는다)
+
+    products = request_loader(db, "products", crud_product.get_product_details)
+    found = products.load_many([3, 1, 3])    # 처음 보는 id 만 fetch(db, ids) 한 번 (IN 쿼리)
+
+같은 요청 안에서 여러 번 불러도 이미 읽은 id 는 (없던 id 포함) 다시 읽지 않는다.
+값은 요청이 끝날 때까지 그대로 쓰므로 읽기 전용 조회에만 쓴다.
+"""
+from typing import Callable, Dict, Generic, List, Optional, Sequence, TypeVar
+
+from sqlalchemy.orm import Session
+
+T = TypeVar("T")
+
+# fetch(db, 중복 없는 ids) -> {id: 값}. 없는 id 는 빠진다
+Fetch = Callable[[Session, List[int]], Dict[int, T]]
+
+
+class BatchLoader(Generic[T]):
+    def __init__(self, db: Session, fetch: Fetch):
+        self.db = db
+        self.fetch = fetch
+        self._memo: Dict[int, Optional[T]] = {}
+
+    def load_many(self, ids: Sequence[int]) -> Dict[int, T]:
+        missing = [i for i in dict.fromkeys(ids) if i not in self._memo]
+        if missing:
+            found = self.fetch(self.db, missing)
+            for i in missing:
+                self._memo[i] = found.get(i)
+        return {i: self._memo[i] for i in ids if self._memo[i] is not None}
+
+    def load(self, id: int) -> Optional[T]:
+        return self.load_many([id]).get(id)
+
+
+def request_loader(db: Session, name: str, fetch: Fetch) -> BatchLoader:
+    loaders = db.info.setdefault("loaders", {})
+    if name not in loaders:
+        loaders[name] = BatchLoader(db, fetch)
+    return loaders[name]
+
+
+def batch_result(ids: Sequence[int], found: Dict[int, T]) -> dict:
+    """
+    batchGet 응답: items 는 요청한 id 순서 그대로 (없는 id 자리는 None), missing 은 없는 id (중복 제거)
+    """
+    return {
+        "items": [found.get(i) for i in ids],
+        "missing": [i for i in dict.fromkeys(ids) if i not in found],
+    }
@@ -2,8 +2,8 @@ from datetime import datetime
 import enum
 
 from sqlalchemy import (
-    Column, BigInteger, Integer, String, Text, DateTime, ForeignKey, Float,
-    Enum as SAEnum, UniqueConstraint
+    Column, BigInteger, Integer, String, Text, DateTime, ForeignKey, Float, Double,
+    Enum as SAEnum, UniqueConstraint, Index
 )
 from sqlalchemy.dialects.mysql import TINYINT
 from sqlalchemy.orm import relationship
@@ -37,6 +37,16 @@ class CategoryType(enum.Enum):
     community = "community"
     both = "both"
 
+class MediaAssetStatus(enum.Enum):
+    processing = "processing"   # 원본 저장 완료, thumb/medium 변환 중
+    ready = "ready"
+    failed = "failed"
+
+class JobStatus(enum.Enum):
+    queued = "queued"     # run_at 이후 실행 가능
+    running = "running"   # 실행기가 가져감. run_at = lease 만료 시각 (지나면 다시 꺼낼 수 있다)
+    failed = "failed"     # 재시도를 다 써서 멈춤 (성공한 작업은 행을 지운다)
+
 
 # =====================================
 # Region
@@ -68,6 +78,11 @@ class Region(Base):
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        UniqueConstraint("nickname", name="uq_users_nickname"),
+        # 증분 export (created_at >= ?)
+        Index("ix_users_created", "created_at", "id"),
+    )
 
     id = Column(BigInteger, primary_key=True)
     email = Column(String(255), unique=True, nullable=False)
@@ -83,6 +98,8 @@ class User(Base):
     suspended_until = Column(DateTime, nullable=True)
     suspended_reason = Column(String(255), nullable=True)
     deleted_at = Column(DateTime, nullable=True)
+    # 올리면 이전에 발급한 access token 이 모두 무효 (토큰의 ep 클레임과 비교)
+    auth_epoch = Column(Integer, nullable=False, default=0, server_default="0")
 
     home_region_id = Column(BigInteger, ForeignKey("regions.id"))
     home_lat = Column(Float)
@@ -150,6 +167,29 @@ class Category(Base):
 
 class Product(Base):
     __tablename__ = "products"
+    __table_args__ = (
+        # 상품 목록(GET /api/products): WHERE region_id=? [AND category_id IN (...)] AND status=? AND deleted_at IS NULL
+        # ORDER BY <정렬 키> DESC|ASC, id. 정렬 키 뒤에 필터 컬럼(price/condition/trade_type)을 붙여
+        # 페이지 id 고르기를 인덱스만으로 끝낸다 (나머지 카드 컬럼은 고른 id 로 PK 조회)
+        # 하위 카테고리가 많은 상위 카테고리(IN 목록이 긴 경우)는 category_id 를 끝에 둔 앞의 세 인덱스를
+        # 정렬 순서대로 읽으면서 거르는 편이 싸다. 잎 카테고리는 _cat_ 인덱스
+        Index("ix_products_browse_recent",
+              "region_id", "status", "deleted_at", "id", "price", "condition", "trade_type", "category_id"),
+        Index("ix_products_browse_price",
+              "region_id", "status", "deleted_at", "price", "id", "condition", "trade_type", "category_id"),
+        Index("ix_products_browse_likes",
+              "region_id", "status", "deleted_at", "like_count", "id", "price", "condition", "trade_type",
+              "category_id"),
+        Index("ix_products_browse_cat_recent",
+              "region_id", "category_id", "status", "deleted_at", "id", "price", "condition", "trade_type"),
+        Index("ix_products_browse_cat_price",
+              "region_id", "category_id", "status", "deleted_at", "price", "id", "condition", "trade_type"),
+        Index("ix_products_browse_cat_likes",
+              "region_id", "category_id", "status", "deleted_at", "like_count", "id", "price", "condition",
+              "trade_type"),
+        # 증분 export (updated_at >= ?)
+        Index("ix_products_updated", "updated_at", "id"),
+    )
 
     id = Column(BigInteger, primary_key=True)
     seller_id = Column(BigInteger, ForeignKey("users.id"), nullable=False)
@@ -170,8 +210,12 @@ class Product(Base):
     lat = Column(Float)
     lng = Column(Float)
 
+    # 목록용 대표 이미지(첫 번째 이미지의 thumb). 이미지 저장 때 같이 쓴다
+    thumbnail_url = Column(String(500))
+
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime)
+    # 증분 export 기준. 만들 때도 채워서 updated_at 하나로 거른다
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     deleted_at = Column(DateTime)
 
     seller = relationship("User", back_populates="products")
@@ -188,7 +232,10 @@ class ProductImage(Base):
 
     id = Column(BigInteger, primary_key=True)
     product_id = Column(BigInteger, ForeignKey("products.id"))
+    # 업로드 이미지면 asset_id + medium(image_url)/thumb URL, 외부 URL이면 image_url만
+    asset_id = Column(BigInteger, ForeignKey("media_assets.id"))
     image_url = Column(String(500))
+    thumbnail_url = Column(String(500))
     sort_order = Column(Integer, default=0)
 
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -198,6 +245,9 @@ class ProductImage(Base):
 
 class ProductLike(Base):
     __tablename__ = "product_likes"
+    __table_args__ = (
+        UniqueConstraint("user_id", "product_id", name="uq_product_like"),
+    )
 
     id = Column(BigInteger, primary_key=True)
     user_id = Column(BigInteger, ForeignKey("users.id"))
@@ -215,6 +265,13 @@ class ProductLike(Base):
 
 class CommunityPost(Base):
     __tablename__ = "community_posts"
+    __table_args__ = (
+        # 인기순 피드: WHERE region_id=? AND is_hidden=0 ORDER BY hot_score DESC, id DESC
+        Index("ix_community_posts_region_hot", "region_id", "is_hidden", "hot_score", "id"),
+        Index("ix_community_posts_hot", "is_hidden", "hot_score", "id"),
+        # 증분 export (updated_at >= ?)
+        Index("ix_community_posts_updated", "updated_at", "id"),
+    )
 
     id = Column(BigInteger, primary_key=True)
     user_id = Column(BigInteger, ForeignKey("users.id"))
@@ -228,9 +285,17 @@ class CommunityPost(Base):
     like_count = Column(Integer, default=0)
     comment_count = Column(Integer, default=0)
 
+    # 인기순 정렬용 점수 (core/ranking.py). 카운터가 바뀔 때 같이 갱신
+    hot_score = Column(Double, default=0)
+
     is_hidden = Column(TINYINT(1), default=0)
 
+    # 목록용 대표 이미지(첫 번째 이미지의 thumb)
+    thumbnail_url = Column(String(500))
+
     created_at = Column(DateTime, default=datetime.utcnow)
+    # 증분 export 기준. 만들 때도 채워서 updated_at 하나로 거른다
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     user = relationship("User", back_populates="community_posts")
     region = relationship("Region", back_populates="community_posts")
@@ -246,7 +311,9 @@ class CommunityPostImage(Base):
 
     id = Column(BigInteger, primary_key=True)
     post_id = Column(BigInteger, ForeignKey("community_posts.id"))
+    asset_id = Column(BigInteger, ForeignKey("media_assets.id"))
     image_url = Column(String(500))
+    thumbnail_url = Column(String(500))
     sort_order = Column(Integer, default=0)
     created_at = Column(DateTime, default=datetime.utcnow)
 
@@ -255,6 +322,10 @@ class CommunityPostImage(Base):
 
 class CommunityComment(Base):
     __tablename__ = "community_comments"
+    __table_args__ = (
+        # 증분 export (created_at >= ?)
+        Index("ix_community_comments_created", "created_at", "id"),
+    )
 
     id = Column(BigInteger, primary_key=True)
     post_id = Column(BigInteger, ForeignKey("community_posts.id"))
@@ -274,6 +345,9 @@ class CommunityComment(Base):
 
 class CommunityPostLike(Base):
     __tablename__ = "community_post_likes"
+    __table_args__ = (
+        UniqueConstraint("user_id", "post_id", name="uq_community_post_like"),
+    )
 
     id = Column(BigInteger, primary_key=True)
     user_id = Column(BigInteger, ForeignKey("users.id"))
@@ -285,26 +359,89 @@ class CommunityPostLike(Base):
     post = relationship("CommunityPost", back_populates="likes")
 
 
+# =====================================
+# Media
+# =====================================
+
+class MediaAsset(Base):
+    """
+    업로드 이미지. 내용(sha256) 기준으로 한 번만 저장하고 같은 파일을 다시 올리면 기존 행을 돌려준다
+    저장소 키는 sha256 에서 정해진다 (services/media.py)
+    """
+    __tablename__ = "media_assets"
+    __table_args__ = (
+        UniqueConstraint("sha256", name="uq_media_asset_sha256"),
+    )
+
+    id = Column(BigInteger, primary_key=True)
+    sha256 = Column(String(64), nullable=False)
+    uploader_id = Column(BigInteger, ForeignKey("users.id"))
+
+    content_type = Column(String(50), nullable=False)
+    byte_size = Column(BigInteger, nullable=False)
+    width = Column(Integer)
+    height = Column(Integer)
+
+    status = Column(SAEnum(MediaAssetStatus), default=MediaAssetStatus.processing, nullable=False)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    processed_at = Column(DateTime)
+
+
 # =====================================
 # Chat
 # =====================================
 
 class ChatRoom(Base):
     __tablename__ = "chat_rooms"
+    __table_args__ = (
+        UniqueConstraint("product_id", "buyer_id", name="uq_chat_room_product_buyer"),
+    )
 
     id = Column(BigInteger, primary_key=True)
     product_id = Column(BigInteger, ForeignKey("products.id"))
     seller_id = Column(BigInteger, ForeignKey("users.id"))
     buyer_id = Column(BigInteger, ForeignKey("users.id"))
 
+    # 인박스용 비정규화 (메시지 저장 시 갱신)
+    last_message_id = Column(BigInteger)
+    last_message_preview = Column(String(255))
+    last_message_at = Column(DateTime)
+
     created_at = Column(DateTime, default=datetime.utcnow)
 
     product = relationship("Product", back_populates="chat_rooms")
     messages = relationship("ChatMessage", back_populates="room")
+    members = relationship("ChatRoomMember", back_populates="room")
+
+
+class ChatRoomMember(Base):
+    """
+    참여자별 읽음 상태. 인박스는 (user_id, last_message_at, room_id) 인덱스 범위 스캔
+    """
+    __tablename__ = "chat_room_members"
+    __table_args__ = (
+        UniqueConstraint("room_id", "user_id", name="uq_chat_room_member"),
+        Index("ix_chat_room_members_inbox", "user_id", "last_message_at", "room_id"),
+    )
+
+    id = Column(BigInteger, primary_key=True)
+    room_id = Column(BigInteger, ForeignKey("chat_rooms.id"), nullable=False)
+    user_id = Column(BigInteger, ForeignKey("users.id"), nullable=False)
+
+    last_read_message_id = Column(BigInteger, default=0)
+    unread_count = Column(Integer, default=0)
+    last_message_at = Column(DateTime)
+
+    room = relationship("ChatRoom", back_populates="members")
 
 
 class ChatMessage(Base):
     __tablename__ = "chat_messages"
+    __table_args__ = (
+        # 방 히스토리 keyset 페이지네이션 (room_id, id)
+        Index("ix_chat_messages_room_id", "room_id", "id"),
+    )
 
     id = Column(BigInteger, primary_key=True)
     room_id = Column(BigInteger, ForeignKey("chat_rooms.id"))
@@ -314,3 +451,85 @@ class ChatMessage(Base):
 
     room = relationship("ChatRoom", back_populates="messages")
     sender = relationship("User", back_populates="chat_messages")
+
+
+# =====================================
+# Counter shards
+# =====================================
+
+class CounterShard(Base):
+    """
+    인기 상품/게시글의 좋아요 수 분산 카운터. 증감은 (kind, target_id) 의 K개 shard 중
+    하나에 누적하고, compactor가 주기적으로 원본 like_count에 합친 뒤 지운다.
+    """
+    __tablename__ = "counter_shards"
+    __table_args__ = (
+        UniqueConstraint("kind", "target_id", "shard", name="uq_counter_shard"),
+    )
+
+    id = Column(BigInteger, primary_key=True)
+    kind = Column(String(20), nullable=False)     # post | product
+    target_id = Column(BigInteger, nullable=False)
+    shard = Column(Integer, nullable=False)
+    delta = Column(Integer, nullable=False, default=0)
+
+
+# =====================================
+# Notifications
+# =====================================
+
+class Notification(Base):
+    """
+    알림 한 행 = 안 읽은 동안 같은 묶음(group_key)의 이벤트를 합친 것 ("12명이 회원님의 글을 좋아합니다")
+    이벤트는 jobs 큐로 모아서 쓰고(db/crud_notification.py), 묶음에 새 이벤트가 오면 행을 새 id 로 바꿔
+    목록 맨 위로 올린다.
+    """
+    __tablename__ = "notifications"
+    __table_args__ = (
+        # 목록: WHERE user_id=? [AND id < ?] ORDER BY id DESC
+        Index("ix_notifications_user", "user_id", "id"),
+        # 안 읽은 수, 같은 묶음의 안 읽은 알림 찾기
+        Index("ix_notifications_user_unread", "user_id", "is_read", "group_key"),
+    )
+
+    id = Column(BigInteger, primary_key=True)
+    user_id = Column(BigInteger, ForeignKey("users.id"), nullable=False)   # 받는 사람
+    kind = Column(String(30), nullable=False)          # post_like | comment_reply
+    group_key = Column(String(100), nullable=False)    # "<kind>:<target_id>"
+    target_id = Column(BigInteger, nullable=False)     # 좋아요: 게시글 id, 답글: 부모 댓글 id
+    post_id = Column(BigInteger, ForeignKey("community_posts.id"))
+    actor_id = Column(BigInteger, ForeignKey("users.id"))    # 가장 최근 행위자
+    actor_count = Column(Integer, nullable=False, default=1)   # 합쳐진 서로 다른 행위자 수
+    # 이미 센 행위자 id (쉼표 구분, 최근 NOTIFICATION_MAX_TRACKED_ACTORS 명). 같은 사람을 다시 세지 않는다
+    actor_ids = Column(Text, nullable=True)
+    is_read = Column(TINYINT(1), nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+# =====================================
+# Background jobs
+# =====================================
+
+class Job(Base):
+    """
+    백그라운드 작업 큐 (core/jobs.py, services/jobs.py). 요청의 쓰기와 같은 트랜잭션에서 INSERT 하고
+    실행기가 SELECT ... FOR UPDATE SKIP LOCKED 로 나눠 가져간다.
+    """
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # 꺼내기: WHERE queue=? AND status IN (queued, running) AND run_at <= now ORDER BY run_at, id
+        Index("ix_jobs_claim", "queue", "status", "run_at", "id"),
+    )
+
+    id = Column(BigInteger, primary_key=True)
+    queue = Column(String(50), nullable=False)
+    kind = Column(String(100), nullable=False)
+    payload = Column(Text, nullable=False)      # JSON
+    status = Column(SAEnum(JobStatus), nullable=False, default=JobStatus.queued)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False)
+    run_at = Column(DateTime, nullable=False)
+    last_error = Column(Text)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, onupdate=datetime.utcnow)
@@ -1,7 +1,12 @@
-from sqlalchemy import create_engine
+import logging
+from contextlib import contextmanager
+
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, declarative_base
 from core.config import settings
 
+logger = logging.getLogger(__name__)
+
 # ------------ DATABASE URL ----------------
 DATABASE_URL = (
     f"mysql+pymysql://{settings.DB_USER}:"
@@ -26,6 +31,74 @@ SessionLocal = sessionmaker(
     bind=engine
 )
 
+# ------------ UNIT OF WORK ----------------
+# CRUD 함수는 flush까지만 하고 commit은 요청(또는 CLI 작업) 경계에서 한 번만 한다.
+# 쓰기가 없었던 요청은 commit 왕복 없이 세션만 닫는다.
+
+@event.listens_for(SessionLocal, "after_flush")
+def _mark_flush_writes(session, flush_context):
+    session.info["has_writes"] = True
+
+
+@event.listens_for(SessionLocal, "do_orm_execute")
+def _mark_statement_writes(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["has_writes"] = True
+
+
+@event.listens_for(SessionLocal, "after_transaction_end")
+def _reset_writes(session, transaction):
+    if transaction.parent is None:
+        session.info.pop("has_writes", None)
+
+
+def on_commit(db, callback):
+    """
+    현재 트랜잭션이 commit된 뒤 실행할 콜백 등록 (rollback되면 버린다)
+    캐시 갱신, 실시간 이벤트처럼 DB에 반영된 뒤에만 밖으로 나가야 하는 작업용
+    """
+    db.info.setdefault("after_commit", []).append(callback)
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _run_after_commit(session):
+    if session.in_nested_transaction():
+        return
+    for callback in session.info.pop("after_commit", ()):
+        try:
+            callback()
+        except Exception:
+            logger.exception("after-commit callback failed")
+
+
+@event.listens_for(SessionLocal, "after_rollback")
+def _drop_after_commit(session):
+    if not session.in_nested_transaction():
+        session.info.pop("after_commit", None)
+
+
+def commit_unit_of_work(db):
+    db.flush()
+    if db.info.get("has_writes"):
+        db.commit()
+
+
+@contextmanager
+def session_scope():
+    """
+    요청 밖(CLI, 백그라운드 작업)에서 쓰는 세션: 정상 종료 시 한 번 commit
+    """
+    db = SessionLocal()
+    try:
+        yield db
+        commit_unit_of_work(db)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
 # ------------ BASE ----------------
 Base = declarative_base()
 
@@ -34,5 +107,9 @@ def get_db():
     db = SessionLocal()
     try:
         yield db
+        commit_unit_of_work(db)
+    except Exception:
+        db.rollback()
+        raise
     finally:
         db.close()
@@ -1,32 +1,129 @@
-from fastapi import FastAPI, Depends
+# 기동 시간 측정 기준점: 다른 import 보다 먼저
+from core import startup
+
+import asyncio
+import logging
+
+from fastapi import FastAPI, Depends, HTTPException, Request
+from fastapi.responses import ORJSONResponse, PlainTextResponse
+from fastapi.staticfiles import StaticFiles
 from sqlalchemy import text
 from fastapi.middleware.cors import CORSMiddleware
 
+from core.broker import broker
+from core.config import settings
+from core.events import counter_bus
+from core.metrics import render_prometheus
+from core.querycount import QueryCountMiddleware, track_queries
 from db.session import get_db, engine
 from db.session import Base
-from routers import users, products, regions, community, auth 
+from core.security import warm_password_context
+from core.storage import local_root, storage
+from routers import users, products, regions, categories, community, notifications, auth, admin, chat, live, media
+from services.chat import chat_hub
+from services.counters import counter_compactor
+from services.jobs import job_runner
+from services.media import media_processor
 
+logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Project A1 API")
+app = FastAPI(title="Project A1 API", default_response_class=ORJSONResponse)
 
 # ==============================
 # DB 테이블 자동 생성 (startup)
 # ==============================
-@app.on_event("startup")
-def on_startup():
+def create_tables():
     print(">> Creating database tables if not exist...")
     Base.metadata.create_all(bind=engine)
     print(">> DB table check complete.")
 
 
+@app.on_event("startup")
+def on_startup():
+    # server.py(gunicorn)는 fork 전에 master에서 한 번 돌리고 워커에서는 끈다
+    if settings.DB_CREATE_ALL_ON_STARTUP:
+        with startup.phase("startup.create_all"):
+            create_tables()
+
+
+@app.on_event("startup")
+async def start_realtime():
+    with startup.phase("startup.realtime"):
+        await broker.start()
+        await chat_hub.start()
+        await counter_bus.start()
+        counter_compactor.start()
+        if settings.JOBS_RUN_IN_APP:
+            job_runner.start()
+    app.state.warm_up = asyncio.create_task(warm_up())
+
+
+@app.on_event("shutdown")
+async def stop_realtime():
+    # 새 요청은 더 받지 않도록 readiness 부터 내린다
+    startup.set_ready(False)
+    # 아직 저장 안 된 채팅 메시지를 먼저 flush
+    await chat_hub.stop()
+    await counter_bus.stop()
+    await counter_compactor.stop()
+    await job_runner.stop()
+    await media_processor.stop()
+    await broker.close()
+    await auth.close_oauth_http()
+
+
+# ==============================
+# WARM-UP → READY
+# ==============================
+def _warm_db_pool(n: int):
+    # 커넥션 n개를 동시에 잡았다가 풀에 돌려놓는다 (첫 요청들이 TCP/인증 왕복을 기다리지 않게)
+    conns = []
+    try:
+        for _ in range(n):
+            conns.append(engine.connect())
+    finally:
+        for conn in conns:
+            conn.close()
+
+
+async def warm_up():
+    """
+    요청 처리 전에 미리 해 두면 첫 요청 지연이 줄어드는 것들. 끝나면 GET /ready 가 200
+    실패해도 요청 처리는 가능하므로 로그만 남기고 ready 로 바꾼다
+    """
+    try:
+        with startup.phase("warm_up.password_hash"):
+            await asyncio.to_thread(warm_password_context)
+        if settings.STARTUP_WARM_DB_CONNECTIONS > 0:
+            with startup.phase("warm_up.db_pool"):
+                await asyncio.to_thread(_warm_db_pool, settings.STARTUP_WARM_DB_CONNECTIONS)
+    except Exception:
+        logger.exception("startup warm-up failed")
+    startup.set_ready(True)
+
+
 # ==============================
 # ROUTERS
 # ==============================
 app.include_router(users.router, prefix="/api")
 app.include_router(products.router, prefix="/api")
 app.include_router(regions.router, prefix="/api")
+app.include_router(categories.router, prefix="/api")
 app.include_router(community.router, prefix="/api")
+app.include_router(notifications.router, prefix="/api")
 app.include_router(auth.router, prefix="/api")
+app.include_router(admin.router, prefix="/api")
+app.include_router(chat.router, prefix="/api")
+app.include_router(live.router, prefix="/api")
+app.include_router(media.router, prefix="/api")
+
+# 로컬 저장소(local://)면 업로드 이미지를 직접 서빙 (운영은 s3:// + CDN)
+if local_root(storage) and settings.MEDIA_PUBLIC_BASE_URL.startswith("/"):
+    app.mount(
+        settings.MEDIA_PUBLIC_BASE_URL.rstrip("/"),
+        StaticFiles(directory=local_root(storage), check_dir=False),
+        name="media",
+    )
 
 
 # ==============================
@@ -40,6 +137,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.QUERY_COUNT_HEADER:
+    track_queries(engine)
+    app.add_middleware(QueryCountMiddleware)
+
+app.add_middleware(startup.FirstRequestMiddleware)
+
 
 # ==============================
 # BASIC ROUTES
@@ -54,6 +157,38 @@ def health_check():
     return {"status": "ok"}
 
 
+@app.get("/ready")
+def readiness():
+    # k8s readinessProbe: warm-up 이 끝나기 전(그리고 종료 중)에는 트래픽을 받지 않는다
+    if not startup.is_ready():
+        return ORJSONResponse({"status": "starting"}, status_code=503)
+    return {"status": "ready"}
+
+
+def internal_only(request: Request):
+    # 운영 지표/기동 보고서는 내부 포트(INTERNAL_PORT)로만. ingress 로 들어온 요청에는 없는 경로처럼 404
+    if not settings.INTERNAL_PORT:
+        return
+    server = request.scope.get("server")
+    if not server or server[1] != settings.INTERNAL_PORT:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+
+@app.get("/internal/startup", include_in_schema=False, dependencies=[Depends(internal_only)])
+def startup_report():
+    return startup.report()
+
+
+@app.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    include_in_schema=False,
+    dependencies=[Depends(internal_only)],
+)
+def metrics():
+    return render_prometheus()
+
+
 @app.get("/api/items/{item_id}")
 def read_item(item_id: int):
     return {"item_id": item_id, "name": f"Item {item_id}"}
@@ -66,3 +201,6 @@ def db_test(db=Depends(get_db)):
         return {"status": "ok", "message": "DB connected!"}
     except Exception as e:
         return {"status": "error", "detail": str(e)}
+
+
+startup.mark("app_imported")
@@ -0,0 +1,23 @@
+-- migrations/026_users_nickname_unique.sql
+-- users.nickname UNIQUE (uq_users_nickname)
+--
+-- create_all 은 이미 있는 테이블을 바꾸지 않는다. 기존 DB 에서 한 번 직접 돌린다 (MySQL 8)
+--     mysql -h $DB_HOST -u $DB_USER -p $DB_NAME < migrations/026_users_nickname_unique.sql
+--
+-- 이 인덱스가 없으면 create_user 의 재시도(savepoint)와 닉네임 409 가 동작하지 않고 중복이 그대로 들어간다.
+
+-- 1) 이미 있는 중복: 가장 먼저 가입한 사람(id 최소)만 그대로 두고 나머지는 "<닉네임>_<id>" 로 바꾼다
+--    (숫자만 붙이는 base2, base3 ... 후보와 겹치지 않게 '_' 를 넣는다)
+UPDATE users u
+JOIN (
+    SELECT id, ROW_NUMBER() OVER (PARTITION BY nickname ORDER BY id) AS rn
+    FROM users
+) d ON d.id = u.id
+SET u.nickname = CONCAT(LEFT(u.nickname, 80), '_', u.id)
+WHERE d.rn > 1;
+
+-- 2) 남은 중복이 없어야 한다 (바꾼 이름이 우연히 기존 닉네임과 같으면 여기 나온다. 손으로 고친 뒤 다시 확인)
+SELECT nickname, COUNT(*) AS n FROM users GROUP BY nickname HAVING n > 1;
+
+-- 3) 인덱스
+ALTER TABLE users ADD UNIQUE KEY uq_users_nickname (nickname);
@@ -0,0 +1,18 @@
+-- migrations/029_export_updated_at.sql
+-- 증분 export (updated_since) 용 community_posts.updated_at 컬럼과 인덱스
+--
+-- create_all 은 이미 있는 테이블을 바꾸지 않는다. 기존 DB 에서 한 번 직접 돌린다 (MySQL 8)
+--     mysql -h $DB_HOST -u $DB_USER -p $DB_NAME < migrations/029_export_updated_at.sql
+--
+-- 컬럼이 없으면 CommunityPost 를 읽는 모든 ORM 쿼리가 "Unknown column 'updated_at'" 으로 실패한다.
+
+ALTER TABLE community_posts ADD COLUMN updated_at DATETIME NULL;
+
+-- updated_at 은 이제 만들 때도 채운다. export 는 updated_at 하나로만 거르므로 기존 행을 채워 둔다
+UPDATE community_posts SET updated_at = created_at WHERE updated_at IS NULL;
+UPDATE products SET updated_at = created_at WHERE updated_at IS NULL;
+
+ALTER TABLE products ADD INDEX ix_products_updated (updated_at, id);
+ALTER TABLE community_posts ADD INDEX ix_community_posts_updated (updated_at, id);
+ALTER TABLE community_comments ADD INDEX ix_community_comments_created (created_at, id);
+ALTER TABLE users ADD INDEX ix_users_created (created_at, id);
@@ -0,0 +1,20 @@
+-- migrations/031_chat_inbox.sql
+-- 채팅 인박스: chat_rooms.last_message_* 컬럼, chat_messages (room_id, id) 인덱스
+--
+-- create_all 은 이미 있는 테이블을 바꾸지 않는다. 기존 DB 에서 한 번 직접 돌린 뒤 기존 방을 채운다 (MySQL 8)
+--     mysql -h $DB_HOST -u $DB_USER -p $DB_NAME < migrations/031_chat_inbox.sql
+--     python cli.py backfill-chat-inbox
+--
+-- 새 테이블 chat_room_members 는 create_all(또는 backfill-chat-inbox)이 만든다.
+-- 채우기 전에는 기존 방에 참여자 행이 없어서 인박스에 나오지 않는다.
+
+ALTER TABLE chat_rooms
+    ADD COLUMN last_message_id BIGINT NULL,
+    ADD COLUMN last_message_preview VARCHAR(255) NULL,
+    ADD COLUMN last_message_at DATETIME NULL;
+
+ALTER TABLE chat_messages ADD INDEX ix_chat_messages_room_id (room_id, id);
+
+-- 기존 방: 마지막 메시지를 방에 복사하고 판매자/구매자 참여자 행을 만든다
+-- (읽음 상태가 없던 때의 메시지는 읽은 것으로 본다. 방 id 순 배치마다 commit, 다시 돌려도 된다)
+--     python cli.py backfill-chat-inbox
@@ -0,0 +1,18 @@
+-- migrations/033_community_hot_score.sql
+-- 인기순 피드용 community_posts.hot_score 컬럼과 인덱스
+--
+-- create_all 은 이미 있는 테이블을 바꾸지 않는다. 기존 DB 에서 한 번 직접 돌린다 (MySQL 8)
+--     mysql -h $DB_HOST -u $DB_USER -p $DB_NAME < migrations/033_community_hot_score.sql
+--     python cli.py rebase-hot-scores
+--
+-- 컬럼이 없으면 커뮤니티 피드/상세/좋아요 쿼리가 모두 실패한다.
+-- rebase-hot-scores 는 updated_at 을 건드리지 않게 쓰므로 029 를 먼저 돌려야 한다.
+
+-- 기존 행은 0 으로 시작한다 (rebase 전까지 인기순은 0점끼리 id 역순)
+ALTER TABLE community_posts
+    ADD COLUMN hot_score DOUBLE NULL DEFAULT 0,
+    ADD INDEX ix_community_posts_region_hot (region_id, is_hidden, hot_score, id),
+    ADD INDEX ix_community_posts_hot (is_hidden, hot_score, id);
+
+-- 점수 채우기는 core/ranking.py 의 가중치를 쓰는 CLI 로 (id 순 배치마다 commit, --after-id 로 재개):
+--     python cli.py rebase-hot-scores
@@ -0,0 +1,83 @@
+# routers/admin.py
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from core.security import get_current_admin
+from db.session import get_db
+from db.models import User
+from db.crud_export import EXPORT_TABLES, iter_export_ndjson
+from schemas.user import UserSuspendRequest
+
+import db.crud as crud
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+
+# =====================================
+# 테이블 덤프 (NDJSON 스트리밍)
+# =====================================
+@router.get("/export/{table}")
+def export_table(
+    table: str,
+    after_id: Optional[int] = Query(None, ge=0),
+    until_id: Optional[int] = Query(None, ge=0),
+    updated_since: Optional[datetime] = None,
+    limit: Optional[int] = Query(None, ge=1),
+    admin: User = Depends(get_current_admin),
+):
+    """
+    Admin 전용 전체/증분 덤프
+    - /api/admin/export/products
+    - /api/admin/export/users?after_id=120000          (이어받기)
+    - /api/admin/export/community_posts?updated_since=2025-01-01T00:00:00
+    """
+    if table not in EXPORT_TABLES:
+        raise HTTPException(status_code=404, detail="Unknown table")
+
+    return StreamingResponse(
+        iter_export_ndjson(
+            table,
+            after_id=after_id,
+            until_id=until_id,
+            updated_since=updated_since,
+            limit=limit,
+        ),
+        media_type="application/x-ndjson",
+    )
+
+
+# =====================================
+# 사용자 정지 / 해제
+# =====================================
+@router.post("/users/{user_id}/suspend")
+def suspend_user(
+    user_id: int,
+    payload: UserSuspendRequest,
+    db: Session = Depends(get_db),
+    admin: User = Depends(get_current_admin),
+):
+    """
+    정지하면 이미 발급된 access/refresh token 이 모두 무효 (commit 직후, 모든 파드)
+    """
+    user = crud.get_user(db, user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    crud.suspend_user(db, user, payload.until, payload.reason)
+    return {"status": "ok", "suspended_until": user.suspended_until}
+
+
+@router.delete("/users/{user_id}/suspend")
+def unsuspend_user(
+    user_id: int,
+    db: Session = Depends(get_db),
+    admin: User = Depends(get_current_admin),
+):
+    user = crud.get_user(db, user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    crud.unsuspend_user(db, user)
+    return {"status": "ok"}
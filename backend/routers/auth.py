@@ -1,13 +1,14 @@
 from datetime import datetime
 
-import httpx
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from fastapi.responses import RedirectResponse
 from pydantic import BaseModel
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from core.config import settings
 from core.security import (
+    access_claims,
     create_access_token,
     create_refresh_token,
     create_oauth_state,
@@ -15,6 +16,7 @@ from core.security import (
     set_auth_cookies,
     get_current_user,
 )
+from core.ratelimit import oauth_callback_limit
 from db.session import get_db
 from db import crud
 from db.models import User
@@ -37,6 +39,30 @@ class CompleteProfileRequest(BaseModel):
     profile_image: str | None = None
 
 
+# ==============================
+# OAuth HTTP 클라이언트 (프로세스당 1개, 처음 쓸 때 생성)
+# ==============================
+# httpx import 가 무겁고 OAuth 콜백은 드물어서 기동 시에는 만들지 않는다.
+# 만든 뒤에는 커넥션(TLS)을 재사용한다
+_http_client = None
+
+
+def _oauth_http():
+    global _http_client
+    if _http_client is None:
+        import httpx
+
+        _http_client = httpx.AsyncClient(timeout=10.0)
+    return _http_client
+
+
+async def close_oauth_http():
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
 def _get_redirect_uri(provider: str) -> str:
     return f"{settings.OAUTH_REDIRECT_BASE}/{provider}/callback"
 
@@ -90,17 +116,17 @@ async def _exchange_google_token(code: str, redirect_uri: str) -> dict:
         "redirect_uri": redirect_uri,
         "grant_type": "authorization_code",
     }
-    async with httpx.AsyncClient() as client:
-        token_resp = await client.post("https://oauth2.googleapis.com/token", data=data)
-        token_resp.raise_for_status()
-        token_json = token_resp.json()
-
-        userinfo_resp = await client.get(
-            "https://openidconnect.googleapis.com/v1/userinfo",
-            headers={"Authorization": f"Bearer {token_json['access_token']}"},
-        )
-        userinfo_resp.raise_for_status()
-        userinfo = userinfo_resp.json()
+    client = _oauth_http()
+    token_resp = await client.post("https://oauth2.googleapis.com/token", data=data)
+    token_resp.raise_for_status()
+    token_json = token_resp.json()
+
+    userinfo_resp = await client.get(
+        "https://openidconnect.googleapis.com/v1/userinfo",
+        headers={"Authorization": f"Bearer {token_json['access_token']}"},
+    )
+    userinfo_resp.raise_for_status()
+    userinfo = userinfo_resp.json()
 
     return {
         "provider_user_id": userinfo.get("sub"),
@@ -117,21 +143,21 @@ async def _exchange_line_token(code: str, redirect_uri: str) -> dict:
         "redirect_uri": redirect_uri,
         "grant_type": "authorization_code",
     }
-    async with httpx.AsyncClient() as client:
-        token_resp = await client.post(
-            "https://api.line.me/oauth2/v2.1/token",
-            data=data,
-            headers={"Content-Type": "application/x-www-form-urlencoded"},
-        )
-        token_resp.raise_for_status()
-        token_json = token_resp.json()
+    client = _oauth_http()
+    token_resp = await client.post(
+        "https://api.line.me/oauth2/v2.1/token",
+        data=data,
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    token_resp.raise_for_status()
+    token_json = token_resp.json()
 
-        profile_resp = await client.get(
-            "https://api.line.me/v2/profile",
-            headers={"Authorization": f"Bearer {token_json['access_token']}"},
-        )
-        profile_resp.raise_for_status()
-        profile = profile_resp.json()
+    profile_resp = await client.get(
+        "https://api.line.me/v2/profile",
+        headers={"Authorization": f"Bearer {token_json['access_token']}"},
+    )
+    profile_resp.raise_for_status()
+    profile = profile_resp.json()
 
     return {
         "provider_user_id": profile.get("userId"),
@@ -154,11 +180,10 @@ def _issue_tokens(
     db: Session,
     redirect_url: str | None = None,
 ):
-    access_token = create_access_token(user.id)
+    access_token = create_access_token(user.id, **access_claims(user))
     refresh_token = create_refresh_token(user.id)
     user.refresh_token = refresh_token
     user.last_login = datetime.utcnow()
-    db.commit()
 
     if redirect_url:
         redirect = RedirectResponse(url=redirect_url)
@@ -195,7 +220,7 @@ async def oauth_login(provider: str, redirect: str | None = Query(default=None))
     return {"auth_url": auth_url, "state": state}
 
 
-@router.get("/{provider}/callback", response_model=OAuthLoginResponse)
+@router.get("/{provider}/callback", response_model=OAuthLoginResponse, dependencies=[Depends(oauth_callback_limit)])
 async def oauth_callback(
     provider: str,
     request: Request,
@@ -225,14 +250,17 @@ async def oauth_callback(
     if not user:
         if email:
             _handle_email_conflict(db, email)
-        user = crud.create_oauth_user(
-            db=db,
-            provider=provider,
-            provider_user_id=provider_user_id,
-            email=email,
-            nickname=nickname,
-            profile_complete=False,
-        )
+        try:
+            user = crud.create_oauth_user(
+                db=db,
+                provider=provider,
+                provider_user_id=provider_user_id,
+                email=email,
+                nickname=nickname,
+                profile_complete=False,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="NICKNAME_IN_USE") from e
 
     redirect_target = payload.get("redirect")
     return _issue_tokens(response, user, db, redirect_url=redirect_target)
@@ -250,8 +278,11 @@ def complete_profile(
     if payload.profile_image:
         current_user.profile_image = payload.profile_image
     current_user.profile_complete = 1
-    db.commit()
-    db.refresh(current_user)
+    try:
+        db.flush()
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="NICKNAME_IN_USE") from e
 
     return _issue_tokens(response, current_user, db)
 
@@ -0,0 +1,93 @@
+# routers/categories.py
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from core.security import get_current_admin
+from db.session import get_db
+from db.models import CategoryType, User
+from schemas.category import CategoryCreate, CategoryNodeOut, CategoryOut, CategoryUpdate
+
+import db.crud_category as crud_category
+
+router = APIRouter(
+    prefix="/categories",
+    tags=["Categories"],
+)
+
+_ERRORS = {
+    "parent_not_found": "Parent category not found",
+    "category_cycle": "Category cannot be moved under itself",
+}
+
+# 트리는 자주 바뀌지 않는다. 바뀌어도 ETag 로 다시 확인하므로 짧게만 캐시
+_CACHE_CONTROL = "public, max-age=60"
+
+
+# -----------------------
+# 카테고리 트리
+# -----------------------
+
+@router.get("", response_model=List[CategoryNodeOut])
+@router.get("/", response_model=List[CategoryNodeOut], include_in_schema=False)
+def list_categories(
+    request: Request,
+    type: Optional[CategoryType] = None,
+    db: Session = Depends(get_db),
+):
+    """
+    활성 카테고리 트리 (children 은 sort_order 순)
+    - /api/categories                 전체
+    - /api/categories?type=product    상품용 (product + both)
+    - /api/categories?type=community  게시판용 (community + both)
+    메모리 스냅샷에서 미리 만들어 둔 JSON 을 그대로 보낸다 (DB 조회/직렬화 없음)
+    """
+    if type == CategoryType.both:
+        type = None
+    forest = crud_category.category_tree(db).forest(type)
+    headers = {"ETag": forest.etag, "Cache-Control": _CACHE_CONTROL}
+    if request.headers.get("if-none-match") == forest.etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=forest.body, media_type="application/json", headers=headers)
+
+
+# -----------------------
+# Admin 전용 생성/수정 (commit 뒤 모든 워커의 스냅샷 무효화)
+# -----------------------
+
+@router.post("/", response_model=CategoryOut)
+def create_category_endpoint(
+    data: CategoryCreate,
+    db: Session = Depends(get_db),
+    admin: User = Depends(get_current_admin),
+):
+    try:
+        category = crud_category.create_category(db, data)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=_ERRORS.get(str(e), str(e)))
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="SLUG_IN_USE") from e
+    return category
+
+
+@router.put("/{category_id}", response_model=CategoryOut)
+def update_category_endpoint(
+    category_id: int,
+    data: CategoryUpdate,
+    db: Session = Depends(get_db),
+    admin: User = Depends(get_current_admin),
+):
+    category = crud_category.get_category(db, category_id)
+    if not category:
+        raise HTTPException(status_code=404, detail="Category not found")
+    try:
+        category = crud_category.update_category(db, category, data)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=_ERRORS.get(str(e), str(e)))
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="SLUG_IN_USE") from e
+    return category
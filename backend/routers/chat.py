@@ -0,0 +1,154 @@
+# routers/chat.py
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from core.pagination import decode_cursor, encode_cursor
+from core.security import Principal, get_current_principal, get_user_from_token
+from db.session import get_db, session_scope
+import db.crud_chat as crud_chat
+import db.crud_product as crud_product
+from schemas.chat import (
+    ChatRoomCreate,
+    ChatRoomOut,
+    ChatMessageOut,
+    ChatMessageListResponse,
+    ChatReadRequest,
+    ChatInboxItem,
+    ChatInboxResponse,
+)
+from services.chat import ChatConnection, chat_hub
+
+router = APIRouter(prefix="/chat", tags=["Chat"])
+
+# 인증/권한 실패 시 WebSocket close code (1008: Policy Violation)
+WS_CLOSE_POLICY_VIOLATION = 1008
+
+
+# =====================================
+# 채팅방 생성 (상품 + 구매자 당 1개, 멱등)
+# =====================================
+@router.post("/rooms", response_model=ChatRoomOut)
+def create_room(
+    data: ChatRoomCreate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    product = crud_product.get_product(db, data.product_id)
+    if not product or product.deleted_at:
+        raise HTTPException(404, "Product not found")
+    if product.seller_id == current_user.id:
+        raise HTTPException(400, "본인 상품에는 채팅을 시작할 수 없습니다.")
+
+    return crud_chat.get_or_create_room(db, product=product, buyer_id=current_user.id)
+
+
+def _get_member_room(db: Session, room_id: int, user: Principal):
+    room = crud_chat.get_room(db, room_id)
+    if not room or not crud_chat.is_member(room, user.id):
+        raise HTTPException(404, "Chat room not found")
+    return room
+
+
+@router.get("/rooms/{room_id}", response_model=ChatRoomOut)
+def get_room(
+    room_id: int,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    return _get_member_room(db, room_id, current_user)
+
+
+# =====================================
+# 인박스 (마지막 메시지 최신순, keyset)
+# =====================================
+@router.get("/rooms", response_model=ChatInboxResponse)
+def inbox(
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    before = tuple(decode_cursor(cursor, 2)) if cursor else None
+    rows = crud_chat.list_inbox(db, current_user.id, before=before, limit=limit)
+
+    next_cursor = None
+    if len(rows) == limit:
+        next_cursor = encode_cursor(rows[-1].last_message_at, rows[-1].room_id)
+
+    return ChatInboxResponse(
+        items=[ChatInboxItem.model_validate(r) for r in rows],
+        next_cursor=next_cursor,
+    )
+
+
+# =====================================
+# 메시지 히스토리 / 읽음 처리
+# =====================================
+@router.get("/rooms/{room_id}/messages", response_model=ChatMessageListResponse)
+def list_messages(
+    room_id: int,
+    before_id: Optional[int] = None,
+    limit: int = Query(30, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    _get_member_room(db, room_id, current_user)
+    rows = crud_chat.list_messages(db, room_id, before_id=before_id, limit=limit)
+
+    return ChatMessageListResponse(
+        items=[ChatMessageOut.model_validate(r) for r in rows],
+        next_before_id=rows[-1].id if len(rows) == limit else None,
+    )
+
+
+@router.post("/rooms/{room_id}/read")
+def mark_read(
+    room_id: int,
+    data: ChatReadRequest,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    room = _get_member_room(db, room_id, current_user)
+    crud_chat.mark_read(db, room, current_user.id, data.message_id)
+    return {"status": "ok"}
+
+
+# =====================================
+# WebSocket
+# =====================================
+def _authorize_ws(token: str, room_id: int) -> int | None:
+    """
+    토큰 검증 + 방 참여자 확인. 성공하면 user_id
+    """
+    with session_scope() as db:
+        try:
+            user = get_user_from_token(db, token)
+        except HTTPException:
+            return None
+        room = crud_chat.get_room(db, room_id)
+        if not room or not crud_chat.is_member(room, user.id):
+            return None
+        return user.id
+
+
+@router.websocket("/ws/{room_id}")
+async def chat_socket(websocket: WebSocket, room_id: int, token: str = Query(...)):
+    """
+    브라우저는 WebSocket에 Authorization 헤더를 못 붙이므로 access token은 쿼리로 받는다
+    - 보내기: {"message": "..."}
+    - 받기:   {"type": "message", "id", "room_id", "sender_id", "message", "created_at"}
+    """
+    user_id = await run_in_threadpool(_authorize_ws, token, room_id)
+    if user_id is None:
+        await websocket.close(code=WS_CLOSE_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    conn = ChatConnection(websocket, user_id, room_id)
+    try:
+        await chat_hub.serve(conn)
+    except WebSocketDisconnect:
+        pass
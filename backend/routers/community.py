@@ -1,24 +1,34 @@
 # routers/community.py
+from datetime import datetime
 from typing import Optional, List
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 
-from core.security import get_current_user
+from core.config import settings
+from core.events import KIND_POST
+from core.pagination import decode_cursor, encode_cursor
+from core.security import Principal, get_current_principal, get_current_user
 from db.session import get_db
-from db.models import User, UserRole
+from db.models import CategoryType, User
 from db import models
 
 import db.crud_community as crud_community
 import db.crud_comment as crud_comment
+from db.crud_category import category_tree
+from db.crud_counter import pending_like_deltas
+from db.loader import batch_result, request_loader
 
 from schemas.community import (
     CommunityPostCreate,
     CommunityPostUpdate,
     CommunityPostOut,
     CommunityPostListResponse,
-    CommunityPostListItem,
+    CommunityPostBatchResponse,
     CommunityPostDetail
 )
+from schemas.batch import BatchGetRequest
+from schemas.dto import PostListItem
 from schemas.comment import (
     CommentCreate,
     CommentOut,
@@ -41,7 +51,10 @@ def create_post(
     if not data.region_id and not current_user.home_region_id:
         raise HTTPException(400, "동네가 설정되어 있지 않습니다. 먼저 GPS 인증을 해주세요.")
 
-    post = crud_community.create_post(db, current_user, data)
+    try:
+        post = crud_community.create_post(db, user=current_user, data=data)
+    except ValueError:
+        raise HTTPException(400, "업로드한 이미지를 찾을 수 없습니다.")
     return post
 
 
@@ -52,7 +65,7 @@ def create_post(
 def get_post_detail(
     post_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     post = crud_community.get_post(db, post_id)
     if not post or post.is_hidden:
@@ -69,16 +82,34 @@ def get_post_detail(
         user_id=post.user_id,
         images=post.images,
         comments=comments,
-        view_count=post.view_count,
-        like_count=post.like_count,
+        # 이번 조회는 작업으로 나중에 반영된다
+        view_count=(post.view_count or 0) + 1,
+        like_count=(post.like_count or 0) + pending_like_deltas(db, KIND_POST, [post.id]).get(post.id, 0),
         comment_count=post.comment_count,
         created_at=post.created_at,
+        liked_by_me=crud_community.get_post_like(db, user_id=current_user.id, post_id=post.id) is not None,
     )
 
 
 # =====================================
 # 게시글 목록
 # =====================================
+def _list_item(p, liked_by_me: bool, pending_likes: int = 0) -> PostListItem:
+    # pending_likes: 아직 like_count 에 합쳐지지 않은 shard 합계 (상세/상품 목록과 같은 값이 보이도록)
+    return PostListItem(
+        p.id,
+        p.title,
+        p.region_id,
+        p.user_id,
+        (p.like_count or 0) + pending_likes,
+        p.comment_count or 0,
+        p.view_count or 0,
+        p.created_at,
+        p.thumbnail_url,
+        liked_by_me,
+    )
+
+
 @router.get("/posts", response_model=CommunityPostListResponse)
 def list_posts(
     page: int = 1,
@@ -86,33 +117,75 @@ def list_posts(
     sort: str = Query("recent", regex="^(recent|popular)$"),
     region_id: Optional[int] = None,
     my_region_only: bool = False,
+    category_id: Optional[int] = None,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
+    """
+    첫 페이지는 page/total, 다음 페이지부터는 next_cursor 사용 권장 (OFFSET/COUNT 없음)
+    커서는 sort와 짝이므로 sort를 바꾸면 처음부터 다시 읽는다
+    category_id 는 하위 카테고리까지 포함 (메모리의 카테고리 트리에서 펼친다)
+    """
     if my_region_only:
         if not current_user.home_region_id:
             raise HTTPException(400, "동네 인증이 필요합니다.")
         region_id = current_user.home_region_id
 
-    posts, total = crud_community.list_posts(
-        db, page=page, size=size, sort=sort, region_id=region_id
+    after = tuple(decode_cursor(cursor, 2)) if cursor else None
+    if after and not isinstance(after[0], datetime if sort == "recent" else (int, float)):
+        raise HTTPException(400, "Invalid cursor")
+    category_ids = None
+    if category_id:
+        category_ids = category_tree(db).expand(category_id, CategoryType.community)
+    cached = None
+    if sort == "recent" and region_id and not category_ids:
+        # 동네 최신글 피드는 타임라인 캐시에서 (첫 페이지들은 DB를 읽지 않음)
+        cached = crud_community.list_recent_posts_cached(
+            db, region_id=region_id, page=page, size=size, after=after
+        )
+    if cached is not None:
+        posts, total = cached
+    else:
+        posts, total = crud_community.list_posts(
+            db, page=page, size=size, sort=sort, region_id=region_id, category_ids=category_ids, after=after
+        )
+
+    liked = crud_community.liked_post_ids(db, current_user.id, [p.id for p in posts])
+    pending = pending_like_deltas(db, KIND_POST, [p.id for p in posts])
+
+    next_cursor = None
+    if len(posts) == size:
+        next_cursor = encode_cursor(*crud_community.post_sort_key(posts[-1], sort))
+
+    items = [_list_item(p, p.id in liked, pending.get(p.id, 0)) for p in posts]
+
+    # CommunityPostListResponse 모양 그대로, 검증/인코딩 없이 orjson 으로 바로 직렬화
+    return ORJSONResponse(
+        {"items": items, "page": page, "size": size, "total": total, "next_cursor": next_cursor}
     )
 
-    items = [
-        CommunityPostListItem(
-            id=p.id,
-            title=p.title,
-            region_id=p.region_id,
-            user_id=p.user_id,
-            like_count=p.like_count or 0,
-            comment_count=p.comment_count or 0,
-            view_count=p.view_count or 0,
-            created_at=p.created_at,
-        )
-        for p in posts
-    ]
 
-    return CommunityPostListResponse(items=items, page=page, size=size, total=total)
+# =====================================
+# 여러 게시글 카드 한 번에 조회
+# =====================================
+@router.post("/posts:batchGet", response_model=CommunityPostBatchResponse)
+def batch_get_posts(
+    payload: BatchGetRequest,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    """
+    목록 카드 모양. items 는 요청한 id 순서 그대로, 없거나 숨김/삭제된 글 자리는 null 이고 missing 에 모은다
+    글 행은 타임라인과 같은 행 캐시에서 읽고 빠진 것만 IN 쿼리 한 번 (조회수는 올리지 않는다)
+    """
+    if len(payload.ids) > settings.BATCH_GET_MAX_IDS:
+        raise HTTPException(400, "Too many ids")
+    found = request_loader(db, "posts", crud_community.get_post_rows_by_id).load_many(payload.ids)
+    liked = crud_community.liked_post_ids(db, current_user.id, list(found))
+    pending = pending_like_deltas(db, KIND_POST, list(found))
+    items = {post_id: _list_item(p, post_id in liked, pending.get(post_id, 0)) for post_id, p in found.items()}
+    return ORJSONResponse(batch_result(payload.ids, items))
 
 
 # =====================================
@@ -123,16 +196,19 @@ def update_post(
     post_id: int,
     data: CommunityPostUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     post = crud_community.get_post(db, post_id)
     if not post or post.is_hidden:
         raise HTTPException(404, "Post not found")
 
-    if post.user_id != current_user.id and current_user.role != UserRole.admin:
+    if post.user_id != current_user.id and not current_user.is_admin:
         raise HTTPException(403, "권한이 없습니다.")
 
-    updated = crud_community.update_post(db, post, data)
+    try:
+        updated = crud_community.update_post(db, post=post, data=data)
+    except ValueError:
+        raise HTTPException(400, "업로드한 이미지를 찾을 수 없습니다.")
     return updated
 
 
@@ -143,16 +219,16 @@ def update_post(
 def delete_post(
     post_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     post = crud_community.get_post(db, post_id)
     if not post or post.is_hidden:
         raise HTTPException(404, "Post not found")
 
-    if post.user_id != current_user.id and current_user.role != UserRole.admin:
+    if post.user_id != current_user.id and not current_user.is_admin:
         raise HTTPException(403, "권한이 없습니다.")
 
-    crud_community.soft_delete_post(db, post)
+    crud_community.soft_delete_post(db, post=post)
     return {"status": "ok"}
 
 
@@ -175,13 +251,6 @@ def create_comment(
     return comment
 
 
-@router.post("/posts/{post_id}/like")
-def like_post(post_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    crud_community.like_post(db, current_user, post_id)
-    return {"status": "ok", "liked": True}
-
-
-
 # =====================================
 # 댓글 목록 (트리)
 # =====================================
@@ -200,7 +269,7 @@ def list_comments(
 def delete_comment(
     comment_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     ok = crud_comment.delete_comment(db, comment_id, current_user.id)
     if not ok:
@@ -215,17 +284,22 @@ def delete_comment(
 def like_post(
     post_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
-    crud_community.like_post(db, current_user, post_id)
-    return {"status": "ok", "liked": True}
+    changed = crud_community.like_post(db, current_user.id, post_id)
+    # 바뀐 게 없을 때만 존재 확인 (이미 눌렀음 / 없는 글)
+    if not changed and not db.get(models.CommunityPost, post_id):
+        raise HTTPException(404, "Post not found")
+    return {"status": "ok", "liked": True, "changed": changed}
 
 
 @router.delete("/posts/{post_id}/like")
 def unlike_post(
     post_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
-    crud_community.unlike_post(db, current_user, post_id)
-    return {"status": "ok", "liked": False}
+    changed = crud_community.unlike_post(db, current_user.id, post_id)
+    if not changed and not db.get(models.CommunityPost, post_id):
+        raise HTTPException(404, "Post not found")
+    return {"status": "ok", "liked": False, "changed": changed}
@@ -0,0 +1,138 @@
+# routers/live.py
+import asyncio
+import json
+from typing import Dict, List, Optional, Set
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+
+from core.config import settings
+from core.events import KIND_POST, KIND_PRODUCT, CounterKey, CounterSubscription, counter_bus
+from db.session import SessionLocal
+import db.crud_community as crud_community
+import db.crud_product as crud_product
+from db.crud_counter import pending_like_deltas
+
+router = APIRouter(prefix="/live", tags=["Live"])
+
+# SSE 응답에서 kind -> JSON 키
+_KIND_KEYS = {KIND_POST: "posts", KIND_PRODUCT: "products"}
+
+# 새 구독의 스냅샷 대기 (refresh 루프 한 바퀴 = LIVE_COUNTER_FLUSH_MS + 읽기)
+_SNAPSHOT_TIMEOUT_SECONDS = 10
+
+
+def _parse_ids(raw: Optional[str]) -> List[int]:
+    if not raw:
+        return []
+    try:
+        return sorted({int(x) for x in raw.split(",") if x.strip()})
+    except ValueError:
+        raise HTTPException(400, "ids must be comma separated integers")
+
+
+def _load_counters(keys: Set[CounterKey]) -> Dict[CounterKey, Dict[str, int]]:
+    """
+    counter_bus refresh 루프가 부른다 (파드당 LIVE_COUNTER_FLUSH_MS 에 한 번, 구독 중인 바뀐 id + 새 구독 id)
+    """
+    post_ids = sorted(i for kind, i in keys if kind == KIND_POST)
+    product_ids = sorted(i for kind, i in keys if kind == KIND_PRODUCT)
+    values: Dict[CounterKey, Dict[str, int]] = {}
+    db = SessionLocal()
+    try:
+        # like_count 는 아직 합쳐지지 않은 shard 합계까지
+        if post_ids:
+            pending = pending_like_deltas(db, KIND_POST, post_ids, fresh=True)
+            for row in crud_community.get_post_counters(db, post_ids):
+                values[(KIND_POST, row.id)] = {
+                    "like_count": (row.like_count or 0) + pending.get(row.id, 0),
+                    "comment_count": row.comment_count or 0,
+                    "view_count": row.view_count or 0,
+                }
+        if product_ids:
+            pending = pending_like_deltas(db, KIND_PRODUCT, product_ids, fresh=True)
+            for row in crud_product.get_product_counters(db, product_ids):
+                values[(KIND_PRODUCT, row.id)] = {
+                    "like_count": (row.like_count or 0) + pending.get(row.id, 0),
+                    "view_count": row.view_count or 0,
+                }
+        return values
+    finally:
+        db.close()
+
+
+counter_bus.loader = _load_counters
+
+
+def _by_kind(values: Dict[CounterKey, Dict[str, int]]) -> dict:
+    out = {"posts": {}, "products": {}}
+    for (kind, target_id), fields in values.items():
+        out[_KIND_KEYS[kind]][str(target_id)] = fields
+    return out
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+async def _event_stream(request: Request, sub: CounterSubscription, snapshot: dict):
+    interval = settings.LIVE_COUNTER_FLUSH_MS / 1000
+    try:
+        yield _sse("snapshot", _by_kind(snapshot))
+        while True:
+            try:
+                await asyncio.wait_for(sub.ready.wait(), settings.LIVE_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                yield ": keep-alive\n\n"
+                continue
+
+            yield _sse("counters", _by_kind(sub.drain()))
+            # 최소 간격: 그동안 들어온 변경분은 다음 이벤트 하나로 합쳐진다
+            await asyncio.sleep(interval)
+    finally:
+        counter_bus.unsubscribe(sub)
+
+
+# =====================================
+# 게시글/상품 카운터 실시간 구독 (SSE)
+# =====================================
+@router.get("/counters")
+async def live_counters(
+    request: Request,
+    posts: Optional[str] = None,
+    products: Optional[str] = None,
+):
+    """
+    - /api/live/counters?posts=1,2,3&products=10
+    - event: snapshot  -> 구독 시점 값
+    - event: counters  -> 이후 바뀐 대상의 현재 값 (절대값, 덮어쓰면 된다), 최대 LIVE_COUNTER_FLUSH_MS 에 한 번
+    """
+    post_ids = _parse_ids(posts)
+    product_ids = _parse_ids(products)
+    if not post_ids and not product_ids:
+        raise HTTPException(400, "posts or products is required")
+    if len(post_ids) + len(product_ids) > settings.LIVE_MAX_SUBSCRIPTION_IDS:
+        raise HTTPException(400, "Too many ids")
+
+    # 스냅샷은 구독을 건 뒤 refresh 루프가 읽는다. 이후 counters 는 그보다 나중에 읽은 값만 온다
+    keys = [(KIND_POST, i) for i in post_ids] + [(KIND_PRODUCT, i) for i in product_ids]
+    sub = counter_bus.subscribe(keys)
+    try:
+        snapshot = await asyncio.wait_for(sub.snapshot, _SNAPSHOT_TIMEOUT_SECONDS)
+    except Exception:
+        counter_bus.unsubscribe(sub)
+        raise HTTPException(503, "Live counters unavailable")
+    except BaseException:
+        counter_bus.unsubscribe(sub)
+        raise
+
+    return StreamingResponse(
+        _event_stream(request, sub, snapshot),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # 스트림이 시작되기 전에 끊긴 경우에도 구독을 푼다 (중복 호출해도 무해)
+        background=BackgroundTask(counter_bus.unsubscribe, sub),
+    )
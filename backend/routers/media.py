@@ -0,0 +1,70 @@
+# routers/media.py
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from core.ratelimit import upload_limit
+from core.security import Principal, get_current_principal, get_current_user
+from db import crud_media
+from db.models import User
+from db.session import get_db
+from schemas.media import MediaAssetOut
+from services.media import accept_upload, asset_out, receive_upload
+
+router = APIRouter(prefix="/media", tags=["Media"])
+
+
+# =====================================
+# 이미지 업로드 (multipart/form-data, 필드 이름 file)
+# =====================================
+@router.post(
+    "/images",
+    response_model=MediaAssetOut,
+    dependencies=[Depends(upload_limit)],
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "multipart/form-data": {
+                    "schema": {
+                        "type": "object",
+                        "required": ["file"],
+                        "properties": {"file": {"type": "string", "format": "binary"}},
+                    }
+                }
+            },
+        }
+    },
+)
+async def upload_image(
+    request: Request,
+    db: Session = Depends(get_db),
+    principal: Principal = Depends(get_current_principal),
+):
+    """
+    본문은 받는 대로 디스크에 쓴다 (UploadFile 처럼 파싱이 끝날 때까지 기다리지 않음).
+    같은 파일은 한 번만 저장하고 기존 asset 을 돌려준다. thumb/medium 변환은 응답 뒤 백그라운드에서.
+    돌려받은 id 를 상품 images[].asset_id / 게시글 image_asset_ids 에 넣는다
+    """
+    # 인증(auth epoch 캐시 miss 면 users 조회)에 쓴 커넥션을 본문을 받기 전에 풀에 돌려준다.
+    # 느린 클라이언트의 업로드(최대 16MB) 동안 커넥션을 잡고 있지 않게. 저장은 accept_upload 가 따로 연다
+    db.close()
+    upload = await receive_upload(request, settings.MEDIA_MAX_UPLOAD_BYTES)
+    try:
+        asset = await accept_upload(upload, principal.id)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail="Unsupported image")
+    return asset_out(asset)
+
+
+# 변환 상태 확인 (processing -> ready | failed)
+@router.get("/images/{asset_id}", response_model=MediaAssetOut)
+def get_image(
+    asset_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    asset = crud_media.get_asset(db, asset_id)
+    if asset is None:
+        raise HTTPException(status_code=404, detail="Media asset not found")
+    return asset_out(asset)
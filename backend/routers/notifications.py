@@ -0,0 +1,89 @@
+# routers/notifications.py
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.orm import Session
+
+from core.pagination import decode_cursor, encode_cursor
+from core.security import Principal, get_current_principal
+from db.session import get_db
+from schemas.notification import (
+    NotificationListResponse,
+    NotificationReadRequest,
+    UnreadCountResponse,
+)
+
+import db.crud_notification as crud_notification
+
+router = APIRouter(prefix="/notifications", tags=["Notifications"])
+
+
+def _message(kind: str, nickname: Optional[str], count: int) -> str:
+    who = f"{nickname or '알 수 없음'}님" + (f" 외 {count - 1}명" if count > 1 else "")
+    if kind == crud_notification.KIND_COMMENT_REPLY:
+        return f"{who}이 회원님의 댓글에 답글을 남겼습니다."
+    return f"{who}이 회원님의 글을 좋아합니다."
+
+
+# =====================================
+# 알림 목록 (최신순, keyset)
+# =====================================
+@router.get("", response_model=NotificationListResponse)
+def list_notifications(
+    size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    after_id = None
+    if cursor:
+        (after_id,) = decode_cursor(cursor, 1)
+        if not isinstance(after_id, int):
+            raise HTTPException(400, "Invalid cursor")
+
+    rows = crud_notification.list_notifications(db, current_user.id, size, after_id)
+    items = [
+        {
+            "id": r.id,
+            "kind": r.kind,
+            "target_id": r.target_id,
+            "post_id": r.post_id,
+            "actor_id": r.actor_id,
+            "actor_nickname": r.actor_nickname,
+            "actor_count": r.actor_count,
+            "message": _message(r.kind, r.actor_nickname, r.actor_count),
+            "is_read": bool(r.is_read),
+            "created_at": r.created_at,
+        }
+        for r in rows
+    ]
+    next_cursor = encode_cursor(rows[-1].id) if len(rows) == size else None
+    return ORJSONResponse({"items": items, "next_cursor": next_cursor})
+
+
+# =====================================
+# 뱃지: 안 읽은 알림 수 (캐시 키 하나)
+# =====================================
+@router.get("/unread-count", response_model=UnreadCountResponse)
+def unread_count(
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    return ORJSONResponse({"unread": crud_notification.unread_count(db, current_user.id)})
+
+
+# =====================================
+# 읽음 처리
+# =====================================
+@router.post("/read")
+def mark_read(
+    payload: NotificationReadRequest,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    """
+    ids 를 주면 그 알림만, 없으면 전부
+    """
+    changed = crud_notification.mark_read(db, current_user.id, payload.ids)
+    return {"changed": changed}
@@ -1,42 +1,191 @@
 # routers/products.py
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from db.session import get_db
-from core.security import get_current_user
-from schemas.product import ProductCreate, ProductUpdate
+from core.config import settings
+from core.pagination import decode_cursor, encode_cursor
+from core.ratelimit import search_limit
+from core.security import get_current_principal, get_current_principal_optional
+from schemas.product import (
+    ProductCreate,
+    ProductUpdate,
+    ProductImportResult,
+    ProductResponse,
+    ProductDetailResponse,
+    ProductListResponse,
+    ProductBatchResponse,
+)
+from schemas.batch import BatchGetRequest
+from services.product_import import import_products, iter_request_lines
 from db.crud_product import (
     create_product,
     update_product,
     delete_product,
     get_product,
+    get_product_detail,
+    get_product_details,
     get_products_by_user,
     get_products_by_region,
-    toggle_like,
+    browse_products,
+    browse_sort_key,
+    like_product,
+    unlike_product,
+    liked_product_ids,
+    chatted_product_ids,
 )
-from db.models import Product
+from db.crud_category import category_tree
+from db.crud_counter import pending_like_deltas
+from db.loader import batch_result, request_loader
+from db.models import CategoryType, Product, ProductCondition, ProductStatus, ProductTradeType
+from core.events import KIND_PRODUCT
 
 router = APIRouter(prefix="/products", tags=["Products"])
 
 
+def _present(db: Session, items, user):
+    """
+    DTO(schemas.dto) 목록에 페이지 단위 보정 (상품 수와 무관하게 쿼리 수 고정)
+    - like_count: 아직 합쳐지지 않은 shard 좋아요 반영 (인기 상품만)
+    - liked_by_me / chatted: IN 쿼리 2번
+    """
+    if not items:
+        return items
+
+    ids = [item.id for item in items]
+    pending = pending_like_deltas(db, KIND_PRODUCT, ids)
+    for item in items:
+        item.like_count += pending.get(item.id, 0)
+
+    if user is None:
+        return items
+    liked = liked_product_ids(db, user.id, ids)
+    chatted = chatted_product_ids(db, user.id, ids)
+    for item in items:
+        item.liked_by_me = item.id in liked
+        item.chatted = item.id in chatted
+    return items
+
+
 # 상품 등록
 @router.post("/")
-def create(payload: ProductCreate, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
-    product = create_product(db, current_user.id, payload)
+def create(payload: ProductCreate, db: Session = Depends(get_db), current_user=Depends(get_current_principal)):
+    try:
+        product = create_product(db, current_user.id, payload)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Media asset not found")
     return {"status": "ok", "id": product.id}
 
 
+# 상품 대량 등록 (NDJSON / CSV 본문 스트리밍)
+@router.post("/import", response_model=ProductImportResult)
+def bulk_import(
+    request: Request,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    chunk_size: int | None = Query(None, ge=1, le=5000),
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_principal),
+):
+    return import_products(
+        db,
+        current_user.id,
+        iter_request_lines(request),
+        fmt=format,
+        chunk_size=chunk_size,
+    )
+
+
+# 상품 목록 (필터 + 정렬 + keyset 커서)
+@router.get("", response_model=ProductListResponse, dependencies=[Depends(search_limit)])
+@router.get("/", response_model=ProductListResponse, dependencies=[Depends(search_limit)], include_in_schema=False)
+def browse(
+    region_id: int,
+    category_id: Optional[int] = None,
+    status: str = Query("selling", pattern="^(selling|reserved|sold)$"),
+    condition: Optional[ProductCondition] = None,
+    trade_type: Optional[ProductTradeType] = None,
+    min_price: Optional[int] = Query(None, ge=0),
+    max_price: Optional[int] = Query(None, ge=0),
+    sort: str = Query("recent", pattern="^(recent|price_asc|price_desc|likes)$"),
+    size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user=Depends(get_current_principal_optional),
+):
+    """
+    삭제/숨김 상품은 나오지 않는다. 다음 페이지는 next_cursor 로 (OFFSET/COUNT 없음)
+    category_id 는 하위 카테고리까지 포함 (메모리의 카테고리 트리에서 펼친다)
+    커서는 sort 와 짝이므로 sort/필터를 바꾸면 처음부터 다시 읽는다
+    """
+    after = None
+    if cursor:
+        after = tuple(decode_cursor(cursor, 1 if sort == "recent" else 2))
+        if not all(isinstance(v, int) for v in after):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    items = browse_products(
+        db,
+        region_id=region_id,
+        size=size,
+        status=ProductStatus(status),
+        sort=sort,
+        category_ids=category_tree(db).expand(category_id, CategoryType.product) if category_id else None,
+        condition=condition,
+        trade_type=trade_type,
+        min_price=min_price,
+        max_price=max_price,
+        after=after,
+    )
+    # 커서는 인덱스에 있는 값으로 (_present 가 like_count 에 shard 보정을 더하기 전에)
+    next_cursor = encode_cursor(*browse_sort_key(items[-1], sort)) if len(items) == size else None
+    return ORJSONResponse({"items": _present(db, items, current_user), "next_cursor": next_cursor})
+
+
+# 지역 기반 상품 목록 (GET /api/products?region_id= 로 대체)
+@router.get(
+    "/region/{region_id}",
+    response_model=List[ProductResponse],
+    dependencies=[Depends(search_limit)],
+    deprecated=True,
+)
+def list_by_region(region_id: int, db: Session = Depends(get_db), current_user=Depends(get_current_principal_optional)):
+    return ORJSONResponse(_present(db, get_products_by_region(db, region_id), current_user))
+
+
+# 내가 올린 상품 목록 (/{product_id} 보다 먼저 선언해야 "me"가 id로 잡히지 않는다)
+@router.get("/me", response_model=List[ProductResponse])
+def list_my_products(db: Session = Depends(get_db), current_user=Depends(get_current_principal)):
+    return ORJSONResponse(_present(db, get_products_by_user(db, current_user.id), current_user))
+
+
+# 여러 상품 한 번에 조회 (찜 목록, 최근 본 상품, 채팅방 헤더)
+@router.post(":batchGet", response_model=ProductBatchResponse)
+def batch_get(payload: BatchGetRequest, db: Session = Depends(get_db), current_user=Depends(get_current_principal_optional)):
+    """
+    items 는 요청한 id 순서 그대로, 없거나 삭제/숨김인 상품 자리는 null 이고 missing 에 모은다
+    상품 수와 무관하게 쿼리 수 고정 (상품 IN + 이미지 IN + _present)
+    """
+    if len(payload.ids) > settings.BATCH_GET_MAX_IDS:
+        raise HTTPException(status_code=400, detail="Too many ids")
+    found = request_loader(db, "products", get_product_details).load_many(payload.ids)
+    _present(db, list(found.values()), current_user)
+    return ORJSONResponse(batch_result(payload.ids, found))
+
+
 # 상품 상세 조회
-@router.get("/{product_id}")
-def detail(product_id: int, db: Session = Depends(get_db)):
-    product = get_product(db, product_id)
+@router.get("/{product_id}", response_model=ProductDetailResponse)
+def detail(product_id: int, db: Session = Depends(get_db), current_user=Depends(get_current_principal_optional)):
+    product = get_product_detail(db, product_id)
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
-    return product
+    return ORJSONResponse(_present(db, [product], current_user)[0])
 
 
 # 상품 수정
 @router.put("/{product_id}")
-def update(product_id: int, payload: ProductUpdate, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+def update(product_id: int, payload: ProductUpdate, db: Session = Depends(get_db), current_user=Depends(get_current_principal)):
     product = get_product(db, product_id)
 
     if not product:
@@ -46,12 +195,12 @@ def update(product_id: int, payload: ProductUpdate, db: Session = Depends(get_db
         raise HTTPException(status_code=403, detail="Unauthorized")
 
     updated = update_product(db, product, payload)
-    return {"status": "ok", "product": updated}
+    return {"status": "ok", "product": ProductResponse.model_validate(updated)}
 
 
 # 상품 삭제
 @router.delete("/{product_id}")
-def delete(product_id: int, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+def delete(product_id: int, db: Session = Depends(get_db), current_user=Depends(get_current_principal)):
     product = get_product(db, product_id)
 
     if not product:
@@ -64,20 +213,19 @@ def delete(product_id: int, db: Session = Depends(get_db), current_user=Depends(
     return {"status": "deleted"}
 
 
-# 지역 기반 상품 목록
-@router.get("/region/{region_id}")
-def list_by_region(region_id: int, db: Session = Depends(get_db)):
-    return get_products_by_region(db, region_id)
-
-
-# 내가 올린 상품 목록
-@router.get("/me")
-def list_my_products(db: Session = Depends(get_db), current_user=Depends(get_current_user)):
-    return get_products_by_user(db, current_user.id)
+# 좋아요 / 취소 (멱등: 여러 번 호출해도 결과 동일)
+@router.put("/{product_id}/like")
+def like(product_id: int, db: Session = Depends(get_db), current_user=Depends(get_current_principal)):
+    changed = like_product(db, current_user.id, product_id)
+    # 바뀐 게 없을 때만 존재 확인 (이미 눌렀음 / 없는 상품)
+    if not changed and not db.get(Product, product_id):
+        raise HTTPException(status_code=404, detail="Product not found")
+    return {"liked": True, "changed": changed}
 
 
-# 좋아요 / 취소
-@router.post("/{product_id}/like")
-def like(product_id: int, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
-    result = toggle_like(db, current_user.id, product_id)
-    return {"liked": result}
+@router.delete("/{product_id}/like")
+def unlike(product_id: int, db: Session = Depends(get_db), current_user=Depends(get_current_principal)):
+    changed = unlike_product(db, current_user.id, product_id)
+    if not changed and not db.get(Product, product_id):
+        raise HTTPException(status_code=404, detail="Product not found")
+    return {"liked": False, "changed": changed}
@@ -116,8 +116,6 @@ def verify_gps(
     current_user.home_lat = payload.lat
     current_user.home_lng = payload.lng
     current_user.gps_verified_at = datetime.utcnow()
-    db.commit()
-    db.refresh(current_user)
 
     return GPSVerifyResponse(
         success=True,
@@ -1,16 +1,26 @@
 # routers/users.py
 from fastapi import APIRouter, Depends, HTTPException, status, Response
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from core.config import settings
 from core.security import verify_password, get_password_hash, set_auth_cookies
+from core.ratelimit import login_limit, register_limit, password_hash_slots
 from db.models import User, UserRole
 from db.session import get_db
 import db.crud as crud
+from db.loader import batch_result, request_loader
+from schemas.batch import BatchGetRequest
+from schemas.user import UserSummaryBatchResponse
 from core.security import (
+    Principal,
+    access_claims,
     create_access_token,
     create_refresh_token,
     get_current_user,
     get_current_admin,
+    get_current_principal,
     decode_token,
 )
 router = APIRouter(prefix="/users", tags=["Users"])
@@ -52,24 +62,26 @@ class UserMeResponse(BaseModel):
     class Config:
         from_attributes = True
 
-@router.post("/register")
+@router.post("/register", dependencies=[Depends(register_limit), Depends(password_hash_slots)])
 def register(payload: UserRegister, response: Response, db: Session = Depends(get_db)):
-    user = crud.create_user(
-        db,
-        payload.email,
-        payload.password,
-        payload.nickname,
-        profile_complete=True,
-    )
-    access_token = create_access_token(user.id)
+    try:
+        user = crud.create_user(
+            db,
+            payload.email,
+            payload.password,
+            payload.nickname,
+            profile_complete=True,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="NICKNAME_IN_USE") from e
+    access_token = create_access_token(user.id, **access_claims(user))
     refresh_token = create_refresh_token(user.id)
     user.refresh_token = refresh_token
-    db.commit()
     set_auth_cookies(response, access_token, refresh_token)
     return {"status": "ok", "user_id": user.id, "access_token": access_token, "refresh_token": refresh_token}
 
 
-@router.post("/login", response_model=TokenResponse)
+@router.post("/login", response_model=TokenResponse, dependencies=[Depends(login_limit), Depends(password_hash_slots)])
 def login(payload: UserLogin, response: Response, db: Session = Depends(get_db)):
     user = crud.authenticate_user(db, payload.email, payload.password)
     if not user:
@@ -78,10 +90,9 @@ def login(payload: UserLogin, response: Response, db: Session = Depends(get_db))
             detail="Invalid email or password",
         )
 
-    access_token = create_access_token(user.id)
+    access_token = create_access_token(user.id, **access_claims(user))
     refresh_token = create_refresh_token(user.id)
     user.refresh_token = refresh_token
-    db.commit()
     set_auth_cookies(response, access_token, refresh_token)
 
     return TokenResponse(
@@ -94,6 +105,19 @@ def get_me(current_user: User = Depends(get_current_user)):
     return current_user
 
 
+# 여러 사용자 요약 한 번에 조회 (채팅방 헤더, 작성자 표시)
+@router.post(":batchSummary", response_model=UserSummaryBatchResponse)
+def batch_summary(
+    payload: BatchGetRequest,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    if len(payload.ids) > settings.BATCH_GET_MAX_IDS:
+        raise HTTPException(status_code=400, detail="Too many ids")
+    found = request_loader(db, "users", crud.get_user_summaries).load_many(payload.ids)
+    return ORJSONResponse(batch_result(payload.ids, found))
+
+
 @router.get("/admin-only", response_model=UserMe)
 def admin_only(current_admin=Depends(get_current_admin)):
     return current_admin
@@ -102,7 +126,7 @@ class PasswordChangeRequest(BaseModel):
     old_password: str
     new_password: str
 
-@router.post("/change-password")
+@router.post("/change-password", dependencies=[Depends(password_hash_slots)])
 def change_password(
     req: PasswordChangeRequest,
     db: Session = Depends(get_db),
@@ -112,7 +136,6 @@ def change_password(
         raise HTTPException(status_code=400, detail="기존 패스워드가 일치하지 않습니다.")
 
     current_user.password_hash = get_password_hash(req.new_password)
-    db.commit()
 
     return {"message": "비밀번호가 변경되었습니다."}
 
@@ -131,10 +154,14 @@ def update_profile(
     if req.profile_image:
         current_user.profile_image = req.profile_image
 
-    db.commit()
-    db.refresh(current_user)
+    try:
+        db.flush()
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="NICKNAME_IN_USE") from e
 
-    return {"message": "프로필이 수정되었습니다.", "user": current_user}
+    # ORM 객체를 그대로 내보내면 password_hash/refresh_token까지 직렬화된다
+    return {"message": "프로필이 수정되었습니다.", "user": UserMeResponse.model_validate(current_user)}
 
 @router.post("/refresh")
 def refresh_token(refresh_token: str, response: Response, db: Session = Depends(get_db)):
@@ -146,6 +173,6 @@ def refresh_token(refresh_token: str, response: Response, db: Session = Depends(
     if not user or user.refresh_token != refresh_token:
         raise HTTPException(status_code=401, detail="Invalid refresh token")
 
-    new_access = create_access_token(user.id)
+    new_access = create_access_token(user.id, **access_claims(user))
     set_auth_cookies(response, new_access, refresh_token)
     return {"access_token": new_access}
@@ -0,0 +1,9 @@
+# schemas/batch.py
+from typing import List
+
+from pydantic import BaseModel, Field
+
+
+class BatchGetRequest(BaseModel):
+    # 최대 개수는 settings.BATCH_GET_MAX_IDS (라우터에서 확인)
+    ids: List[int] = Field(..., min_length=1)
@@ -0,0 +1,47 @@
+# schemas/category.py
+from pydantic import BaseModel
+from typing import List, Optional
+from db.models import CategoryType
+
+
+class CategoryCreate(BaseModel):
+    name: str
+    slug: Optional[str] = None
+    type: CategoryType = CategoryType.product
+    parent_id: Optional[int] = None
+    sort_order: int = 0
+    is_active: bool = True
+
+
+class CategoryUpdate(BaseModel):
+    # 보낸 필드만 바꾼다 (parent_id: null 이면 최상위로)
+    name: Optional[str] = None
+    slug: Optional[str] = None
+    type: Optional[CategoryType] = None
+    parent_id: Optional[int] = None
+    sort_order: Optional[int] = None
+    is_active: Optional[bool] = None
+
+
+class CategoryOut(BaseModel):
+    id: int
+    name: str
+    slug: Optional[str]
+    type: CategoryType
+    parent_id: Optional[int]
+    sort_order: int
+    is_active: bool
+
+    class Config:
+        from_attributes = True
+
+
+class CategoryNodeOut(BaseModel):
+    # GET /api/categories 트리 한 노드 (children 은 sort_order 순)
+    id: int
+    name: str
+    slug: Optional[str]
+    type: CategoryType
+    parent_id: Optional[int]
+    depth: int
+    children: List["CategoryNodeOut"] = []
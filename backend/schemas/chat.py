@@ -0,0 +1,55 @@
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel
+
+
+class ChatRoomCreate(BaseModel):
+    product_id: int
+
+
+class ChatRoomOut(BaseModel):
+    id: int
+    product_id: int
+    seller_id: int
+    buyer_id: int
+    created_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
+class ChatMessageOut(BaseModel):
+    id: int
+    room_id: int
+    sender_id: int
+    message: str
+    created_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
+class ChatMessageListResponse(BaseModel):
+    items: List[ChatMessageOut]
+    next_before_id: Optional[int] = None
+
+
+class ChatReadRequest(BaseModel):
+    message_id: Optional[int] = None
+
+
+class ChatInboxItem(BaseModel):
+    room_id: int
+    product_id: int
+    seller_id: int
+    buyer_id: int
+    last_message_id: Optional[int] = None
+    last_message_preview: Optional[str] = None
+    last_message_at: Optional[datetime] = None
+    unread_count: int
+    last_read_message_id: int
+
+    model_config = {"from_attributes": True}
+
+
+class ChatInboxResponse(BaseModel):
+    items: List[ChatInboxItem]
+    next_cursor: Optional[str] = None
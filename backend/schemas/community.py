@@ -9,6 +9,7 @@ from pydantic import BaseModel
 class CommunityPostImageOut(BaseModel):
     id: int
     image_url: str
+    thumbnail_url: Optional[str] = None
     sort_order: int
     created_at: datetime
 
@@ -43,12 +44,18 @@ class CommunityPostCreate(BaseModel):
     title: str
     content: str
     region_id: Optional[int] = None
+    category_id: Optional[int] = None
+    # 업로드한 이미지 id (POST /api/media/images) 뒤에 외부 URL 순서로 붙는다
+    image_asset_ids: Optional[List[int]] = None
     image_urls: Optional[List[str]] = None
 
 
 class CommunityPostUpdate(BaseModel):
     title: Optional[str] = None
     content: Optional[str] = None
+    is_hidden: Optional[bool] = None
+    # 둘 중 하나라도 주면 이미지 전체 교체
+    image_asset_ids: Optional[List[int]] = None
     image_urls: Optional[List[str]] = None
 
 
@@ -86,6 +93,8 @@ class CommunityPostListItem(BaseModel):
     comment_count: int
     view_count: int
     created_at: datetime
+    thumbnail_url: Optional[str] = None
+    liked_by_me: bool = False
 
     model_config = {"from_attributes": True}
 
@@ -94,7 +103,14 @@ class CommunityPostListResponse(BaseModel):
     items: List[CommunityPostListItem]
     page: int
     size: int
-    total: int
+    total: Optional[int] = None      # cursor로 이어 읽을 때는 계산하지 않음
+    next_cursor: Optional[str] = None
+
+
+class CommunityPostBatchResponse(BaseModel):
+    # 요청한 id 순서 그대로, 없거나 숨김/삭제된 글 자리는 null
+    items: List[Optional[CommunityPostListItem]]
+    missing: List[int]
 
 
 # ===============================
@@ -113,5 +129,6 @@ class CommunityPostDetail(BaseModel):
     like_count: int
     comment_count: int
     created_at: datetime
+    liked_by_me: bool = False
 
     model_config = {"from_attributes": True}
@@ -0,0 +1,83 @@
+# schemas/dto.py
+"""
+목록 응답용 projection DTO
+
+Core select 의 row 튜플을 그대로(위치 인자로) 받아 만들고, ORJSONResponse 로 바로 직렬화한다.
+ORM 엔티티 로딩, Pydantic 검증, jsonable_encoder 를 거치지 않는다.
+필드 순서는 crud 쪽 select 컬럼 순서와 같아야 한다. 문서(OpenAPI)는 같은 모양의 Pydantic 스키마를
+라우터의 response_model 로 남겨 둔다.
+"""
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional
+
+from db.models import ProductCondition, ProductStatus, ProductTradeType
+
+
+@dataclass(slots=True)
+class ProductItem:
+    # schemas.product.ProductResponse
+    id: int
+    title: str
+    price: int
+    description: Optional[str]
+    status: ProductStatus
+    like_count: int
+    seller_id: int
+    region_id: int
+    thumbnail_url: Optional[str]
+    liked_by_me: bool = False
+    chatted: bool = False
+
+
+@dataclass(slots=True)
+class ProductCard:
+    # schemas.product.ProductCardResponse (목록 카드: 설명/판매자 없음)
+    id: int
+    title: str
+    price: int
+    status: ProductStatus
+    condition: ProductCondition
+    trade_type: ProductTradeType
+    like_count: int
+    region_id: int
+    thumbnail_url: Optional[str]
+    created_at: datetime
+    liked_by_me: bool = False
+    chatted: bool = False
+
+
+@dataclass(slots=True)
+class ProductImageItem:
+    image_url: str
+    thumbnail_url: Optional[str]
+    sort_order: int
+
+
+@dataclass(slots=True)
+class ProductDetail(ProductItem):
+    # schemas.product.ProductDetailResponse
+    images: List[ProductImageItem] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class PostListItem:
+    # schemas.community.CommunityPostListItem
+    id: int
+    title: str
+    region_id: int
+    user_id: int
+    like_count: int
+    comment_count: int
+    view_count: int
+    created_at: datetime
+    thumbnail_url: Optional[str]
+    liked_by_me: bool = False
+
+
+@dataclass(slots=True)
+class UserSummary:
+    # schemas.user.UserSummaryOut
+    id: int
+    nickname: str
+    profile_image: Optional[str]
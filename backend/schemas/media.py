@@ -0,0 +1,18 @@
+# schemas/media.py
+from typing import Optional
+
+from pydantic import BaseModel
+
+from db.models import MediaAssetStatus
+
+
+class MediaAssetOut(BaseModel):
+    id: int
+    # processing 이어도 URL 은 정해져 있다 (변환이 끝나면 열린다)
+    status: MediaAssetStatus
+    content_type: str
+    byte_size: int
+    width: Optional[int] = None
+    height: Optional[int] = None
+    medium_url: str
+    thumbnail_url: str
@@ -0,0 +1,32 @@
+# schemas/notification.py
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class NotificationOut(BaseModel):
+    id: int
+    kind: str                       # post_like | comment_reply
+    target_id: int
+    post_id: Optional[int] = None
+    actor_id: Optional[int] = None  # 가장 최근 행위자
+    actor_nickname: Optional[str] = None
+    actor_count: int                # 안 읽은 동안 합쳐진 사람 수
+    message: str
+    is_read: bool
+    created_at: datetime
+
+
+class NotificationListResponse(BaseModel):
+    items: List[NotificationOut]
+    next_cursor: Optional[str] = None
+
+
+class UnreadCountResponse(BaseModel):
+    unread: int
+
+
+class NotificationReadRequest(BaseModel):
+    # 없으면 전부 읽음
+    ids: Optional[List[int]] = None
@@ -1,13 +1,23 @@
 # schemas/product.py
-from pydantic import BaseModel
+from datetime import datetime
+
+from pydantic import BaseModel, model_validator
 from typing import List, Optional
 from db.models import ProductCondition, ProductTradeType, ProductStatus
 
 
 class ProductImageCreate(BaseModel):
-    image_url: str
+    # 업로드한 이미지(POST /api/media/images 의 id) 또는 외부 URL 중 하나
+    asset_id: Optional[int] = None
+    image_url: Optional[str] = None
     sort_order: int = 0
 
+    @model_validator(mode="after")
+    def _one_source(self):
+        if (self.asset_id is None) == (self.image_url is None):
+            raise ValueError("asset_id 또는 image_url 중 하나만 지정해야 합니다.")
+        return self
+
 
 class ProductCreate(BaseModel):
     title: str
@@ -43,10 +53,64 @@ class ProductResponse(BaseModel):
     like_count: int
     seller_id: int
     region_id: int
+    thumbnail_url: Optional[str] = None
+
+    # 조회한 사용자 기준 상태 (비로그인이면 False)
+    liked_by_me: bool = False
+    chatted: bool = False
+
+    class Config:
+        from_attributes = True
+
+
+class ProductCardResponse(BaseModel):
+    id: int
+    title: str
+    price: int
+    status: ProductStatus
+    condition: ProductCondition
+    trade_type: ProductTradeType
+    like_count: int
+    region_id: int
+    thumbnail_url: Optional[str] = None
+    created_at: datetime
+
+    liked_by_me: bool = False
+    chatted: bool = False
+
+
+class ProductListResponse(BaseModel):
+    items: List[ProductCardResponse]
+    # 다음 페이지 커서 (없으면 마지막 페이지). 커서는 sort 와 짝
+    next_cursor: Optional[str] = None
+
+
+class ProductImageOut(BaseModel):
+    image_url: str
+    thumbnail_url: Optional[str] = None
+    sort_order: int = 0
 
     class Config:
         from_attributes = True
 
 
 class ProductDetailResponse(ProductResponse):
-    images: List[ProductImageCreate]
+    images: List[ProductImageOut]
+
+
+class ProductImportRowError(BaseModel):
+    line: int
+    error: str
+
+
+class ProductImportResult(BaseModel):
+    total: int = 0
+    created: int = 0
+    failed: int = 0
+    errors: List[ProductImportRowError] = []
+
+
+class ProductBatchResponse(BaseModel):
+    # 요청한 id 순서 그대로, 없거나 삭제/숨김인 상품 자리는 null
+    items: List[Optional[ProductDetailResponse]]
+    missing: List[int]
@@ -1,3 +1,6 @@
+from datetime import datetime
+from typing import List, Optional
+
 from pydantic import BaseModel
 
 class UserRegister(BaseModel):
@@ -8,3 +11,19 @@ class UserRegister(BaseModel):
 class UserLogin(BaseModel):
     email: str
     password: str
+
+class UserSuspendRequest(BaseModel):
+    until: datetime
+    reason: Optional[str] = None
+
+
+class UserSummaryOut(BaseModel):
+    id: int
+    nickname: str
+    profile_image: Optional[str] = None
+
+
+class UserSummaryBatchResponse(BaseModel):
+    # 요청한 id 순서 그대로, 없거나 탈퇴한 사용자 자리는 null
+    items: List[Optional[UserSummaryOut]]
+    missing: List[int]
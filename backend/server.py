@@ -0,0 +1,146 @@
+# server.py
+"""
+운영 서버 진입점 (Dockerfile CMD)
+
+    python server.py
+
+gunicorn master가 앱을 한 번 import(preload)한 뒤 uvicorn 워커를 fork 한다.
+- 워커 수: WEB_WORKERS, 0이면 cgroup CPU quota (k8s resources.limits.cpu). quota가 없으면 사용 가능한 CPU 수
+- fork 뒤 워커마다 engine.dispose(close=False): master에서 만든 커넥션 풀을 물려받아 같이 쓰지 않게
+- create_all 은 fork 전에 master에서 한 번만 돌리고 워커 startup에서는 끈다
+- PORT 와 INTERNAL_PORT 두 곳에서 받는다. /metrics, /internal/* 는 INTERNAL_PORT 로만 응답 (ingress 에 안 열림)
+- 워커는 WEB_MAX_REQUESTS(+jitter) 요청마다 재시작 (메모리 누수/단편화 완화)
+- SIGTERM: 새 연결을 받지 않고 진행 중 요청을 WEB_GRACEFUL_TIMEOUT_SECONDS 까지 기다린다.
+  SSE/WebSocket처럼 끝나지 않는 연결은 그 전에 끊고 lifespan shutdown(채팅 flush)을 돌린다
+
+memory:// 브로커, local:// 캐시는 프로세스 안에만 있으므로 워커가 여럿이면 채팅 fan-out과
+타임라인/요청 제한이 워커마다 갈라진다. 이 경우 WEB_WORKERS 를 직접 지정하지 않았으면 1개로 띄운다.
+로컬 개발은 그대로 `uvicorn main:app --reload`.
+"""
+import logging
+import math
+import os
+from typing import Optional
+
+from gunicorn.app.base import BaseApplication
+from uvicorn_worker import UvicornWorker
+
+from core.config import settings
+
+logger = logging.getLogger("server")
+
+# SIGTERM 뒤 uvicorn이 끝나지 않는 연결을 끊고 lifespan shutdown을 돌릴 여유 (master가 SIGKILL 하기 전)
+_SHUTDOWN_MARGIN_SECONDS = 5
+
+
+def cgroup_cpu_limit() -> Optional[float]:
+    """
+    컨테이너 CPU quota (코어 수). 제한이 없으면 None
+    """
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:  # cgroup v2: "<quota> <period>" | "max <period>"
+            quota, period = f.read().split()[:2]
+        return None if quota == "max" else int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    try:
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:  # cgroup v1
+            quota = int(f.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+            period = int(f.read())
+        return quota / period if quota > 0 else None
+    except (OSError, ValueError):
+        return None
+
+
+def default_workers() -> int:
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+    limit = cgroup_cpu_limit()
+    if limit is not None:
+        cpus = min(cpus, math.ceil(limit))
+    return max(1, cpus)
+
+
+def worker_count() -> int:
+    if settings.WEB_WORKERS > 0:
+        return settings.WEB_WORKERS
+    workers = default_workers()
+    local = [
+        url for url in (settings.BROKER_URL, settings.CACHE_URL)
+        if url.startswith(("memory://", "local://"))
+    ]
+    if workers > 1 and local:
+        logger.warning(
+            "process-local backends (%s) cannot be shared between workers; starting 1 worker "
+            "instead of %d (set BROKER_URL/CACHE_URL to redis:// or WEB_WORKERS explicitly)",
+            ", ".join(local), workers,
+        )
+        return 1
+    return workers
+
+
+class Worker(UvicornWorker):
+    CONFIG_KWARGS = {
+        **UvicornWorker.CONFIG_KWARGS,
+        "timeout_graceful_shutdown": max(1, settings.WEB_GRACEFUL_TIMEOUT_SECONDS - _SHUTDOWN_MARGIN_SECONDS),
+    }
+
+
+def post_fork(server, worker):
+    # master가 import 중에 만든 풀(커넥션)이 있더라도 자식은 새로 연결한다. 부모 소켓은 닫지 않는다
+    from db.session import engine
+
+    engine.dispose(close=False)
+
+
+class Server(BaseApplication):
+    def __init__(self, options: dict):
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        from db.session import engine
+        from main import app, create_tables
+
+        if settings.DB_CREATE_ALL_ON_STARTUP:
+            create_tables()
+            settings.DB_CREATE_ALL_ON_STARTUP = False  # fork 된 워커에 그대로 물려준다
+            engine.dispose()
+        return app
+
+
+def binds() -> list:
+    # PORT: ingress 로 들어오는 API 트래픽, INTERNAL_PORT: /metrics, /internal/* (클러스터 안에서만)
+    addrs = [f"0.0.0.0:{settings.PORT}"]
+    if settings.INTERNAL_PORT and settings.INTERNAL_PORT != settings.PORT:
+        addrs.append(f"0.0.0.0:{settings.INTERNAL_PORT}")
+    return addrs
+
+
+def options() -> dict:
+    return {
+        "bind": binds(),
+        "workers": worker_count(),
+        "worker_class": Worker,
+        "preload_app": True,
+        "post_fork": post_fork,
+        "backlog": settings.WEB_BACKLOG,
+        "keepalive": settings.WEB_KEEPALIVE_SECONDS,
+        "timeout": settings.WEB_TIMEOUT_SECONDS,
+        "graceful_timeout": settings.WEB_GRACEFUL_TIMEOUT_SECONDS,
+        "max_requests": settings.WEB_MAX_REQUESTS,
+        "max_requests_jitter": settings.WEB_MAX_REQUESTS_JITTER,
+        # ingress 뒤: 이 주소에서 온 X-Forwarded-For/Proto 만 신뢰 (클라이언트 IP는 ratelimit.client_ip)
+        "forwarded_allow_ips": settings.WEB_FORWARDED_ALLOW_IPS,
+        "accesslog": "-",
+        "errorlog": "-",
+    }
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    Server(options()).run()
@@ -0,0 +1,230 @@
+# services/chat.py
+"""
+WebSocket 채팅 엔진
+
+- ChatMessageWriter : 메시지를 모아서 CHAT_FLUSH_INTERVAL_MS 마다 한 트랜잭션에 INSERT + commit 1번
+                      (group commit). 저장된 순서대로 브로커에 publish 한다.
+- ChatHub           : 방 별 로컬 연결 목록. 이 파드에 방 연결이 처음 생길 때만 브로커 채널을
+                      구독하고, 브로커에서 받은 메시지를 로컬 연결에 fan-out 한다.
+- ChatConnection    : 연결별 송신 큐(최대 CHAT_SEND_QUEUE_SIZE). 큐가 차면 느린 클라이언트로 보고 끊는다.
+"""
+import asyncio
+import json
+import logging
+from typing import Dict, List, Set, Tuple
+
+from fastapi import WebSocket
+from starlette.concurrency import run_in_threadpool
+
+from core.broker import Broker, broker
+from core.config import settings
+from db import crud_chat
+from db.session import session_scope
+
+logger = logging.getLogger(__name__)
+
+# 송신 큐가 넘친 연결을 닫을 때 쓰는 close code (1013: Try Again Later)
+WS_CLOSE_SLOW_CONSUMER = 1013
+
+
+def room_channel(room_id: int) -> str:
+    return f"chat:room:{room_id}"
+
+
+# =========================
+# 연결
+# =========================
+
+class ChatConnection:
+    def __init__(self, websocket: WebSocket, user_id: int, room_id: int):
+        self.websocket = websocket
+        self.user_id = user_id
+        self.room_id = room_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=settings.CHAT_SEND_QUEUE_SIZE)
+        self.closed = False
+
+    def offer(self, data: str) -> bool:
+        """
+        fan-out 경로에서 호출 (블로킹 금지). 큐가 가득 차면 False
+        """
+        if self.closed:
+            return True
+        try:
+            self.queue.put_nowait(data)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    async def send_loop(self):
+        while True:
+            data = await self.queue.get()
+            await self.websocket.send_text(data)
+
+    async def close(self, code: int = 1000):
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            await self.websocket.close(code=code)
+        except RuntimeError:
+            # 이미 닫힌 소켓
+            pass
+
+
+# =========================
+# group commit
+# =========================
+
+class ChatMessageWriter:
+    def __init__(self, publish):
+        self._publish = publish
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: asyncio.Task | None = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        # 남은 메시지는 마지막으로 한 번 저장
+        batch = []
+        while not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        if batch:
+            await self._flush(batch)
+
+    async def submit(self, room_id: int, sender_id: int, message: str) -> dict:
+        """
+        저장(commit)이 끝나면 저장된 메시지(dict)를 돌려준다
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((crud_chat.new_message_row(room_id, sender_id, message), future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        interval = settings.CHAT_FLUSH_INTERVAL_MS / 1000
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + interval
+            while len(batch) < settings.CHAT_FLUSH_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await self._flush(batch)
+
+    @staticmethod
+    def _persist(rows: List[dict]) -> List[int]:
+        with session_scope() as db:
+            ids = crud_chat.insert_messages(db, rows)
+            crud_chat.apply_new_messages(db, rows, ids)
+            return ids
+
+    async def _flush(self, batch: List[Tuple[dict, asyncio.Future]]):
+        rows = [row for row, _ in batch]
+        try:
+            ids = await run_in_threadpool(self._persist, rows)
+        except Exception as e:
+            logger.exception("chat message flush failed (%d messages)", len(rows))
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for message_id, (row, future) in zip(ids, batch):
+            message = {
+                "id": message_id,
+                "room_id": row["room_id"],
+                "sender_id": row["sender_id"],
+                "message": row["message"],
+                "created_at": row["created_at"].isoformat(),
+            }
+            try:
+                await self._publish(message)
+            except Exception:
+                logger.exception("chat publish failed (message_id=%s)", message_id)
+            if not future.done():
+                future.set_result(message)
+
+
+# =========================
+# Hub
+# =========================
+
+class ChatHub:
+    def __init__(self, broker: Broker):
+        self.broker = broker
+        self.rooms: Dict[int, Set[ChatConnection]] = {}
+        self.writer = ChatMessageWriter(self._publish)
+
+    async def start(self):
+        self.writer.start()
+
+    async def stop(self):
+        await self.writer.stop()
+
+    async def _publish(self, message: dict):
+        payload = json.dumps({"type": "message", **message}, ensure_ascii=False)
+        await self.broker.publish(room_channel(message["room_id"]), payload)
+
+    def _on_broker_message(self, channel: str, data: str):
+        room_id = int(channel.rsplit(":", 1)[1])
+        for conn in list(self.rooms.get(room_id, ())):
+            if not conn.offer(data):
+                logger.warning("closing slow chat consumer (room=%s, user=%s)", room_id, conn.user_id)
+                asyncio.create_task(conn.close(WS_CLOSE_SLOW_CONSUMER))
+
+    async def join(self, conn: ChatConnection):
+        conns = self.rooms.setdefault(conn.room_id, set())
+        conns.add(conn)
+        if len(conns) == 1:
+            await self.broker.subscribe(room_channel(conn.room_id), self._on_broker_message)
+
+    async def leave(self, conn: ChatConnection):
+        conns = self.rooms.get(conn.room_id)
+        if not conns:
+            return
+        conns.discard(conn)
+        if not conns:
+            del self.rooms[conn.room_id]
+            await self.broker.unsubscribe(room_channel(conn.room_id), self._on_broker_message)
+
+    async def send(self, conn: ChatConnection, text: str) -> dict:
+        return await self.writer.submit(conn.room_id, conn.user_id, text)
+
+    async def serve(self, conn: ChatConnection):
+        """
+        연결 하나의 수명: 송신 루프와 수신 루프를 같이 돌리고, 어느 쪽이든 끝나면 정리
+        수신 루프는 메시지가 저장될 때까지 다음 메시지를 읽지 않는다 (연결당 in-flight 1개)
+        """
+        await self.join(conn)
+        sender = asyncio.create_task(conn.send_loop())
+        try:
+            while not conn.closed:
+                try:
+                    payload = await conn.websocket.receive_json()
+                except (ValueError, KeyError):
+                    continue
+                text = str(payload.get("message", "")).strip() if isinstance(payload, dict) else ""
+                if not text or len(text) > settings.CHAT_MESSAGE_MAX_LENGTH:
+                    continue
+                try:
+                    await self.send(conn, text)
+                except Exception:
+                    conn.offer(json.dumps({"type": "error", "detail": "message_not_saved"}))
+        finally:
+            sender.cancel()
+            await self.leave(conn)
+
+
+chat_hub = ChatHub(broker)
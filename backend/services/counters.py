@@ -0,0 +1,57 @@
+# services/counters.py
+"""
+좋아요 shard compactor: COUNTER_COMPACT_INTERVAL_SECONDS 마다 counter_shards 를 원본 like_count에 합친다.
+워커/파드마다 돌아도 SKIP LOCKED 로 서로 다른 shard 행을 가져가므로 겹치지 않는다.
+"""
+import asyncio
+import logging
+
+from starlette.concurrency import run_in_threadpool
+
+from core.config import settings
+from db.crud_counter import compact_counter_shards
+from db.session import session_scope
+
+logger = logging.getLogger(__name__)
+
+
+def compact_once(batch_size: int) -> int:
+    """
+    shard가 남지 않을 때까지 batch_size 단위로 commit. 처리한 shard 행 수
+    """
+    total = 0
+    while True:
+        with session_scope() as db:
+            count = compact_counter_shards(db, batch_size=batch_size)
+        total += count
+        if count < batch_size:
+            return total
+
+
+class CounterCompactor:
+    def __init__(self):
+        self._task: asyncio.Task | None = None
+
+    def start(self):
+        if settings.COUNTER_SHARDING_ENABLED:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(settings.COUNTER_COMPACT_INTERVAL_SECONDS)
+            try:
+                await run_in_threadpool(compact_once, settings.COUNTER_COMPACT_BATCH_SIZE)
+            except Exception:
+                logger.exception("counter shard compaction failed")
+
+
+counter_compactor = CounterCompactor()
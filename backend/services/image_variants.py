@@ -0,0 +1,82 @@
+# services/image_variants.py
+"""
+이미지 검사/변환 (Pillow)
+
+render_variants 는 services/media.py 의 프로세스 풀(spawn)에서 돈다. 자식 프로세스가 앱 설정/DB를
+import 하지 않도록 이 모듈은 Pillow 와 표준 라이브러리만 쓰고, 설정 값은 인자로 받는다.
+"""
+import os
+from typing import Dict, Tuple
+
+# Pillow 포맷 -> 저장할 Content-Type (MPO: 아이폰 등에서 나오는 멀티 픽처 JPEG)
+ALLOWED_FORMATS = {
+    "JPEG": "image/jpeg",
+    "MPO": "image/jpeg",
+    "PNG": "image/png",
+    "WEBP": "image/webp",
+}
+
+VARIANT_CONTENT_TYPE = "image/jpeg"
+
+# EXIF Orientation 중 90/270도 회전 (가로/세로가 바뀐다)
+_ORIENTATION_TAG = 0x0112
+_ROTATED_ORIENTATIONS = {5, 6, 7, 8}
+
+
+def probe(path: str, max_pixels: int) -> Tuple[str, int, int]:
+    """
+    헤더만 읽어서 (content_type, width, height). 크기는 EXIF 회전을 반영한 값
+    지원하지 않는 형식이거나 너무 크면 ValueError
+    """
+    from PIL import Image, UnidentifiedImageError
+
+    try:
+        with Image.open(path) as img:
+            fmt, (width, height) = img.format, img.size
+            rotated = img.getexif().get(_ORIENTATION_TAG) in _ROTATED_ORIENTATIONS
+    except (UnidentifiedImageError, OSError):
+        raise ValueError("Unsupported image")
+    if fmt not in ALLOWED_FORMATS:
+        raise ValueError(f"Unsupported image format: {fmt}")
+    if width * height > max_pixels:
+        raise ValueError("Image is too large")
+    if rotated:
+        width, height = height, width
+    return ALLOWED_FORMATS[fmt], width, height
+
+
+def render_variants(
+    src_path: str,
+    out_dir: str,
+    sizes: Dict[str, int],
+    quality: int,
+    max_pixels: int,
+) -> Dict[str, str]:
+    """
+    sizes: {"thumb.jpg": 320, "medium.jpg": 1280} 처럼 파일 이름 -> 긴 변 px (작은 원본은 키우지 않는다)
+    EXIF 회전을 반영하고 메타데이터(EXIF/GPS)는 버린 JPEG 로 out_dir/<파일 이름> 에 쓴다
+    돌려주는 값: {파일 이름: 경로}
+    """
+    from PIL import Image, ImageOps
+
+    Image.MAX_IMAGE_PIXELS = max_pixels
+    with Image.open(src_path) as img:
+        # JPEG 는 필요한 가장 큰 크기에 맞춰 1/2, 1/4, 1/8 로 줄여서 디코딩 (큰 사진에서 가장 비싼 부분)
+        largest = max(sizes.values())
+        img.draft("RGB", (largest, largest))
+        img = ImageOps.exif_transpose(img)
+        if img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info):
+            rgba = img.convert("RGBA")
+            img = Image.new("RGB", rgba.size, (255, 255, 255))
+            img.paste(rgba, mask=rgba.getchannel("A"))
+        elif img.mode != "RGB":
+            img = img.convert("RGB")
+
+        variants = {}
+        for name, size in sorted(sizes.items(), key=lambda kv: kv[1], reverse=True):
+            variant = img.copy()
+            variant.thumbnail((size, size), Image.LANCZOS)
+            path = os.path.join(out_dir, name)
+            variant.save(path, "JPEG", quality=quality, optimize=True, progressive=True)
+            variants[name] = path
+        return variants
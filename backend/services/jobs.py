@@ -0,0 +1,216 @@
+# services/jobs.py
+"""
+백그라운드 작업 실행기 (jobs 테이블 큐)
+
+큐(JOB_QUEUES)마다 asyncio 루프 하나:
+  빈 자리가 생기면 claim_jobs (SKIP LOCKED, lease) -> 같은 batch 종류끼리 묶어서 -> 핸들러 실행(threadpool)
+  성공: 핸들러의 쓰기 + 작업 행 삭제를 한 번에 commit
+  실패: rollback 후 backoff 뒤로 재시도, 시도를 다 쓰면 failed
+새 작업이 없으면 JOB_POLL_INTERVAL_SECONDS 마다 확인하고, 같은 프로세스에서 enqueue 된 작업은 commit 직후 바로 깨운다.
+
+앱 워커 안에서 돌거나(JOBS_RUN_IN_APP) `python cli.py run-jobs` 로 따로 띄운다. 여러 프로세스가 같이 돌아도
+SKIP LOCKED 로 서로 다른 행을 가져가므로 겹치지 않는다.
+"""
+import asyncio
+import importlib
+import logging
+from contextlib import suppress
+from typing import Dict, List, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from core.config import settings
+from core.jobs import HANDLER_MODULES, JobSpec, add_waker, get_spec, remove_waker
+from core.metrics import counter, gauge
+from db import crud_job
+from db.crud_job import ClaimedJob
+from db.session import session_scope
+
+logger = logging.getLogger(__name__)
+
+jobs_processed = counter("jobs_processed_total", "Background jobs by kind and result (done/retry/failed)")
+jobs_running = gauge("jobs_running", "Background job handler calls in progress per queue")
+jobs_claim_errors = counter("jobs_claim_errors_total", "Failed attempts to claim jobs per queue")
+
+
+class LeaseLost(Exception):
+    pass
+
+
+def queue_config() -> Dict[str, int]:
+    """
+    JOB_QUEUES "default:4,counters:1" -> {"default": 4, "counters": 1}
+    """
+    queues = {}
+    for item in settings.JOB_QUEUES.split(","):
+        name, _, concurrency = item.strip().partition(":")
+        if name:
+            queues[name] = max(int(concurrency or 1), 1)
+    return queues
+
+
+def load_handlers():
+    for module in HANDLER_MODULES:
+        importlib.import_module(module)
+
+
+def _claim(queue: str) -> List[ClaimedJob]:
+    with session_scope() as db:
+        return crud_job.claim_jobs(db, queue, settings.JOB_CLAIM_BATCH, settings.JOB_LEASE_SECONDS)
+
+
+def _group(claimed: List[ClaimedJob]) -> Tuple[List[Tuple[JobSpec, List[ClaimedJob]]], List[ClaimedJob]]:
+    """
+    (핸들러 호출 목록, 등록되지 않은 종류). batch 종류는 한 번 꺼낸 것끼리 한 호출로 묶는다
+    """
+    calls: List[Tuple[JobSpec, List[ClaimedJob]]] = []
+    batches: Dict[str, List[ClaimedJob]] = {}
+    unknown = []
+    for job in claimed:
+        spec = get_spec(job.kind)
+        if spec is None:
+            unknown.append(job)
+        elif spec.batch:
+            if job.kind not in batches:
+                batches[job.kind] = []
+                calls.append((spec, batches[job.kind]))
+            batches[job.kind].append(job)
+        else:
+            calls.append((spec, [job]))
+    return calls, unknown
+
+
+def _run_handler(spec: JobSpec, jobs: List[ClaimedJob]):
+    with session_scope() as db:
+        if spec.batch:
+            spec.handler(db, [j.payload for j in jobs])
+        else:
+            spec.handler(db, jobs[0].payload)
+        if not crud_job.finish_jobs(db, jobs):
+            # 다른 실행기가 lease 가 끝난 작업을 다시 가져갔다: 이쪽 결과는 버린다
+            raise LeaseLost(spec.kind)
+
+
+def _fail(kind: str, jobs: List[ClaimedJob], error: str, retry: bool = True):
+    with session_scope() as db:
+        retried, gave_up = crud_job.fail_jobs(db, jobs, error, retry=retry)
+    if retried:
+        jobs_processed.inc(retried, kind=kind, result="retry")
+    if gave_up:
+        jobs_processed.inc(gave_up, kind=kind, result="failed")
+
+
+def run_claimed(spec: JobSpec, jobs: List[ClaimedJob]):
+    """
+    threadpool 에서: 핸들러 실행 + 결과 기록
+    """
+    try:
+        _run_handler(spec, jobs)
+    except LeaseLost:
+        logger.warning("job lease lost (kind=%s, ids=%s)", spec.kind, [j.id for j in jobs])
+        return
+    except Exception as e:
+        logger.exception("job failed (kind=%s, ids=%s)", spec.kind, [j.id for j in jobs])
+        _fail(spec.kind, jobs, f"{type(e).__name__}: {e}")
+        return
+    jobs_processed.inc(len(jobs), kind=spec.kind, result="done")
+
+
+class JobRunner:
+    def __init__(self):
+        self._loop = None
+        self._wake: Dict[str, asyncio.Event] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._calls = set()
+
+    def start(self):
+        load_handlers()
+        self._loop = asyncio.get_running_loop()
+        for queue, concurrency in queue_config().items():
+            self._wake[queue] = asyncio.Event()
+            self._tasks.append(asyncio.create_task(self._run_queue(queue, concurrency)))
+        add_waker(self.wake)
+
+    def wake(self, queue: str):
+        # on_commit 에서 호출 (threadpool 스레드일 수 있다)
+        event = self._wake.get(queue)
+        if event is not None and self._loop is not None:
+            self._loop.call_soon_threadsafe(event.set)
+
+    async def _run_queue(self, queue: str, concurrency: int):
+        slots = asyncio.Semaphore(concurrency)
+        wake = self._wake[queue]
+        while True:
+            # 빈 자리가 생길 때까지 기다렸다가 꺼낸다 (꺼낸 작업은 lease 동안 이 프로세스 몫)
+            await slots.acquire()
+            slots.release()
+            wake.clear()
+            try:
+                claimed = await run_in_threadpool(_claim, queue)
+            except Exception:
+                logger.exception("job claim failed (queue=%s)", queue)
+                jobs_claim_errors.inc(queue=queue)
+                claimed = []
+
+            calls, unknown = _group(claimed)
+            for job in unknown:
+                # 이 프로세스에 핸들러가 없다 (HANDLER_MODULES 누락, 배포 버전 차이): 재시도하지 않고 멈춰 둔다
+                logger.error("no handler for job kind %s (id=%s)", job.kind, job.id)
+                await run_in_threadpool(_fail, job.kind, [job], "unknown job kind", False)
+            for spec, jobs in calls:
+                await slots.acquire()
+                task = asyncio.create_task(self._call(queue, spec, jobs, slots))
+                self._calls.add(task)
+                task.add_done_callback(self._calls.discard)
+
+            if len(claimed) < settings.JOB_CLAIM_BATCH:
+                with suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(wake.wait(), settings.JOB_POLL_INTERVAL_SECONDS)
+
+    async def _call(self, queue: str, spec: JobSpec, jobs: List[ClaimedJob], slots: asyncio.Semaphore):
+        jobs_running.inc(queue=queue)
+        try:
+            await run_in_threadpool(run_claimed, spec, jobs)
+        finally:
+            jobs_running.dec(queue=queue)
+            slots.release()
+
+    async def stop(self, timeout: float = 10):
+        remove_waker(self.wake)
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            with suppress(asyncio.CancelledError):
+                await task
+        self._tasks.clear()
+        # 실행 중인 핸들러는 잠깐 기다려 준다 (못 끝낸 작업은 lease 가 끝나면 다른 실행기가 가져간다)
+        if self._calls:
+            await asyncio.wait(set(self._calls), timeout=timeout)
+
+
+job_runner = JobRunner()
+
+
+async def run_forever():
+    """
+    cli run-jobs: 앱 없이 실행기만. SIGTERM/SIGINT 에서 진행 중인 핸들러를 기다린 뒤 종료
+    """
+    import signal
+
+    from core.broker import broker
+    from core.events import counter_bus
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+
+    # 핸들러가 내는 실시간 카운터 이벤트를 앱과 같은 broker 로 내보낸다
+    await broker.start()
+    await counter_bus.start()
+    job_runner.start()
+    logger.info("job runner started (queues=%s)", queue_config())
+    await stop.wait()
+    await job_runner.stop(timeout=settings.WEB_GRACEFUL_TIMEOUT_SECONDS)
+    await counter_bus.stop()
+    await broker.close()
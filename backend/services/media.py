@@ -0,0 +1,342 @@
+# services/media.py
+"""
+이미지 업로드 파이프라인
+
+1. receive_upload : multipart 본문을 받는 대로 임시 파일에 쓰면서 sha256 계산 (본문을 메모리에 모으지 않음)
+2. accept_upload  : 같은 해시가 이미 있으면 그 asset 을 돌려준다 (dedup).
+                    없으면 헤더만 읽어 형식/크기 확인 -> 원본을 저장소(core/storage.py)에 올리고 media_assets 행 생성
+3. media_processor: thumb/medium 변환을 프로세스 풀에서 돌리고 (이벤트 루프/threadpool 을 CPU로 막지 않게)
+                    결과를 저장소에 올린 뒤 ready 로 바꾼다. 응답은 변환을 기다리지 않는다
+
+저장소 키/URL 은 내용 해시로 정해지므로 변환이 끝나기 전에도 상품/게시글에 붙일 수 있다.
+원본(EXIF/GPS 포함)의 URL 은 응답에 내보내지 않고, 변환본만 공개한다.
+변환 중에 프로세스가 죽어 processing 으로 남은 것은 `python cli.py process-media` 로 다시 돌린다.
+"""
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from fastapi import HTTPException, Request, status
+from python_multipart import MultipartParser
+from python_multipart.exceptions import MultipartParseError
+from python_multipart.multipart import parse_options_header
+from starlette.concurrency import run_in_threadpool
+
+from core.config import settings
+from core.metrics import counter
+from core.storage import media_key, storage
+from db import crud_media
+from db.crud_media import MEDIUM, ORIGINAL, THUMB, asset_url
+from db.models import MediaAssetStatus
+from db.session import session_scope
+from schemas.media import MediaAssetOut
+from services.image_variants import VARIANT_CONTENT_TYPE, probe, render_variants
+
+logger = logging.getLogger(__name__)
+
+media_uploads = counter("media_uploads_total", "Image uploads by result (created/deduplicated/rejected)")
+media_processed = counter("media_processed_total", "Image variant jobs by final status")
+
+# multipart 경계/헤더 몫으로 Content-Length 에 더 허용하는 바이트
+_MULTIPART_OVERHEAD = 16 * 1024
+UPLOAD_FIELD = b"file"
+
+
+def variant_sizes() -> Dict[str, int]:
+    return {THUMB: settings.MEDIA_THUMB_SIZE, MEDIUM: settings.MEDIA_MEDIUM_SIZE}
+
+
+def asset_out(asset) -> MediaAssetOut:
+    return MediaAssetOut(
+        id=asset.id,
+        status=asset.status,
+        content_type=asset.content_type,
+        byte_size=asset.byte_size,
+        width=asset.width,
+        height=asset.height,
+        medium_url=asset_url(asset.sha256, MEDIUM),
+        thumbnail_url=asset_url(asset.sha256, THUMB),
+    )
+
+
+# =========================
+# 1. 본문 수신
+# =========================
+
+@dataclass
+class Upload:
+    path: str          # 임시 파일 (소유권은 accept_upload 로 넘어간다)
+    sha256: str
+    byte_size: int
+    filename: Optional[str] = None
+
+
+class _UploadPart:
+    """
+    MultipartParser 콜백 상태. UPLOAD_FIELD 파트의 데이터만 pending 에 모은다 (청크 단위로 비운다)
+    """
+
+    def __init__(self):
+        self.header_field = b""
+        self.header_value = b""
+        self.disposition = b""
+        self.capturing = False
+        self.found = False
+        self.filename: Optional[str] = None
+        self.pending = []
+
+    def callbacks(self) -> dict:
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+        }
+
+    def on_part_begin(self):
+        self.disposition = b""
+
+    def on_header_field(self, data, start, end):
+        self.header_field += data[start:end]
+
+    def on_header_value(self, data, start, end):
+        self.header_value += data[start:end]
+
+    def on_header_end(self):
+        if self.header_field.lower() == b"content-disposition":
+            self.disposition = self.header_value
+        self.header_field = self.header_value = b""
+
+    def on_headers_finished(self):
+        _, options = parse_options_header(self.disposition)
+        # 파일 파트는 첫 번째 것만 받고 나머지 파트는 버린다
+        self.capturing = not self.found and options.get(b"name") == UPLOAD_FIELD and b"filename" in options
+        if self.capturing:
+            self.found = True
+            self.filename = options[b"filename"].decode("utf-8", "replace")
+
+    def on_part_data(self, data, start, end):
+        if self.capturing:
+            self.pending.append(bytes(data[start:end]))
+
+    def on_part_end(self):
+        self.capturing = False
+
+
+def _write_chunk(f, hasher, data: bytes):
+    # threadpool 에서: 파일 쓰기 + 해시 (hashlib 은 큰 버퍼에서 GIL 을 놓는다)
+    hasher.update(data)
+    f.write(data)
+
+
+async def receive_upload(request: Request, max_bytes: int) -> Upload:
+    """
+    multipart/form-data 의 `file` 파트를 임시 파일로 받는다. 크기를 넘으면 바로 413
+    """
+    content_type, params = parse_options_header(request.headers.get("content-type"))
+    boundary = params.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise HTTPException(status_code=400, detail="multipart/form-data body required")
+
+    limit = max_bytes + _MULTIPART_OVERHEAD
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > limit:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="Upload too large")
+
+    part = _UploadPart()
+    parser = MultipartParser(boundary, part.callbacks())
+    hasher = hashlib.sha256()
+    fd, path = tempfile.mkstemp(prefix="upload-")
+    f = os.fdopen(fd, "wb")
+    received = size = 0
+    try:
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > limit:
+                raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="Upload too large")
+            parser.write(chunk)
+            if part.pending:
+                data = b"".join(part.pending)
+                part.pending.clear()
+                size += len(data)
+                if size > max_bytes:
+                    raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="Upload too large")
+                await run_in_threadpool(_write_chunk, f, hasher, data)
+        parser.finalize()
+        if not part.found:
+            raise HTTPException(status_code=400, detail="Missing 'file' part")
+    except MultipartParseError:
+        f.close()
+        os.unlink(path)
+        raise HTTPException(status_code=400, detail="Malformed multipart body")
+    except BaseException:
+        f.close()
+        os.unlink(path)
+        raise
+    f.close()
+    return Upload(path=path, sha256=hasher.hexdigest(), byte_size=size, filename=part.filename)
+
+
+# =========================
+# 2. dedup + 원본 저장
+# =========================
+
+def _save_upload(upload: Upload, uploader_id: int) -> Tuple[object, bool]:
+    """
+    (asset 행, 변환이 필요한지). 지원하지 않는 이미지면 ValueError
+    """
+    with session_scope() as db:
+        existing = crud_media.get_asset_by_sha(db, upload.sha256)
+    if existing is not None and existing.status != MediaAssetStatus.failed:
+        return existing, False
+
+    content_type, width, height = probe(upload.path, settings.MEDIA_MAX_PIXELS)
+    storage.put_file(media_key(upload.sha256, ORIGINAL), upload.path, content_type)
+    with session_scope() as db:
+        asset = crud_media.create_asset(
+            db,
+            sha256=upload.sha256,
+            uploader_id=uploader_id,
+            content_type=content_type,
+            byte_size=upload.byte_size,
+            width=width,
+            height=height,
+        )
+    return asset, True
+
+
+async def accept_upload(upload: Upload, uploader_id: int):
+    """
+    새 이미지면 변환 작업을 걸고 임시 파일은 그 작업이 지운다. 그 밖의 경우는 여기서 지운다
+    """
+    try:
+        asset, needs_processing = await run_in_threadpool(_save_upload, upload, uploader_id)
+    except BaseException as e:
+        os.unlink(upload.path)
+        if isinstance(e, ValueError):
+            media_uploads.inc(result="rejected")
+        raise
+    if needs_processing:
+        media_uploads.inc(result="created")
+        media_processor.submit(asset.id, asset.sha256, upload.path)
+    else:
+        media_uploads.inc(result="deduplicated")
+        os.unlink(upload.path)
+    return asset
+
+
+# =========================
+# 3. 변환 (프로세스 풀)
+# =========================
+
+def _store_variants(asset_id: int, sha256: str, variants: Dict[str, str]):
+    for name, path in variants.items():
+        storage.put_file(media_key(sha256, name), path, VARIANT_CONTENT_TYPE)
+    with session_scope() as db:
+        crud_media.mark_processed(db, asset_id, MediaAssetStatus.ready)
+    media_processed.inc(status="ready")
+
+
+def _mark_failed(asset_id: int):
+    with session_scope() as db:
+        crud_media.mark_processed(db, asset_id, MediaAssetStatus.failed)
+    media_processed.inc(status="failed")
+
+
+def _render(path: str, out_dir: str) -> Dict[str, str]:
+    return render_variants(
+        path, out_dir, variant_sizes(), settings.MEDIA_JPEG_QUALITY, settings.MEDIA_MAX_PIXELS
+    )
+
+
+class MediaProcessor:
+    """
+    워커 프로세스마다 하나. 풀은 첫 업로드 때 만든다 (spawn: 자식은 Pillow 만 import)
+    """
+
+    def __init__(self):
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._tasks = set()
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=settings.MEDIA_RESIZE_PROCESSES,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._pool
+
+    def submit(self, asset_id: int, sha256: str, path: str):
+        task = asyncio.create_task(self._process(asset_id, sha256, path))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _process(self, asset_id: int, sha256: str, path: str):
+        out_dir = tempfile.mkdtemp(prefix="media-")
+        try:
+            variants = await asyncio.get_running_loop().run_in_executor(
+                self._executor(),
+                render_variants,
+                path,
+                out_dir,
+                variant_sizes(),
+                settings.MEDIA_JPEG_QUALITY,
+                settings.MEDIA_MAX_PIXELS,
+            )
+            await run_in_threadpool(_store_variants, asset_id, sha256, variants)
+        except Exception:
+            logger.exception("image processing failed (asset=%s)", asset_id)
+            try:
+                await run_in_threadpool(_mark_failed, asset_id)
+            except Exception:
+                logger.exception("could not mark asset %s failed", asset_id)
+        finally:
+            shutil.rmtree(out_dir, ignore_errors=True)
+            os.unlink(path)
+
+    async def stop(self, timeout: float = 10):
+        # 진행 중인 변환은 잠깐 기다려 준다 (못 끝낸 것은 cli process-media 대상)
+        if self._tasks:
+            await asyncio.wait(set(self._tasks), timeout=timeout)
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+media_processor = MediaProcessor()
+
+
+def process_stale(older_than: timedelta, limit: int = 100) -> Tuple[int, int]:
+    """
+    processing 으로 남은 asset 을 원본에서 다시 변환 (CLI, 현재 프로세스에서 순서대로)
+    (성공 수, 실패 수)
+    """
+    with session_scope() as db:
+        rows = crud_media.stale_processing_assets(db, datetime.utcnow() - older_than, limit)
+
+    done = failed = 0
+    for row in rows:
+        work_dir = tempfile.mkdtemp(prefix="media-")
+        try:
+            src = os.path.join(work_dir, ORIGINAL)
+            storage.download(media_key(row.sha256, ORIGINAL), src)
+            _store_variants(row.id, row.sha256, _render(src, work_dir))
+            done += 1
+        except Exception:
+            logger.exception("image processing failed (asset=%s)", row.id)
+            _mark_failed(row.id)
+            failed += 1
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    return done, failed
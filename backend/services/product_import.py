@@ -0,0 +1,155 @@
+# services/product_import.py
+"""
+상품 대량 등록 (NDJSON / CSV)
+
+본문을 한 줄씩 읽으면서 ProductCreate로 검증하고, PRODUCT_IMPORT_CHUNK_SIZE 행마다
+multi-row INSERT + commit 한다. 행 단위 오류는 줄 번호와 함께 결과에 담는다.
+API(routers/products.py)와 CLI(cli.py)가 같은 파이프라인을 쓴다.
+"""
+import codecs
+import csv
+import json
+from typing import Iterable, Iterator, List, Tuple
+
+import anyio
+from fastapi import Request
+from pydantic import ValidationError
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from db import crud_product
+from schemas.product import ProductCreate, ProductImportResult, ProductImportRowError
+
+IMPORT_FORMATS = {"ndjson", "csv"}
+
+# CSV의 images 컬럼은 "url1|url2" 형식
+CSV_IMAGE_SEPARATOR = "|"
+
+
+# =========================
+# 입력 파싱
+# =========================
+
+def iter_request_lines(request: Request) -> Iterator[str]:
+    """
+    요청 본문을 메모리에 모으지 않고 줄 단위로 넘겨준다.
+    sync 엔드포인트(threadpool)에서 async 스트림을 당겨오기 위해 anyio.from_thread 사용
+    """
+    stream = request.stream()
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buf = ""
+    while True:
+        try:
+            chunk = anyio.from_thread.run(stream.__anext__)
+        except StopAsyncIteration:
+            break
+        buf += decoder.decode(chunk)
+        *lines, buf = buf.split("\n")
+        for line in lines:
+            yield line + "\n"
+
+    buf += decoder.decode(b"", final=True)
+    if buf:
+        yield buf
+
+
+def _iter_ndjson(lines: Iterable[str]) -> Iterator[Tuple[int, object]]:
+    for line_no, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_no, json.loads(line)
+        except ValueError as e:
+            yield line_no, e
+
+
+def _iter_csv(lines: Iterable[str]) -> Iterator[Tuple[int, object]]:
+    reader = csv.DictReader(lines)
+    for row in reader:
+        raw = {k: (v if v != "" else None) for k, v in row.items() if k}
+        images = raw.pop("images", None)
+        raw["images"] = [
+            {"image_url": url.strip(), "sort_order": idx}
+            for idx, url in enumerate((images or "").split(CSV_IMAGE_SEPARATOR))
+            if url.strip()
+        ]
+        yield reader.line_num, raw
+
+
+def _format_validation_error(e: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}" for err in e.errors()
+    )
+
+
+# =========================
+# 청크 저장
+# =========================
+
+def _add_error(result: ProductImportResult, line: int, error: str):
+    result.failed += 1
+    if len(result.errors) < settings.PRODUCT_IMPORT_MAX_ERRORS:
+        result.errors.append(ProductImportRowError(line=line, error=error))
+
+
+def _flush_chunk(
+    db: Session,
+    seller_id: int,
+    chunk: List[Tuple[int, ProductCreate]],
+    result: ProductImportResult,
+):
+    try:
+        crud_product.bulk_create_products(db, seller_id, [p for _, p in chunk])
+        db.commit()
+        result.created += len(chunk)
+        return
+    except (IntegrityError, DataError, ValueError):
+        db.rollback()
+
+    # FK(region/category) 오류 등은 어느 행인지 모르므로 청크를 행 단위로 다시 저장
+    for line, payload in chunk:
+        try:
+            crud_product.bulk_create_products(db, seller_id, [payload])
+            db.commit()
+            result.created += 1
+        except (IntegrityError, DataError) as e:
+            db.rollback()
+            _add_error(result, line, str(e.orig))
+        except ValueError as e:  # 없는/변환 실패한 asset_id
+            db.rollback()
+            _add_error(result, line, str(e))
+
+
+def import_products(
+    db: Session,
+    seller_id: int,
+    lines: Iterable[str],
+    fmt: str = "ndjson",
+    chunk_size: int | None = None,
+) -> ProductImportResult:
+    chunk_size = chunk_size or settings.PRODUCT_IMPORT_CHUNK_SIZE
+    rows = _iter_csv(lines) if fmt == "csv" else _iter_ndjson(lines)
+
+    result = ProductImportResult()
+    chunk: List[Tuple[int, ProductCreate]] = []
+
+    for line, raw in rows:
+        result.total += 1
+        if isinstance(raw, Exception):
+            _add_error(result, line, f"invalid json: {raw}")
+            continue
+        try:
+            chunk.append((line, ProductCreate.model_validate(raw)))
+        except ValidationError as e:
+            _add_error(result, line, _format_validation_error(e))
+            continue
+
+        if len(chunk) >= chunk_size:
+            _flush_chunk(db, seller_id, chunk, result)
+            chunk = []
+
+    if chunk:
+        _flush_chunk(db, seller_id, chunk, result)
+
+    return result